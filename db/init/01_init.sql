@@ -1,6 +1,9 @@
 -- Jenkins Dashboard Database Initialization
 -- This script creates the necessary tables for the Jenkins Dashboard application
 
+-- Trigram matching for Quick Search substring queries
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create jenkins_items table with all required columns
 CREATE TABLE IF NOT EXISTS jenkins_items (
     id SERIAL PRIMARY KEY,
@@ -38,6 +41,19 @@ CREATE TABLE IF NOT EXISTS jenkins_items (
     ownership_status VARCHAR(20) DEFAULT 'unassigned',
     last_editor VARCHAR(200),
     last_user VARCHAR(200),
+    -- Sync run (sync_runs.id) that wrote the row
+    sync_run_id INTEGER,
+    -- Quick Search text (lowercased, newline-joined search columns) and its tsvector for ranking
+    search_text TEXT GENERATED ALWAYS AS (
+        lower(COALESCE(name, '') || chr(10) || COALESCE(folder, '') || chr(10) || COALESCE(last_build_status, 'Unknown') || chr(10) ||
+              COALESCE(type, '') || chr(10) || COALESCE(description, '') || chr(10) || COALESCE(other_tag, '') || chr(10) ||
+              COALESCE(last_editor, '') || chr(10) || COALESCE(last_user, ''))
+    ) STORED,
+    search_vector tsvector GENERATED ALWAYS AS (to_tsvector('simple',
+        lower(COALESCE(name, '') || chr(10) || COALESCE(folder, '') || chr(10) || COALESCE(last_build_status, 'Unknown') || chr(10) ||
+              COALESCE(type, '') || chr(10) || COALESCE(description, '') || chr(10) || COALESCE(other_tag, '') || chr(10) ||
+              COALESCE(last_editor, '') || chr(10) || COALESCE(last_user, ''))
+    )) STORED,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
 );
@@ -56,6 +72,121 @@ CREATE INDEX IF NOT EXISTS idx_jenkins_items_other_tag ON jenkins_items(other_ta
 CREATE INDEX IF NOT EXISTS idx_jenkins_items_ownership_status ON jenkins_items(ownership_status);
 CREATE INDEX IF NOT EXISTS idx_jenkins_items_last_editor ON jenkins_items(last_editor);
 CREATE INDEX IF NOT EXISTS idx_jenkins_items_last_user ON jenkins_items(last_user);
+-- Quick Search index
+CREATE INDEX IF NOT EXISTS idx_jenkins_items_search_trgm ON jenkins_items USING gin (search_text gin_trgm_ops);
+
+-- Per-sync history of key job metrics. A row is only written when a job's
+-- tracked metrics change; monthly partitions are created on demand by the
+-- application and dropped whole for retention.
+CREATE TABLE IF NOT EXISTS job_snapshots (
+    url TEXT NOT NULL,
+    name VARCHAR(500) NOT NULL,
+    folder VARCHAR(500),
+    snapshot_time TIMESTAMP WITH TIME ZONE NOT NULL,
+    last_build_status VARCHAR(50),
+    success_rate DECIMAL(10,2),
+    last_build_duration BIGINT,
+    avg_build_duration DECIMAL(10,2),
+    max_build_duration BIGINT,
+    is_disabled BOOLEAN
+) PARTITION BY RANGE (snapshot_time);
+
+CREATE INDEX IF NOT EXISTS idx_job_snapshots_url_time ON job_snapshots(url, snapshot_time DESC);
+
+-- Dashboard aggregates, rebuilt by the application in each sync's transaction
+CREATE TABLE IF NOT EXISTS agg_summary (
+    metric VARCHAR(100) PRIMARY KEY,
+    value DOUBLE PRECISION
+);
+
+CREATE TABLE IF NOT EXISTS agg_status_counts (
+    last_build_status VARCHAR(50) PRIMARY KEY,
+    job_count INTEGER NOT NULL,
+    inactive_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_ownership_counts (
+    ownership_status VARCHAR(20) PRIMARY KEY,
+    job_count INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS agg_folder_performance (
+    folder VARCHAR(500) PRIMARY KEY,
+    job_count INTEGER NOT NULL,
+    avg_build_duration_min DOUBLE PRECISION,
+    success_rate DOUBLE PRECISION
+);
+
+-- Database statistics recorded with each sync (JSON), read back as a single row
+CREATE TABLE IF NOT EXISTS sync_stats (
+    sync_time DOUBLE PRECISION PRIMARY KEY,
+    stats TEXT NOT NULL
+);
+
+-- Mergeable build duration sketch per job (see src/duration_sketch.py); each sync
+-- adds the builds not yet in job_builds and refreshes the percentiles (ms)
+CREATE TABLE IF NOT EXISTS job_duration_sketches (
+    url TEXT PRIMARY KEY,
+    sketch TEXT NOT NULL,
+    last_build_time BIGINT,
+    build_count INTEGER,
+    p50_duration DOUBLE PRECISION,
+    p90_duration DOUBLE PRECISION,
+    p99_duration DOUBLE PRECISION
+);
+
+-- Completed builds of each job, appended by every sync up to BUILD_HISTORY_RETENTION_DAYS
+CREATE TABLE IF NOT EXISTS job_builds (
+    url TEXT NOT NULL,
+    build_time BIGINT NOT NULL,
+    result VARCHAR(20),
+    PRIMARY KEY (url, build_time)
+);
+
+-- Flakiness per job from its build result sequence (see src/flakiness.py),
+-- recomputed only for jobs that gained builds or lost them to retention
+CREATE TABLE IF NOT EXISTS job_flakiness (
+    url TEXT PRIMARY KEY,
+    last_build_time BIGINT,
+    build_count INTEGER,
+    failure_count INTEGER,
+    flip_count INTEGER,
+    flip_rate DOUBLE PRECISION,
+    longest_failure_streak INTEGER,
+    mean_recovery_hours DOUBLE PRECISION,
+    max_recovery_hours DOUBLE PRECISION,
+    last_result VARCHAR(20)
+);
+
+-- Ledger of syncs: timing per phase, job changes and Jenkins crawl cost. The
+-- latest successful run id is the application's cache version key.
+CREATE TABLE IF NOT EXISTS sync_runs (
+    id INTEGER PRIMARY KEY,
+    status VARCHAR(20) NOT NULL,
+    started_at DOUBLE PRECISION NOT NULL,
+    finished_at DOUBLE PRECISION,
+    fetch_seconds DOUBLE PRECISION,
+    write_seconds DOUBLE PRECISION,
+    snapshot_seconds DOUBLE PRECISION,
+    aggregate_seconds DOUBLE PRECISION,
+    jobs_seen INTEGER,
+    jobs_added INTEGER,
+    jobs_changed INTEGER,
+    jobs_deleted INTEGER,
+    request_count INTEGER,
+    bytes_received BIGINT,
+    error_count INTEGER,
+    error TEXT
+);
+
+-- Lease serializing syncs across replicas and the sync run id counter (see src/sync_ledger.py)
+CREATE TABLE IF NOT EXISTS sync_lock (
+    id INTEGER PRIMARY KEY,
+    holder TEXT,
+    expires_at DOUBLE PRECISION,
+    last_run_id INTEGER
+);
+INSERT INTO sync_lock (id) VALUES (1) ON CONFLICT (id) DO NOTHING;
 
 -- Create a function to update the updated_at timestamp
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -3,10 +3,11 @@ import pandas as pd
 import os
 from dotenv import load_dotenv
 from requests.auth import HTTPBasicAuth
-from src.data_manager import init_db, get_cached_data, cache_data
-from src.jenkins_api import get_all_jenkins_items
+from src.data_manager import init_db, get_cached_data, cache_batches
+from src.jenkins_api import iter_jenkins_item_batches, reset_fetch_metrics, get_fetch_metrics
 from src.ui import render_ui
 from src.config import DashboardConfig
+from src.profiler import profiler_enabled, start_run, span, render_profile_panel
 
 load_dotenv()
 
@@ -22,8 +23,12 @@ st.set_page_config(layout=DashboardConfig.PAGE_LAYOUT)
 
 init_db()
 
+if profiler_enabled():
+    start_run()
+
 # --- Main App Logic ---
-df, last_sync_timestamp = get_cached_data()
+with span("get_cached_data"):
+    df, last_sync_timestamp = get_cached_data()
 
 # Store last sync time in session state for use in UI
 if df is not None and not df.empty:
@@ -45,26 +50,21 @@ if df is None or df.empty or st.session_state.get('refresh_data', False):
     auth = HTTPBasicAuth(DashboardConfig.JENKINS_USER, DashboardConfig.JENKINS_TOKEN)
     
     with st.spinner("Fetching all jobs and pipelines... this may take a moment."):
-        # Clear cache if this is a refresh request to ensure fresh data
-        if st.session_state.get('refresh_data', False):
-            get_all_jenkins_items.clear()
-        
-        # Suppress the function call display by using a try-except wrapper
+        # Stream the crawl into the database in batches; the new data is only
+        # published once every folder has been fetched
         try:
-            # Pass bypass_cache=True when refreshing to ensure fresh data
-            bypass_cache = st.session_state.get('refresh_data', False)
-            all_items = get_all_jenkins_items(DashboardConfig.JENKINS_BASE_URL, auth, bypass_cache)
+            reset_fetch_metrics()
+            batches = iter_jenkins_item_batches(DashboardConfig.JENKINS_BASE_URL, auth, DashboardConfig.SYNC_BATCH_SIZE)
+            job_count = cache_batches(batches, get_fetch_metrics)
         except Exception as e:
             st.error(f"Error fetching data: {e}")
             st.stop()
     
-        if all_items:
-            df = pd.DataFrame(all_items)
-            cache_data(df)
+        if job_count:
             # Clear the refresh flag
             if 'refresh_data' in st.session_state:
                 del st.session_state.refresh_data
-            st.success(f"✅ Successfully synced {len(df)} jobs from Jenkins!")
+            st.success(f"✅ Successfully synced {job_count} jobs from Jenkins!")
             st.info("🔄 Refreshing dashboard with latest data...")
             st.rerun()
         else:
@@ -76,3 +76,6 @@ if df is None or df.empty:
     st.stop()
 
 render_ui(df)
+
+if profiler_enabled():
+    render_profile_panel()
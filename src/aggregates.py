@@ -0,0 +1,224 @@
+import json
+from src.config import DashboardConfig
+from src.job_query import PLACEHOLDERS, build_overview_counts_query, empty_filters
+
+# Dashboard aggregate tables, rebuilt from jenkins_items in each sync's write
+# transaction. The DDL is valid for both PostgreSQL and SQLite.
+AGGREGATE_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS agg_summary (
+        metric VARCHAR(100) PRIMARY KEY,
+        value DOUBLE PRECISION
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS agg_status_counts (
+        last_build_status VARCHAR(50) PRIMARY KEY,
+        job_count INTEGER NOT NULL,
+        inactive_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS agg_ownership_counts (
+        ownership_status VARCHAR(20) PRIMARY KEY,
+        job_count INTEGER NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS agg_folder_performance (
+        folder VARCHAR(500) PRIMARY KEY,
+        job_count INTEGER NOT NULL,
+        avg_build_duration_min DOUBLE PRECISION,
+        success_rate DOUBLE PRECISION
+    )
+    """,
+]
+
+# Builds longer than this on average are treated as outliers by the analytics tab
+MAX_REALISTIC_DURATION_MS = 1440 * 60000
+
+
+def refresh_aggregates(cursor, dialect):
+    """
+    Recompute every aggregate table from the current jenkins_items rows.
+
+    Args:
+        cursor: Open DB-API cursor inside the sync's write transaction
+        dialect (str): "sqlite", "postgresql" or "duckdb"
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    threshold = DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS
+
+    cursor.execute("DELETE FROM agg_summary")
+    cursor.execute(f"""
+        INSERT INTO agg_summary (metric, value)
+        SELECT 'job_count', COUNT(*) FROM jenkins_items
+        UNION ALL SELECT 'test_jobs', COALESCE(SUM(CASE WHEN is_test_job THEN 1 ELSE 0 END), 0) FROM jenkins_items
+        UNION ALL SELECT 'disabled_jobs', COALESCE(SUM(CASE WHEN is_disabled THEN 1 ELSE 0 END), 0) FROM jenkins_items
+        UNION ALL SELECT 'inactive_jobs', COALESCE(SUM(CASE WHEN days_since_last_build > {placeholder} THEN 1 ELSE 0 END), 0) FROM jenkins_items
+        UNION ALL SELECT 'inactive_threshold_days', {placeholder}
+    """, (threshold, threshold))
+
+    cursor.execute("DELETE FROM agg_status_counts")
+    # The unfiltered form of the query the Overview runs for filtered views
+    counts_query, counts_params = build_overview_counts_query(empty_filters(), dialect)
+    cursor.execute(
+        "INSERT INTO agg_status_counts (last_build_status, job_count, inactive_count) " + counts_query,
+        tuple(counts_params)
+    )
+
+    cursor.execute("DELETE FROM agg_ownership_counts")
+    cursor.execute("""
+        INSERT INTO agg_ownership_counts (ownership_status, job_count)
+        SELECT ownership_status, COUNT(*)
+        FROM jenkins_items
+        WHERE ownership_status IS NOT NULL
+        GROUP BY ownership_status
+    """)
+
+    # Same population as render_performance_insights: jobs with duration data
+    # and a realistic (<= 24 hour) average build
+    cursor.execute("DELETE FROM agg_folder_performance")
+    cursor.execute(f"""
+        INSERT INTO agg_folder_performance (folder, job_count, avg_build_duration_min, success_rate)
+        SELECT folder, COUNT(*), AVG(avg_build_duration) / 60000.0, AVG(COALESCE(success_rate, 0))
+        FROM jenkins_items
+        WHERE avg_build_duration > 0 AND avg_build_duration <= {placeholder} AND folder IS NOT NULL
+        GROUP BY folder
+    """, (MAX_REALISTIC_DURATION_MS,))
+
+
+# Counters stored per sync in sync_stats.stats (JSON); filters are valid in every supported dialect
+STATS_COUNTERS = {
+    "total_jobs": None,
+    "disabled_jobs": "is_disabled",
+    "test_jobs": "is_test_job",
+    "jobs_without_description": "description IS NULL OR description = ''",
+}
+
+# Breakdowns stored alongside the counters: stats key -> grouping expression
+STATS_GROUPS = {
+    "jobs_by_folder": "COALESCE(folder, '')",
+    "jobs_by_status": "COALESCE(last_build_status, 'Unknown')",
+    "jobs_by_owner": "COALESCE(owner_name, '')",
+}
+
+SYNC_STATS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sync_stats (
+        sync_time DOUBLE PRECISION PRIMARY KEY,
+        stats TEXT NOT NULL
+    )
+"""
+
+
+def build_sync_stats_query(dialect):
+    """
+    Build the query computing every sync statistic in one pass over jenkins_items.
+    
+    PostgreSQL and DuckDB evaluate all groupings in a single scan with GROUPING
+    SETS; SQLite has no grouping sets, so its groupings are UNION ALL branches.
+    
+    Returns:
+        str: Query yielding (grouping, group_key, <counters>..., last_sync) rows,
+        where grouping is "total" or a STATS_GROUPS key
+    """
+    counters = ", ".join(
+        f"COUNT(*) FILTER (WHERE {condition}) AS {name}" if condition else f"COUNT(*) AS {name}"
+        for name, condition in STATS_COUNTERS.items()
+    )
+    
+    if dialect != "sqlite":
+        grouping_case = " ".join(
+            f"WHEN GROUPING({expression}) = 0 THEN '{key}'" for key, expression in STATS_GROUPS.items()
+        )
+        group_key = "COALESCE(" + ", ".join(
+            f"CASE WHEN GROUPING({expression}) = 0 THEN {expression} END" for expression in STATS_GROUPS.values()
+        ) + ")"
+        grouping_sets = ", ".join(["()"] + [f"({expression})" for expression in STATS_GROUPS.values()])
+        return (
+            f"SELECT CASE {grouping_case} ELSE 'total' END AS grouping, {group_key} AS group_key, "
+            f"{counters}, MAX(timestamp) AS last_sync FROM jenkins_items GROUP BY GROUPING SETS ({grouping_sets})"
+        )
+    
+    branches = [f"SELECT 'total' AS grouping, NULL AS group_key, {counters}, MAX(timestamp) AS last_sync FROM jenkins_items"]
+    for key, expression in STATS_GROUPS.items():
+        branches.append(
+            f"SELECT '{key}', {expression}, {counters}, MAX(timestamp) FROM jenkins_items GROUP BY {expression}"
+        )
+    return " UNION ALL ".join(branches)
+
+
+def compute_sync_stats(cursor, dialect):
+    """
+    Compute the database statistics of the current jobs table.
+    
+    Returns:
+        dict: STATS_COUNTERS values, last_sync and a {group: job count} dict per STATS_GROUPS key
+    """
+    cursor.execute(build_sync_stats_query(dialect))
+    stats = {key: {} for key in STATS_GROUPS}
+    for row in cursor.fetchall():
+        grouping, group_key, *counts, last_sync = row
+        if grouping == "total":
+            stats.update({name: int(count) for name, count in zip(STATS_COUNTERS, counts)})
+            stats["last_sync"] = last_sync
+        else:
+            stats[grouping][group_key] = int(counts[0])
+    return stats
+
+
+def record_sync_stats(cursor, dialect, sync_timestamp):
+    """
+    Store the statistics of a sync in sync_stats so reading them is a single-row lookup.
+    
+    Args:
+        cursor: Open DB-API cursor inside the sync's write transaction
+        dialect (str): "sqlite", "postgresql" or "duckdb"
+        sync_timestamp (float): Epoch time of the sync
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    stats = compute_sync_stats(cursor, dialect)
+    cursor.execute(
+        f"INSERT INTO sync_stats (sync_time, stats) VALUES ({placeholder}, {placeholder})",
+        (sync_timestamp, json.dumps(stats))
+    )
+
+
+# Upper bounds (minutes) and labels of the Analytics duration distribution buckets
+DURATION_BUCKETS = [
+    (5, "0-5 min"), (15, "5-15 min"), (30, "15-30 min"),
+    (60, "30-60 min"), (120, "1-2 hours"), (None, "2+ hours")
+]
+
+
+def build_duration_stats_query():
+    """
+    Build the Analytics duration summary over jobs with a realistic (<= 24 hour) average build.
+    
+    Uses percentile_cont ... WITHIN GROUP, so it needs PostgreSQL or DuckDB.
+    
+    Returns:
+        str: Query yielding one row with job_count, avg/median/max duration (minutes),
+        total_build_time_hours and one count column per DURATION_BUCKETS entry
+    """
+    bucket_counts = []
+    lower = 0
+    for index, (upper, _) in enumerate(DURATION_BUCKETS):
+        condition = f"minutes > {lower}" + (f" AND minutes <= {upper}" if upper is not None else "")
+        bucket_counts.append(f"COUNT(*) FILTER (WHERE {condition}) AS bucket_{index}")
+        lower = upper
+    return f"""
+        WITH realistic AS (
+            SELECT CAST(avg_build_duration AS DOUBLE PRECISION) / 60000.0 AS minutes,
+                   CAST(COALESCE(total_build_duration, 0) AS DOUBLE PRECISION) AS total_build_duration
+            FROM jenkins_items
+            WHERE avg_build_duration > 0 AND avg_build_duration <= {MAX_REALISTIC_DURATION_MS}
+        )
+        SELECT COUNT(*) AS job_count,
+               AVG(minutes) AS avg_duration,
+               percentile_cont(0.5) WITHIN GROUP (ORDER BY minutes) AS median_duration,
+               MAX(minutes) AS max_duration,
+               SUM(total_build_duration) / 60000.0 / 60 AS total_build_time_hours,
+               {", ".join(bucket_counts)}
+        FROM realistic
+    """
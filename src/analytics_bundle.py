@@ -0,0 +1,268 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.config import DashboardConfig
+from src.aggregates import DURATION_BUCKETS, MAX_REALISTIC_DURATION_MS
+from src.recommendations import RECOMMENDATION_COLUMNS, classify_jobs
+from src.folder_tree import build_folder_tree
+from src.duration_sketch import PERCENTILE_COLUMNS, grouped_percentiles
+
+# Analytics bundle: everything the Analytics tab shows, computed once per sync
+# from the cleaned jobs and stored next to the database as one directory per
+# version (bundle-<sync version>-<settings signature>) holding a Parquet file per
+# table and summary.json for the scalars and short series. The tab only reads it.
+
+# Bump when the bundle's contents change so older bundles are rebuilt
+BUNDLE_FORMAT = 3
+
+# Tables of the bundle, each stored as <name>.parquet
+BUNDLE_TABLES = [
+    "duration_jobs", "longest_jobs", "folder_performance", "outliers",
+    "ownership_jobs", "jobs_without_description", "folder_tree", "job_percentiles", "folder_percentiles"
+]
+
+# Short labelled counts, stored in summary.json in display order
+BUNDLE_SERIES = ["duration_distribution", "outlier_type_counts", "ownership_counts"]
+
+# Folders with fewer jobs are left out of the folder performance comparison
+MIN_FOLDER_JOBS = 3
+
+# Descriptions shorter than this are reported as too short
+SHORT_DESCRIPTION_CHARS = 10
+
+OWNERSHIP_ICONS = {"complete": "✅", "attention_required": "⚠️"}
+
+DURATION_JOB_COLUMNS = ["name", "folder", "last_build_status", "success_rate", "total_builds", "avg_build_duration_min", "url"]
+OWNERSHIP_COLUMNS = [
+    "name", "folder", "owner_name", "owner_email", "description", "other_tag",
+    "ownership_status", "last_build_status", "success_rate", "last_editor", "last_user", "url"
+]
+
+
+def bundle_key(sync_version):
+    """
+    Name identifying the bundle of a sync under the current settings.
+
+    The outlier and inactivity thresholds are part of the key, so changing them rebuilds the bundle.
+    """
+    settings = (
+        BUNDLE_FORMAT, MAX_REALISTIC_DURATION_MS, DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS,
+        DashboardConfig.OUTLIER_EXTENDED_HOURS, DashboardConfig.OUTLIER_LONG_HOURS,
+        DashboardConfig.OUTLIER_VERY_LONG_HOURS, DashboardConfig.OUTLIER_EXTREME_HOURS,
+    )
+    signature = hashlib.sha1(repr(settings).encode()).hexdigest()[:10]
+    return f"bundle-{sync_version}-{signature}"
+
+
+def summarize_durations(df):
+    """Compute the duration summary and distribution of jobs with realistic average durations (minutes)"""
+    bins = [0] + [upper if upper is not None else float('inf') for upper, _ in DURATION_BUCKETS]
+    labels = [label for _, label in DURATION_BUCKETS]
+    duration_bins = pd.cut(df["avg_build_duration_min"], bins=bins, labels=labels)
+    return {
+        "job_count": len(df),
+        "avg_duration": df["avg_build_duration_min"].mean(),
+        "median_duration": df["avg_build_duration_min"].median(),
+        "max_duration": df["avg_build_duration_min"].max(),
+        "total_build_time_hours": df["total_build_duration"].sum() / 60000 / 60,  # Convert to hours
+        "duration_distribution": duration_bins.value_counts().sort_index(),
+    }
+
+
+def summarize_percentiles(df, sketches):
+    """
+    Build duration percentiles (minutes) per job, per folder and for the whole controller.
+
+    Folder and controller percentiles merge the jobs' stored sketches; no build is rescanned.
+
+    Args:
+        df (DataFrame): Cleaned jobs with the PERCENTILE_COLUMNS of their sketches (ms)
+        sketches (DataFrame): url, folder, build_count and sketch of each job, or None
+
+    Returns:
+        tuple: (job table, folder table, dict of controller percentiles and builds_sketched)
+    """
+    if sketches is None:
+        sketches = pd.DataFrame(columns=["url", "folder", "build_count", "sketch"])
+    minutes = {col: f"{col}_min" for col in PERCENTILE_COLUMNS}
+
+    jobs = df.reindex(columns=["name", "folder", "url", *PERCENTILE_COLUMNS])
+    jobs = jobs[jobs[PERCENTILE_COLUMNS[0]].notna()]
+    jobs = jobs.assign(build_count=jobs["url"].map(sketches.set_index("url")["build_count"]))
+    jobs[PERCENTILE_COLUMNS] = jobs[PERCENTILE_COLUMNS].astype(float) / 60000
+    jobs = jobs.rename(columns=minutes).sort_values(minutes[PERCENTILE_COLUMNS[-1]], ascending=False)
+
+    folders = grouped_percentiles(sketches["sketch"], sketches["folder"].fillna("/").astype(str))
+    folders[PERCENTILE_COLUMNS] = folders[PERCENTILE_COLUMNS].astype(float) / 60000
+    folders = folders.rename(columns=minutes).rename_axis("folder").reset_index()
+    folders = folders.sort_values(minutes[PERCENTILE_COLUMNS[-1]], ascending=False)
+
+    overall = grouped_percentiles(sketches["sketch"], pd.Series("all", index=sketches.index))
+    controller = {"builds_sketched": int(overall["build_count"].sum())}
+    for col in PERCENTILE_COLUMNS:
+        controller[minutes[col]] = _plain(overall[col].iloc[0] / 60000) if not overall.empty else None
+    return jobs.reset_index(drop=True), folders.reset_index(drop=True), controller
+
+
+def compute_analytics_bundle(df, sketches=None):
+    """
+    Compute the Analytics tab's statistics and tables from the cleaned jobs of one sync.
+
+    Args:
+        df (DataFrame): Cleaned jobs (with or without the recommendation columns)
+        sketches (DataFrame): Build duration sketches of the jobs (see
+            StorageBackend.get_duration_sketches); without them the percentile
+            tables are empty
+
+    Returns:
+        dict: summary (scalars), the BUNDLE_SERIES and the BUNDLE_TABLES
+    """
+    if RECOMMENDATION_COLUMNS["outlier"] not in df.columns:
+        df = classify_jobs(df.copy())
+
+    duration_ms = pd.to_numeric(df["avg_build_duration"], errors="coerce").astype(float)
+    has_duration = (duration_ms > 0).to_numpy()
+    realistic = has_duration & (duration_ms <= MAX_REALISTIC_DURATION_MS).to_numpy()
+
+    jobs = df.loc[has_duration, ["name", "folder", "last_build_status", "success_rate", "total_builds",
+                                 "total_build_duration", "url", RECOMMENDATION_COLUMNS["outlier_type"],
+                                 RECOMMENDATION_COLUMNS["outlier"]]].copy()
+    jobs["avg_build_duration_min"] = duration_ms[has_duration] / 60000
+    duration_jobs = df.loc[realistic].assign(avg_build_duration_min=duration_ms[realistic] / 60000)
+
+    durations = summarize_durations(duration_jobs)
+    duration_distribution = durations.pop("duration_distribution")
+
+    folder_performance = duration_jobs.groupby("folder", observed=True).agg(
+        avg_build_duration_min=("avg_build_duration_min", "mean"),
+        success_rate=("success_rate", "mean"),
+        job_count=("name", "count"),
+    )
+    folder_performance = folder_performance[folder_performance["job_count"] >= MIN_FOLDER_JOBS].sort_values(
+        "avg_build_duration_min", ascending=False
+    )
+
+    outliers = jobs[jobs["avg_build_duration_min"] * 60000 > MAX_REALISTIC_DURATION_MS].rename(columns={
+        RECOMMENDATION_COLUMNS["outlier"]: "recommendation"
+    })[["name", "folder", "avg_build_duration_min", "last_build_status", "total_builds",
+        "outlier_type", "recommendation", "url"]]
+    outlier_type_counts = outliers["outlier_type"].astype(str).value_counts()
+
+    ownership_jobs = df.reindex(columns=OWNERSHIP_COLUMNS)
+    ownership_jobs["Status"] = ownership_jobs["ownership_status"].astype(object).map(OWNERSHIP_ICONS).fillna("🔴")
+    ownership_counts = df["ownership_status"].astype(object).value_counts()
+
+    descriptions = df["description"].astype(object)
+    has_description = (descriptions.notna() & (descriptions != "")).to_numpy()
+    description_lengths = descriptions[has_description].astype(str).str.len()
+    total_jobs = len(df)
+    job_percentiles, folder_percentiles, controller_percentiles = summarize_percentiles(df, sketches)
+
+    return {
+        "summary": {
+            "total_jobs": total_jobs,
+            "jobs_with_duration": int(has_duration.sum()),
+            **{key: _plain(value) for key, value in durations.items()},
+            "jobs_with_description": int(has_description.sum()),
+            "jobs_without_description": int(total_jobs - has_description.sum()),
+            "description_coverage": _plain(has_description.sum() / total_jobs * 100) if total_jobs > 0 else 0,
+            "avg_description_length": _plain(description_lengths.mean()) if len(description_lengths) else None,
+            "short_descriptions": int((description_lengths < SHORT_DESCRIPTION_CHARS).sum()),
+            **controller_percentiles,
+        },
+        "duration_distribution": duration_distribution,
+        "outlier_type_counts": outlier_type_counts,
+        "ownership_counts": ownership_counts,
+        "duration_jobs": duration_jobs[DURATION_JOB_COLUMNS].reset_index(drop=True),
+        "longest_jobs": duration_jobs.nlargest(10, "avg_build_duration_min")[
+            ["name", "folder", "avg_build_duration_min", "success_rate", "total_builds"]
+        ].reset_index(drop=True),
+        "folder_performance": folder_performance,
+        "outliers": outliers.reset_index(drop=True),
+        "ownership_jobs": ownership_jobs.reset_index(drop=True),
+        "jobs_without_description": df.loc[~has_description, [
+            "name", "folder", "last_build_status", "days_since_last_build", "total_builds", "url"
+        ]].reset_index(drop=True),
+        "folder_tree": build_folder_tree(df),
+        "job_percentiles": job_percentiles,
+        "folder_percentiles": folder_percentiles,
+    }
+
+
+def _plain(value):
+    """Convert a numpy scalar to its Python equivalent for JSON; NaN becomes None"""
+    value = value.item() if isinstance(value, np.generic) else value
+    return None if isinstance(value, float) and np.isnan(value) else value
+
+
+def read_analytics_bundle(directory, sync_version):
+    """
+    Load the analytics bundle of a sync.
+
+    Args:
+        directory (str): Directory holding the bundles
+        sync_version (int): Sync version the caller expects
+
+    Returns:
+        dict: The bundle (see compute_analytics_bundle), or None if it is
+        missing, unreadable or was built with other settings
+    """
+    path = os.path.join(directory, bundle_key(sync_version))
+    try:
+        with open(os.path.join(path, "summary.json")) as f:
+            stored = json.load(f)
+        bundle = {"summary": stored["summary"]}
+        for name in BUNDLE_SERIES:
+            bundle[name] = pd.Series(stored[name], dtype="int64")
+        for name in BUNDLE_TABLES:
+            bundle[name] = pq.read_table(os.path.join(path, f"{name}.parquet"), memory_map=True).to_pandas()
+        return bundle
+    except (OSError, ValueError, KeyError, pa.ArrowException) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"⚠️ Warning: Ignoring unreadable analytics bundle {path}: {e}")
+        return None
+
+
+def write_analytics_bundle(bundle, directory, sync_version):
+    """
+    Store a bundle for a sync and remove the bundles of older syncs.
+
+    The bundle is written to a uniquely named temporary directory and renamed
+    into place, so readers never see a partial bundle and writers of the same
+    sync, in this or another process, never share a directory.
+    """
+    key = bundle_key(sync_version)
+    path = os.path.join(directory, key)
+    temp_path = None
+    try:
+        os.makedirs(directory, exist_ok=True)
+        temp_path = tempfile.mkdtemp(dir=directory, prefix=f"{key}.tmp-")
+        stored = {"summary": bundle["summary"]}
+        for name in BUNDLE_SERIES:
+            stored[name] = {str(label): int(count) for label, count in bundle[name].items()}
+        with open(os.path.join(temp_path, "summary.json"), "w") as f:
+            json.dump(stored, f)
+        for name in BUNDLE_TABLES:
+            pq.write_table(pa.Table.from_pandas(bundle[name]), os.path.join(temp_path, f"{name}.parquet"))
+        try:
+            os.rename(temp_path, path)
+        except OSError:
+            if not os.path.isdir(path):
+                raise
+            # Written concurrently by another writer for the same sync
+            shutil.rmtree(temp_path, ignore_errors=True)
+        temp_path = None
+        for entry in os.listdir(directory):
+            # Temporary directories belong to writers still in progress
+            if entry.startswith("bundle-") and entry != key and ".tmp-" not in entry:
+                shutil.rmtree(os.path.join(directory, entry), ignore_errors=True)
+    except (OSError, TypeError, ValueError, pa.ArrowException) as e:
+        if temp_path is not None:
+            shutil.rmtree(temp_path, ignore_errors=True)
+        print(f"⚠️ Warning: Failed to write analytics bundle {path}: {e}")
@@ -0,0 +1,109 @@
+import pandas as pd
+from src.job_query import PLACEHOLDERS
+from src.duration_sketch import DURATION_SKETCH_PRUNE, update_job_sketches
+from src.flakiness import retention_cutoff, append_builds, prune_build_history, refresh_flakiness
+
+# Build history of a sync. The completed builds of every crawled batch are
+# streamed into job_builds_staging next to the staged jobs; they are folded into
+# the duration sketches (src/duration_sketch.py) and the build history and
+# flakiness (src/flakiness.py) only when the sync is published, inside the
+# publish transaction, so a failed sync leaves all three untouched. A build is
+# identified by its job url and start time: staged builds already in job_builds
+# were counted by an earlier sync and are skipped, however late they finished.
+
+BUILD_STAGING_TABLE = "job_builds_staging"
+BUILD_STAGING_COLUMNS = ["url", "build_time", "result", "duration"]
+
+# Staged builds are published this many jobs at a time (bounded by driver parameter limits)
+PUBLISH_CHUNK_SIZE = 500
+
+
+def build_history_staging_schema(dialect):
+    """
+    DDL of the build staging table and its index.
+    PostgreSQL skips the write-ahead log for it, as its contents never outlive a sync.
+    """
+    unlogged = "UNLOGGED " if dialect == "postgresql" else ""
+    return [
+        f"""
+            CREATE {unlogged}TABLE IF NOT EXISTS {BUILD_STAGING_TABLE} (
+                url TEXT NOT NULL,
+                build_time BIGINT NOT NULL,
+                result VARCHAR(20),
+                duration BIGINT
+            )
+        """,
+        f"CREATE INDEX IF NOT EXISTS idx_{BUILD_STAGING_TABLE}_url ON {BUILD_STAGING_TABLE}(url)",
+    ]
+
+
+def staged_builds(jobs):
+    """
+    Flatten the builds of a batch of crawled jobs into staging rows.
+
+    Args:
+        jobs (DataFrame): Crawled jobs with url and builds, a list of
+            (timestamp ms, result, duration ms) of the completed builds per job
+            as returned by src.jenkins_api.iter_jenkins_item_batches
+
+    Returns:
+        DataFrame: BUILD_STAGING_COLUMNS, one row per build
+    """
+    if "builds" not in jobs.columns:
+        return pd.DataFrame(columns=BUILD_STAGING_COLUMNS)
+    rows = [
+        (url, int(timestamp), result, duration)
+        for url, builds in zip(jobs["url"], jobs["builds"])
+        if isinstance(url, str) and isinstance(builds, list)
+        for timestamp, result, duration in builds
+        if timestamp is not None
+    ]
+    return pd.DataFrame(rows, columns=BUILD_STAGING_COLUMNS)
+
+
+def publish_staged_builds(cursor, dialect):
+    """
+    Fold the staged builds into the duration sketches and the build history.
+
+    Runs inside the publish transaction once jenkins_items holds the new jobs,
+    one chunk of jobs at a time. Only builds within BUILD_HISTORY_RETENTION_DAYS
+    whose (url, build_time) is not in job_builds yet are added. The history of
+    deleted jobs and builds past the retention window are then pruned, the
+    flakiness of every job that gained or lost builds is recomputed and the
+    staging table is emptied.
+
+    Args:
+        cursor: Cursor of the open publish transaction
+        dialect (str): SQL dialect of the cursor
+
+    Returns:
+        int: Number of builds added to the build history
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    columns = ", ".join(f"s.{column}" for column in BUILD_STAGING_COLUMNS)
+    cutoff = retention_cutoff()
+    cursor.execute(f"SELECT DISTINCT url FROM {BUILD_STAGING_TABLE}")
+    urls = sorted(url for url, in cursor.fetchall())
+    added = 0
+    changed_urls = set()
+    for start in range(0, len(urls), PUBLISH_CHUNK_SIZE):
+        chunk = urls[start:start + PUBLISH_CHUNK_SIZE]
+        cursor.execute(
+            f"SELECT {columns}, b.url IS NULL FROM {BUILD_STAGING_TABLE} s "
+            f"LEFT JOIN job_builds b ON b.url = s.url AND b.build_time = s.build_time "
+            f"WHERE s.url IN ({', '.join([placeholder] * len(chunk))}) AND s.build_time >= {placeholder}",
+            [*chunk, cutoff]
+        )
+        # A job crawled twice in one sync stages its builds twice
+        builds = pd.DataFrame(cursor.fetchall(), columns=[*BUILD_STAGING_COLUMNS, "is_new"])
+        builds = builds.drop_duplicates(["url", "build_time"], keep="last")
+        builds = builds[builds["is_new"].astype(bool)]
+        update_job_sketches(cursor, dialect, builds)
+        added += append_builds(cursor, dialect, builds)
+        changed_urls.update(builds["url"])
+
+    cursor.execute(DURATION_SKETCH_PRUNE)
+    changed_urls.update(prune_build_history(cursor, dialect))
+    refresh_flakiness(cursor, dialect, sorted(changed_urls))
+    cursor.execute(f"DELETE FROM {BUILD_STAGING_TABLE}")
+    return added
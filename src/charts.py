@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+from src.config import DashboardConfig
+
+# Chart builders whose browser payload is bounded regardless of the job count.
+# Scatter charts draw SVG markers for small data, switch to WebGL (Scattergl)
+# above CHART_WEBGL_THRESHOLD points and to a server-side binned density heatmap
+# above CHART_DENSITY_THRESHOLD points; bar charts keep the CHART_MAX_BARS
+# largest bars.
+
+
+def scatter_mode(point_count):
+    """
+    Pick how a scatter chart of point_count points is drawn.
+
+    Returns:
+        str: "svg", "webgl" or "density"
+    """
+    if point_count > DashboardConfig.CHART_DENSITY_THRESHOLD:
+        return "density"
+    if point_count > DashboardConfig.CHART_WEBGL_THRESHOLD:
+        return "webgl"
+    return "svg"
+
+
+def build_scatter_figure(df, x, y, group, color_map, text, hovertemplate, density_hovertemplate,
+                         x_range=None, y_range=None):
+    """
+    Scatter plot of df with one trace per group, or its binned density when too large.
+
+    Args:
+        df (DataFrame): Points to plot
+        x (str): Column on the x axis
+        y (str): Column on the y axis
+        group (str): Column with one trace (and color) per value
+        color_map (dict): Group value -> marker color
+        text (str): Column shown as hover text of each point
+        hovertemplate (str): Plotly hover template of a point; "{group}" is replaced by the group value
+        density_hovertemplate (str): Plotly hover template of a density cell (%{z} is its job count)
+        x_range (tuple): (min, max) of the density bins on the x axis, defaults to the data range
+        y_range (tuple): (min, max) of the density bins on the y axis, defaults to the data range
+
+    Returns:
+        tuple: (Figure, mode) where mode is the scatter_mode() used
+    """
+    mode = scatter_mode(len(df))
+    fig = go.Figure()
+    if mode == "density":
+        fig.add_trace(build_density_trace(df[x], df[y], density_hovertemplate, x_range, y_range))
+        return fig, mode
+
+    trace_type = go.Scattergl if mode == "webgl" else go.Scatter
+    for value in df[group].unique():
+        group_data = df[df[group] == value]
+        fig.add_trace(trace_type(
+            x=group_data[x],
+            y=group_data[y],
+            mode='markers',
+            name=str(value),
+            marker=dict(
+                color=color_map.get(value, '#6366f1'),
+                # Many overlapping WebGL points read better smaller
+                size=8 if mode == "svg" else 5,
+                opacity=0.7
+            ),
+            hovertemplate=hovertemplate.replace("{group}", str(value)),
+            text=group_data[text]
+        ))
+    return fig, mode
+
+
+def build_density_trace(x_values, y_values, hovertemplate, x_range=None, y_range=None):
+    """
+    Bin points server-side into a CHART_DENSITY_BINS x CHART_DENSITY_BINS heatmap of job counts.
+
+    Returns:
+        Heatmap: Trace with one cell per bin; empty bins are left blank
+    """
+    x_values = pd.to_numeric(x_values, errors="coerce").astype(float).to_numpy()
+    y_values = pd.to_numeric(y_values, errors="coerce").astype(float).to_numpy()
+    valid = ~(np.isnan(x_values) | np.isnan(y_values))
+    x_values, y_values = x_values[valid], y_values[valid]
+    bins = DashboardConfig.CHART_DENSITY_BINS
+    if x_range is None:
+        x_range = (x_values.min(), x_values.max()) if len(x_values) else (0, 1)
+    if y_range is None:
+        y_range = (y_values.min(), y_values.max()) if len(y_values) else (0, 1)
+    counts, x_edges, y_edges = np.histogram2d(
+        x_values, y_values, bins=bins,
+        range=[_nonempty_range(x_range), _nonempty_range(y_range)]
+    )
+    return go.Heatmap(
+        # histogram2d indexes counts [x, y]; Heatmap rows are y
+        z=np.where(counts.T > 0, counts.T, np.nan),
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        colorscale="Viridis",
+        colorbar=dict(title="Jobs"),
+        hoverongaps=False,
+        hovertemplate=hovertemplate
+    )
+
+
+def _nonempty_range(value_range):
+    """Widen a zero-width (min, max) range so it can be binned"""
+    low, high = float(value_range[0]), float(value_range[1])
+    return (low, high) if high > low else (low - 0.5, high + 0.5)
+
+
+def cap_bars(values, max_bars=None):
+    """
+    Keep the first max_bars entries of an already sorted Series or DataFrame.
+
+    Returns:
+        tuple: (capped values, number of entries left out)
+    """
+    max_bars = max_bars or DashboardConfig.CHART_MAX_BARS
+    return values.iloc[:max_bars], max(len(values) - max_bars, 0)
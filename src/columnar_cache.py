@@ -0,0 +1,64 @@
+import os
+import tempfile
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Parquet schema metadata key holding the sync version the file was written for
+SYNC_VERSION_KEY = b"jenkins_dashboard.sync_version"
+
+
+def read_columnar_cache(path, sync_version):
+    """
+    Load the cleaned jobs DataFrame from the Parquet cache.
+    
+    Args:
+        path (str): Parquet cache file
+        sync_version (int): Sync version the caller expects
+        
+    Returns:
+        DataFrame: Cached data, or None if the file is missing, unreadable or from another sync
+    """
+    try:
+        metadata = pq.read_schema(path, memory_map=True).metadata or {}
+        if metadata.get(SYNC_VERSION_KEY) != repr(sync_version).encode():
+            return None
+        table = pq.read_table(path, memory_map=True)
+        # Release each Arrow column as soon as it is converted, so the load never
+        # holds the table and the DataFrame in memory at the same time
+        return table.to_pandas(split_blocks=True, self_destruct=True)
+    except (OSError, pa.ArrowException) as e:
+        if not isinstance(e, FileNotFoundError):
+            print(f"⚠️ Warning: Ignoring unreadable columnar cache {path}: {e}")
+        return None
+
+
+def write_columnar_cache(df, path, sync_version):
+    """
+    Write the cleaned jobs DataFrame to the Parquet cache with its final dtypes.
+    
+    The file is written to a uniquely named temporary file next to its
+    destination and swapped in atomically, so concurrent readers never see a
+    partial cache and concurrent writers of the same version do not collide.
+    """
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        metadata = dict(table.schema.metadata or {})
+        metadata[SYNC_VERSION_KEY] = repr(sync_version).encode()
+        table = table.replace_schema_metadata(metadata)
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=directory or ".", prefix=f"{os.path.basename(path)}.", suffix=".tmp", delete=False
+        ) as temp_file:
+            temp_path = temp_file.name
+        try:
+            pq.write_table(table, temp_path)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+    except (OSError, pa.ArrowException) as e:
+        print(f"⚠️ Warning: Failed to write columnar cache {path}: {e}")
@@ -44,17 +44,88 @@ class DashboardConfig:
     TEST_JOB_EXCLUDE_WORDS = os.getenv("TEST_JOB_EXCLUDE_WORDS", "").split(",") if os.getenv("TEST_JOB_EXCLUDE_WORDS") else []
     TEST_JOB_KEYWORDS = os.getenv("TEST_JOB_KEYWORDS", "").split(",") if os.getenv("TEST_JOB_KEYWORDS") else []
     
+    # Recommendation Thresholds (see src/recommendations.py)
+    TEST_JOB_STALE_DAYS = safe_int_env("TEST_JOB_STALE_DAYS", 30)
+    TEST_JOB_MIN_BUILDS = safe_int_env("TEST_JOB_MIN_BUILDS", 5)
+    INACTIVE_ARCHIVE_DAYS = safe_int_env("INACTIVE_ARCHIVE_DAYS", 90)
+    INACTIVE_REMOVAL_DAYS = safe_int_env("INACTIVE_REMOVAL_DAYS", 180)
+    # Average build duration tiers of the Analytics outlier analysis, in hours
+    OUTLIER_EXTENDED_HOURS = safe_int_env("OUTLIER_EXTENDED_HOURS", 24)
+    OUTLIER_LONG_HOURS = safe_int_env("OUTLIER_LONG_HOURS", 48)
+    OUTLIER_VERY_LONG_HOURS = safe_int_env("OUTLIER_VERY_LONG_HOURS", 72)
+    OUTLIER_EXTREME_HOURS = safe_int_env("OUTLIER_EXTREME_HOURS", 168)
+    
     # Database Settings
     DB_FILE = os.getenv("DB_FILE", "db/jenkins_data.db")
+    DUCKDB_FILE = os.getenv("DUCKDB_FILE", "db/jenkins_data.duckdb")
+    
+    # SQLite Tuning: WAL lets dashboard reads continue while a sync writes
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+    SQLITE_MMAP_SIZE_MB = safe_int_env("SQLITE_MMAP_SIZE_MB", 256)
+    SQLITE_CACHE_SIZE_MB = safe_int_env("SQLITE_CACHE_SIZE_MB", 64)
     
     # PostgreSQL Settings (for production)
-    DB_TYPE = os.getenv("DB_TYPE", "sqlite")  # "sqlite" or "postgresql"
+    DB_TYPE = os.getenv("DB_TYPE", "sqlite")  # "sqlite", "postgresql" or "duckdb"
     POSTGRES_HOST = os.getenv("POSTGRES_HOST", "localhost")
     POSTGRES_PORT = safe_int_env("POSTGRES_PORT", 5432)
     POSTGRES_DB = os.getenv("POSTGRES_DB", "jenkins_dashboard")
     POSTGRES_USER = os.getenv("POSTGRES_USER", "jenkins_user")
     POSTGRES_PASSWORD = os.getenv("POSTGRES_PASSWORD", "jenkins_password_2024")
     
+    # Cross-replica invalidation (PostgreSQL): each sync NOTIFYs this channel with the
+    # new sync version and every app process LISTENs instead of probing the database
+    SYNC_NOTIFY_ENABLED = os.getenv("SYNC_NOTIFY_ENABLED", "true").lower() == "true"
+    SYNC_NOTIFY_CHANNEL = os.getenv("SYNC_NOTIFY_CHANNEL", "jenkins_dashboard_sync")
+    # How often open sessions check (in memory) whether another replica published new data
+    NEW_DATA_CHECK_SECONDS = safe_int_env("NEW_DATA_CHECK_SECONDS", 15)
+    
+    # Overview query mode: "memory" filters the loaded DataFrame, "database" pushes
+    # filtering, sorting and paging down to SQL for very large instances
+    QUERY_MODE = os.getenv("QUERY_MODE", "memory")
+    # Filter results memoized per sync by the in-memory filter engine (LRU)
+    FILTER_CACHE_SIZE = safe_int_env("FILTER_CACHE_SIZE", 32)
+    
+    # Columnar cache written at sync time for fast startup (SQL store stays the source of truth)
+    COLUMNAR_CACHE_ENABLED = os.getenv("COLUMNAR_CACHE_ENABLED", "true").lower() == "true"
+    COLUMNAR_CACHE_FILE = os.getenv("COLUMNAR_CACHE_FILE", "db/jenkins_items.parquet")
+    # Analytics tab statistics and tables computed at sync time, one bundle per sync version
+    ANALYTICS_BUNDLE_DIR = os.getenv("ANALYTICS_BUNDLE_DIR", "db/analytics")
+    
+    # Sync Settings: jobs are streamed from the Jenkins crawl into a staging table in
+    # batches of this size, so sync memory is bounded by the batch, not the instance
+    SYNC_BATCH_SIZE = safe_int_env("SYNC_BATCH_SIZE", 500)
+    # Only one sync runs at a time per database; a sync that stops renewing its
+    # lease for this long (e.g. a crashed replica) no longer blocks others
+    SYNC_LOCK_TIMEOUT_SECONDS = safe_int_env("SYNC_LOCK_TIMEOUT_SECONDS", 900)
+    
+    # History Settings
+    SNAPSHOT_RETENTION_DAYS = safe_int_env("SNAPSHOT_RETENTION_DAYS", 90)
+    # Builds kept per job for flaky-job detection (see src/flakiness.py)
+    BUILD_HISTORY_RETENTION_DAYS = safe_int_env("BUILD_HISTORY_RETENTION_DAYS", 90)
+    # A job is reported as flaky when at least this % of its consecutive builds flip
+    # between passing and failing, over at least FLAKY_MIN_BUILDS builds
+    FLAKY_FLIP_RATE_PERCENT = safe_int_env("FLAKY_FLIP_RATE_PERCENT", 30)
+    FLAKY_MIN_BUILDS = safe_int_env("FLAKY_MIN_BUILDS", 10)
+    
+    # Export Settings: exports stream from the database in chunks of this many rows into
+    # files under EXPORT_DIR; inside static/ they are downloaded through Streamlit's static serving
+    EXPORT_DIR = os.getenv("EXPORT_DIR", "static/exports")
+    EXPORT_CHUNK_SIZE = safe_int_env("EXPORT_CHUNK_SIZE", 10000)
+    EXPORT_RETENTION_HOURS = safe_int_env("EXPORT_RETENTION_HOURS", 24)
+    
+    # Chart Settings: scatter charts switch from SVG to WebGL above the first point count
+    # and to a server-side binned density above the second; bar charts keep the largest bars
+    CHART_WEBGL_THRESHOLD = safe_int_env("CHART_WEBGL_THRESHOLD", 1000)
+    CHART_DENSITY_THRESHOLD = safe_int_env("CHART_DENSITY_THRESHOLD", 10000)
+    CHART_DENSITY_BINS = safe_int_env("CHART_DENSITY_BINS", 60)
+    CHART_MAX_BARS = safe_int_env("CHART_MAX_BARS", 50)
+    
+    # Render Profiler: times render_* functions, data-layer calls and chart/table payloads
+    # of every rerun and shows them in a debug panel (adds overhead; keep off in production)
+    RENDER_PROFILER_ENABLED = os.getenv("RENDER_PROFILER", "false").lower() == "true"
+    # Reruns per session kept for the panel's JSON export
+    RENDER_PROFILER_HISTORY = safe_int_env("RENDER_PROFILER_HISTORY", 50)
+    
     # UI Settings
     DASHBOARD_TITLE = os.getenv("DASHBOARD_TITLE", "Jenkins Dashboard")
     PAGE_LAYOUT = os.getenv("PAGE_LAYOUT", "wide")
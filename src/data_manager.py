@@ -1,102 +1,479 @@
-import pandas as pd
-import sqlite3
 import time
+import streamlit as st
 from src.config import DashboardConfig
-
-DB_FILE = DashboardConfig.DB_FILE
+from src.job_query import build_page_query, build_overview_counts_query
+from src.sqlite_manager import SQLiteManager
+from src.schema import apply_job_schema
+from src.filter_engine import FilterEngine
+from src.recommendations import classify_jobs
 
 # Import PostgreSQL manager if needed
 try:
-    from src.postgres_manager import PostgreSQLManager
+    from src.postgres_manager import PostgreSQLManager, SyncListener
     POSTGRES_AVAILABLE = True
 except ImportError:
     POSTGRES_AVAILABLE = False
 
+# DuckDB backend is optional (pip install duckdb)
+try:
+    from src.duckdb_manager import DuckDBManager
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
 
-def init_db():
-    """Initialize database based on configuration"""
+# Columnar cache and analytics bundle need pyarrow (shipped with Streamlit)
+try:
+    from src.columnar_cache import read_columnar_cache, write_columnar_cache
+    COLUMNAR_CACHE_AVAILABLE = True
+except ImportError:
+    COLUMNAR_CACHE_AVAILABLE = False
+
+try:
+    from src.analytics_bundle import compute_analytics_bundle, read_analytics_bundle, write_analytics_bundle
+    ANALYTICS_BUNDLE_AVAILABLE = True
+except ImportError:
+    ANALYTICS_BUNDLE_AVAILABLE = False
+
+# Parquet exports need pyarrow as well
+try:
+    from src.exports import ExportJob, remove_expired_exports
+    EXPORTS_AVAILABLE = True
+except ImportError:
+    EXPORTS_AVAILABLE = False
+
+
+def get_storage_backend():
+    """
+    Get the storage backend for the configured DB_TYPE.
+    
+    Falls back to SQLite when the configured engine's driver is not installed.
+    
+    Returns:
+        StorageBackend: SQLiteManager, PostgreSQLManager or DuckDBManager
+    """
     if DashboardConfig.DB_TYPE == "postgresql" and POSTGRES_AVAILABLE:
-        # Use PostgreSQL
-        postgres_manager = PostgreSQLManager()
-        postgres_manager.init_db()
-    else:
-        # Use SQLite (default)
-        conn = sqlite3.connect(DB_FILE)
-        c = conn.cursor()
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS jenkins_items
-            (name TEXT, url TEXT, type TEXT, description TEXT, last_build_status TEXT, 
-             last_build_url TEXT, folder TEXT, timestamp REAL,
-             is_disabled INTEGER, last_build_date TEXT, last_successful_date TEXT,
-             last_failed_date TEXT, days_since_last_build INTEGER, total_builds INTEGER,
-             success_count INTEGER, failure_count INTEGER, success_rate REAL,
-             is_test_job INTEGER, last_build_duration INTEGER, last_successful_duration INTEGER,
-             last_failed_duration INTEGER, avg_build_duration REAL, avg_successful_duration REAL,
-             avg_failed_duration REAL, min_build_duration INTEGER, max_build_duration INTEGER,
-             total_build_duration INTEGER, owner_name TEXT, owner_email TEXT, other_tag TEXT, 
-             ownership_status TEXT, last_editor TEXT, last_user TEXT)
-        """)
-        conn.commit()
-        conn.close()
+        return PostgreSQLManager()
+    if DashboardConfig.DB_TYPE == "duckdb" and DUCKDB_AVAILABLE:
+        return DuckDBManager()
+    return SQLiteManager()
+
+
+@st.cache_resource(show_spinner=False)
+def init_db():
+    """Initialize database based on configuration (once per process)"""
+    get_storage_backend().init_db()
+
+
+@st.cache_resource(show_spinner=False)
+def get_sync_listener():
+    """
+    Start this process's listener for sync notifications (PostgreSQL only).
+    
+    Returns:
+        SyncListener: Tracks the sync version published by any replica, or None
+        when the backend or configuration does not support notifications
+    """
+    if not (DashboardConfig.DB_TYPE == "postgresql" and POSTGRES_AVAILABLE and DashboardConfig.SYNC_NOTIFY_ENABLED):
+        return None
+    return SyncListener(PostgreSQLManager(), DashboardConfig.SYNC_NOTIFY_CHANNEL, on_new_version=invalidate_caches)
+
+
+def sync_listener_active():
+    """Check whether sync versions currently arrive by notification instead of database probes"""
+    listener = get_sync_listener()
+    return listener is not None and listener.connected
+
+
+def invalidate_caches(sync_version=None):
+    """Drop this process's cached data, aggregates and statistics of previous syncs"""
+    _load_cached_data.clear()
+    _load_filter_engine.clear()
+    _load_analytics_bundle.clear()
+    _load_duration_statistics.clear()
+    _load_dashboard_aggregates.clear()
+    print(f"🔄 New sync version {sync_version} published - in-memory caches cleared")
+
+
+def get_sync_version():
+    """
+    Cheap probe identifying the currently stored sync.
+
+    Served from memory while the sync listener is connected; otherwise a
+    single-row lookup in the database.
+
+    Returns:
+        int: Id of the latest successful sync run, or None if no data is stored
+    """
+    listener = get_sync_listener()
+    if listener is not None and listener.connected and listener.version is not None:
+        return listener.version
+    return get_storage_backend().get_sync_version()
 
 
 def get_cached_data():
-    """Get cached data based on database configuration"""
-    if DashboardConfig.DB_TYPE == "postgresql" and POSTGRES_AVAILABLE:
-        # Use PostgreSQL
-        postgres_manager = PostgreSQLManager()
-        return postgres_manager.get_cached_data()
-    else:
-        # Use SQLite (default)
-        conn = sqlite3.connect(DB_FILE)
-        try:
-            # Get the data
-            df = pd.read_sql_query(
-                "SELECT name, url, type, description, last_build_status, last_build_url, folder, "
-                "is_disabled, last_build_date, last_successful_date, last_failed_date, "
-                "days_since_last_build, total_builds, success_count, failure_count, "
-                "success_rate, is_test_job, last_build_duration, last_successful_duration, "
-                "last_failed_duration, avg_build_duration, avg_successful_duration, "
-                "avg_failed_duration, min_build_duration, max_build_duration, "
-                "total_build_duration, owner_name, owner_email, other_tag, ownership_status, last_editor, last_user FROM jenkins_items",
-                conn,
-            )
-            
-            # Get the timestamp of when data was last cached
-            timestamp_result = conn.execute("SELECT timestamp FROM jenkins_items LIMIT 1").fetchone()
-            last_sync_timestamp = timestamp_result[0] if timestamp_result else None
-            
-            df["last_build_status"] = df["last_build_status"].fillna("Unknown")
-            # Convert boolean columns
-            df["is_disabled"] = df["is_disabled"].fillna(False).astype(bool)
-            df["is_test_job"] = df["is_test_job"].fillna(False).astype(bool)
-            # Fill NaN values for numeric columns
-            df["success_rate"] = df["success_rate"].fillna(0.0)
-            df["success_count"] = df["success_count"].fillna(0)
-            df["failure_count"] = df["failure_count"].fillna(0)
-            # Fill NaN values for duration columns
-            duration_columns = ["last_build_duration", "last_successful_duration", "last_failed_duration",
-                              "avg_build_duration", "avg_successful_duration", "avg_failed_duration",
-                              "min_build_duration", "max_build_duration", "total_build_duration"]
-            for col in duration_columns:
-                df[col] = df[col].fillna(0)
-            
-            return df, last_sync_timestamp
-        except (pd.io.sql.DatabaseError, sqlite3.OperationalError):
-            return None, None
-        finally:
-            conn.close()
+    """
+    Get cached data, reloading from the database only when a new sync has landed.
+
+    The cleaned DataFrame is shared by every session in the process and must be
+    treated as read-only by callers.
+    """
+    sync_version = get_sync_version()
+    if sync_version is None:
+        return None, None
+    df, last_sync_timestamp = _load_cached_data(sync_version)
+    if df is None:
+        # Do not keep serving a failed read to every session until the next sync
+        _load_cached_data.clear()
+    return df, last_sync_timestamp
+
+
+def columnar_cache_enabled():
+    """Check whether the columnar startup cache is configured and usable"""
+    return COLUMNAR_CACHE_AVAILABLE and DashboardConfig.COLUMNAR_CACHE_ENABLED
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_cached_data(sync_version):
+    """
+    Load and clean the stored jobs once per sync version, preferring the columnar
+    cache, and label them with the cleanup and outlier recommendations.
+    """
+    df = None
+    if columnar_cache_enabled():
+        df = read_columnar_cache(DashboardConfig.COLUMNAR_CACHE_FILE, sync_version)
+        if df is not None:
+            # Caches written before the compact schema still hold object columns
+            df, last_sync_timestamp = apply_job_schema(df), get_storage_backend().get_last_sync_time()
+    
+    if df is None:
+        df, last_sync_timestamp = _read_database()
+        # Rebuild a missing or stale columnar cache from the source of truth
+        if df is not None and columnar_cache_enabled():
+            write_columnar_cache(df, DashboardConfig.COLUMNAR_CACHE_FILE, sync_version)
+    
+    if df is not None:
+        # Labels depend on configurable thresholds, so they are not stored in the cache
+        df = classify_jobs(df)
+    return df, last_sync_timestamp
+
+
+def get_filter_engine():
+    """
+    Get the Overview filter engine of the current sync, shared by every session.
+    
+    Returns:
+        FilterEngine: Memoized filters over the cached jobs, or None if no data is stored
+    """
+    sync_version = get_sync_version()
+    if sync_version is None:
+        return None
+    engine = _load_filter_engine(sync_version)
+    if engine is None:
+        # Built from a failed read; retry on the next call
+        _load_filter_engine.clear()
+        _load_cached_data.clear()
+    return engine
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_filter_engine(sync_version):
+    """Build the search text and filter indexes once per sync version"""
+    df, _ = _load_cached_data(sync_version)
+    if df is None:
+        return None
+    return FilterEngine(df, cache_size=DashboardConfig.FILTER_CACHE_SIZE)
 
 
 def cache_data(df):
     """Cache data based on database configuration"""
-    if DashboardConfig.DB_TYPE == "postgresql" and POSTGRES_AVAILABLE:
-        # Use PostgreSQL
-        postgres_manager = PostgreSQLManager()
-        postgres_manager.cache_data(df)
-    else:
-        # Use SQLite (default)
-        conn = sqlite3.connect(DB_FILE)
-        df["timestamp"] = time.time()
-        df.to_sql("jenkins_items", conn, if_exists="replace", index=False)
-        conn.close()
+    cache_batches([df])
+
+
+def cache_batches(batches, fetch_metrics=None):
+    """
+    Stream a sync into the configured database batch by batch and publish it at the end.
+    
+    Args:
+        batches (iterable): Lists of job records, e.g. from iter_jenkins_item_batches()
+        fetch_metrics (callable): Returns the crawl counters recorded in the sync ledger
+        
+    Returns:
+        int: Number of jobs published (0 when the crawl returned no jobs)
+    """
+    backend = get_storage_backend()
+    job_count = backend.cache_batches(batches, fetch_metrics)
+    if job_count:
+        # Do not wait for our own notification before serving the new data
+        listener = get_sync_listener()
+        if listener is not None:
+            listener.advance(backend.get_sync_version())
+        refresh_sync_artifacts()
+    return job_count
+
+
+def refresh_sync_artifacts():
+    """
+    Write the files derived from a newly published sync: the columnar cache of
+    the cleaned, typed jobs table for fast startup and the analytics bundle.
+    """
+    if not (columnar_cache_enabled() or ANALYTICS_BUNDLE_AVAILABLE):
+        return
+    sync_version = get_sync_version()
+    df, _ = _read_database()
+    if df is None or sync_version is None:
+        return
+    if columnar_cache_enabled():
+        write_columnar_cache(df, DashboardConfig.COLUMNAR_CACHE_FILE, sync_version)
+    if ANALYTICS_BUNDLE_AVAILABLE:
+        bundle = compute_analytics_bundle(df, get_storage_backend().get_duration_sketches())
+        write_analytics_bundle(bundle, DashboardConfig.ANALYTICS_BUNDLE_DIR, sync_version)
+
+
+def _read_database():
+    """Read the cleaned jobs from the storage backend and apply the compact in-memory schema"""
+    df, last_sync_timestamp = get_storage_backend().get_cached_data()
+    if df is not None:
+        df = apply_job_schema(df)
+    return df, last_sync_timestamp
+
+
+def get_analytics_bundle():
+    """
+    Get the Analytics tab's statistics and tables for the current sync.
+    
+    Returns:
+        dict: See src.analytics_bundle.compute_analytics_bundle, or None if no
+        data is stored
+    """
+    sync_version = get_sync_version()
+    if sync_version is None or not ANALYTICS_BUNDLE_AVAILABLE:
+        return None
+    bundle = _load_analytics_bundle(sync_version)
+    if bundle is None:
+        # Built from a failed read; retry on the next call
+        _load_analytics_bundle.clear()
+        _load_cached_data.clear()
+    return bundle
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_analytics_bundle(sync_version):
+    """Read the bundle stored at sync time, building and storing it if missing (shared, read-only)"""
+    bundle = read_analytics_bundle(DashboardConfig.ANALYTICS_BUNDLE_DIR, sync_version)
+    if bundle is None:
+        df, _ = _load_cached_data(sync_version)
+        if df is None:
+            return None
+        bundle = compute_analytics_bundle(df, get_storage_backend().get_duration_sketches())
+        write_analytics_bundle(bundle, DashboardConfig.ANALYTICS_BUNDLE_DIR, sync_version)
+    return bundle
+
+
+def get_job_snapshots(url=None):
+    """Get per-sync snapshot history, optionally for a single job, oldest first"""
+    return get_storage_backend().get_job_snapshots(url)
+
+
+def cleanup_old_data(days_to_keep=90):
+    """Remove job snapshots and sync statistics older than the retention window"""
+    get_storage_backend().cleanup_old_data(days_to_keep)
+
+
+def get_sync_runs(limit=50):
+    """
+    Get the sync ledger, newest run first.
+    
+    Returns:
+        DataFrame: One row per sync with timing per phase, job changes and
+        request counters, or None when unavailable
+    """
+    return get_storage_backend().get_sync_runs(limit)
+
+
+def get_database_stats():
+    """
+    Get the statistics recorded with the latest sync.
+    
+    Returns:
+        dict: Job counters, last_sync and per-folder, per-status and per-owner
+        job counts (see src.aggregates), or None when unavailable
+    """
+    return get_storage_backend().get_database_stats()
+
+
+def get_duration_statistics():
+    """
+    Get the Analytics duration summary computed by the database engine.
+    
+    Returns:
+        dict: See StorageBackend.get_duration_statistics, or None when the
+        backend cannot compute it (SQLite) and pandas should be used instead
+    """
+    sync_version = get_sync_version()
+    if sync_version is None:
+        return None
+    return _load_duration_statistics(sync_version)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _load_duration_statistics(sync_version):
+    """Compute the duration summary once per sync version (sync_version is the cache key)"""
+    try:
+        return get_storage_backend().get_duration_statistics()
+    except Exception as e:
+        print(f"⚠️ Could not compute duration statistics: {e}")
+        return None
+
+
+def get_job_flakiness():
+    """
+    Get the flakiness of the current jobs, most flaky first.
+    
+    Returns:
+        DataFrame: See StorageBackend.get_job_flakiness (shared, read-only), or
+        None if no data is stored
+    """
+    sync_version = get_sync_version()
+    if sync_version is None:
+        return None
+    return _load_job_flakiness(sync_version)
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def _load_job_flakiness(sync_version):
+    """Read the flakiness maintained at sync time once per sync version"""
+    return get_storage_backend().get_job_flakiness()
+
+
+def get_dashboard_aggregates():
+    """
+    Get the aggregates precomputed at sync time for the unfiltered dashboard.
+    
+    Returns:
+        dict: overview (same shape as get_filtered_overview), summary counts,
+        ownership_counts (Series) and folder_performance (DataFrame), or None
+        when no aggregates are available for the current data
+    """
+    sync_version = get_sync_version()
+    if sync_version is None:
+        return None
+    return _load_dashboard_aggregates(sync_version, DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS)
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _load_dashboard_aggregates(sync_version, inactive_threshold_days):
+    """Read the aggregate tables; cached until the next sync (sync_version is the cache key)"""
+    try:
+        summary = _read_query("SELECT metric, value FROM agg_summary", None)
+        status_counts = _read_query("SELECT last_build_status, job_count, inactive_count FROM agg_status_counts", None)
+        ownership_counts = _read_query("SELECT ownership_status, job_count FROM agg_ownership_counts", None)
+        folder_performance = _read_query(
+            "SELECT folder, job_count, avg_build_duration_min, success_rate FROM agg_folder_performance", None
+        )
+    except Exception as e:
+        print(f"⚠️ Could not read dashboard aggregates: {e}")
+        return None
+    
+    summary = summary.set_index("metric")["value"]
+    # Counts depend on the inactivity threshold in effect when they were computed
+    if summary.empty or summary.get("inactive_threshold_days") != inactive_threshold_days:
+        return None
+    
+    status_series = status_counts.set_index("last_build_status")["job_count"].astype(int).sort_values(ascending=False)
+    return {
+        "overview": {
+            "job_count": int(status_series.sum()),
+            "status_counts": status_series,
+            "inactive_count": int(status_counts["inactive_count"].fillna(0).sum()),
+        },
+        "summary": {
+            metric: int(summary.get(metric, 0))
+            for metric in ["job_count", "test_jobs", "disabled_jobs", "inactive_jobs"]
+        },
+        "ownership_counts": ownership_counts.set_index("ownership_status")["job_count"].astype(int),
+        "folder_performance": folder_performance.set_index("folder"),
+    }
+
+
+def _read_query(query, params):
+    """Run a read-only query against the configured database and return a DataFrame"""
+    return get_storage_backend().read_query(query, params)
+
+
+def _query_dialect():
+    """SQL dialect of the configured database"""
+    return get_storage_backend().dialect
+
+
+def query_jobs_page(filters, sort_column="name", descending=False, page_size=50, after=None):
+    """
+    Fetch one page of filtered jobs from the database using keyset pagination.
+    
+    Args:
+        filters (dict): Overview filter values (see src.job_query.empty_filters)
+        sort_column (str): Column to sort by (see src.job_query.SORT_EXPRESSIONS)
+        descending (bool): Sort direction
+        page_size (int): Number of rows to fetch
+        after (tuple): (sort_key, url) cursor of the previous page's last row
+        
+    Returns:
+        DataFrame: The page, including a sort_key column for building the next cursor
+    """
+    query, params = build_page_query(filters, _query_dialect(), sort_column, descending, page_size, after)
+    df = _read_query(query, params)
+    df["last_build_status"] = df["last_build_status"].fillna("Unknown")
+    df["success_rate"] = df["success_rate"].fillna(0.0)
+    return df
+
+
+def start_export(filters, export_format, include_history=False):
+    """
+    Start a server-side export of the jobs matching a filter set.
+    
+    Args:
+        filters (dict): Overview filter values (see src.job_query.empty_filters)
+        export_format (str): "csv", "parquet" or "ndjson" (see src.exports.EXPORT_FORMATS)
+        include_history (bool): Also export the matching jobs' snapshot history
+        
+    Returns:
+        str: Export id for get_export()
+    """
+    # Expired files and the exports that wrote them are dropped as new ones start
+    remove_expired_exports(DashboardConfig.EXPORT_DIR, DashboardConfig.EXPORT_RETENTION_HOURS)
+    exports = _export_jobs()
+    cutoff = time.time() - DashboardConfig.EXPORT_RETENTION_HOURS * 3600
+    for export_id, job in list(exports.items()):
+        if job.finished_at is not None and job.finished_at < cutoff:
+            exports.pop(export_id, None)
+    
+    job = ExportJob(get_storage_backend(), filters, export_format, include_history).start()
+    exports[job.export_id] = job
+    return job.export_id
+
+
+def get_export(export_id):
+    """Get a started export (see src.exports.ExportJob), or None if unknown or expired"""
+    return _export_jobs().get(export_id)
+
+
+@st.cache_resource(show_spinner=False)
+def _export_jobs():
+    """Exports started by this process by id, shared by every session"""
+    return {}
+
+
+def get_filtered_overview(filters):
+    """
+    Compute the Overview KPI inputs for a filter set inside the database.
+    
+    Returns:
+        dict: job_count, status_counts (Series, largest first) and inactive_count
+    """
+    query, params = build_overview_counts_query(filters, _query_dialect())
+    counts = _read_query(query, params)
+    status_counts = counts.set_index("last_build_status")["job_count"].astype(int).sort_values(ascending=False)
+    return {
+        "job_count": int(status_counts.sum()),
+        "status_counts": status_counts,
+        "inactive_count": int(counts["inactive_count"].fillna(0).sum()),
+    }
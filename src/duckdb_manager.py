@@ -0,0 +1,164 @@
+import duckdb
+import pandas as pd
+import time
+from src.config import DashboardConfig
+from src.storage_backend import StorageBackend, JOB_COLUMNS, DATE_COLUMNS, SNAPSHOT_COLUMNS, build_staging_schema
+from src.aggregates import AGGREGATE_SCHEMA, SYNC_STATS_SCHEMA, refresh_aggregates
+from src.sync_ledger import SYNC_RUNS_SCHEMA, SYNC_LOCK_SCHEMA, SYNC_RUNS_RETENTION_DELETE, backfill_sync_run
+from src.duration_sketch import DURATION_SKETCH_SCHEMA
+from src.flakiness import JOB_BUILDS_SCHEMA, JOB_FLAKINESS_SCHEMA
+from src.build_history import build_history_staging_schema
+
+
+class DuckDBManager(StorageBackend):
+    """
+    Embedded DuckDB database manager for analytics-heavy deployments.
+
+    DuckDB stores jenkins_items column-wise, so the dashboard's scans, group-bys
+    and percentiles run without an external server. A database file can only be
+    opened for writing by one process at a time.
+    """
+
+    dialect = "duckdb"
+    name = "DuckDB"
+    supports_percentiles = True
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or DashboardConfig.DUCKDB_FILE
+
+    def get_connection(self):
+        """Get DuckDB database connection"""
+        return duckdb.connect(self.db_file)
+
+    def _cursor(self, conn):
+        # DuckDB connections execute statements themselves; conn.cursor() would
+        # open a separate connection outside the current transaction
+        return conn
+
+    def _begin_write(self, conn):
+        # DuckDB connections autocommit unless a transaction is started explicitly
+        conn.begin()
+        return conn
+
+    def _rollback(self, conn):
+        # Unlike DB-API drivers, DuckDB refuses to roll back when no transaction is open
+        try:
+            conn.rollback()
+        except duckdb.TransactionException:
+            pass
+
+    def read_query(self, query, params=None):
+        """Run a read-only query and return the result as a DataFrame"""
+        with self._read_connection() as conn:
+            return conn.execute(query, list(params) if params else []).df()
+
+    def iter_query(self, query, params=None, chunk_size=10000):
+        """Stream the result as Arrow record batches, converted to DataFrames without per-value Python objects"""
+        with self._read_connection() as conn:
+            reader = conn.execute(query, list(params) if params else []).fetch_record_batch(chunk_size)
+            empty = True
+            for batch in reader:
+                empty = False
+                yield batch.to_pandas()
+            if empty:
+                yield reader.schema.empty_table().to_pandas()
+
+    def init_db(self):
+        """Create the tables and aggregates if they do not exist"""
+        conn = self.get_connection()
+        try:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS jenkins_items (
+                    name VARCHAR, url VARCHAR, type VARCHAR, description VARCHAR,
+                    last_build_status VARCHAR, last_build_url VARCHAR, folder VARCHAR,
+                    is_disabled BOOLEAN, last_build_date TIMESTAMPTZ, last_successful_date TIMESTAMPTZ,
+                    last_failed_date TIMESTAMPTZ, days_since_last_build INTEGER, total_builds INTEGER,
+                    success_count INTEGER, failure_count INTEGER, success_rate DOUBLE,
+                    is_test_job BOOLEAN, last_build_duration BIGINT, last_successful_duration BIGINT,
+                    last_failed_duration BIGINT, avg_build_duration DOUBLE, avg_successful_duration DOUBLE,
+                    avg_failed_duration DOUBLE, min_build_duration BIGINT, max_build_duration BIGINT,
+                    total_build_duration BIGINT, owner_name VARCHAR, owner_email VARCHAR, other_tag VARCHAR,
+                    ownership_status VARCHAR, last_editor VARCHAR, last_user VARCHAR, timestamp DOUBLE,
+                    sync_run_id INTEGER
+                )
+            """)
+            conn.execute("ALTER TABLE jenkins_items ADD COLUMN IF NOT EXISTS sync_run_id INTEGER")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS job_snapshots (
+                    url VARCHAR NOT NULL, name VARCHAR NOT NULL, folder VARCHAR, snapshot_time DOUBLE NOT NULL,
+                    last_build_status VARCHAR, success_rate DOUBLE, last_build_duration BIGINT,
+                    avg_build_duration DOUBLE, max_build_duration BIGINT, is_disabled BOOLEAN
+                )
+            """)
+            for statement in AGGREGATE_SCHEMA:
+                conn.execute(statement)
+            conn.execute(SYNC_STATS_SCHEMA)
+            # Backfill the dashboard aggregates for data synced before they existed
+            if conn.execute("SELECT 1 FROM agg_summary LIMIT 1").fetchone() is None:
+                refresh_aggregates(conn, self.dialect)
+            conn.execute(SYNC_RUNS_SCHEMA)
+            backfill_sync_run(conn, self.dialect)
+            for statement in SYNC_LOCK_SCHEMA:
+                conn.execute(statement)
+            conn.execute(DURATION_SKETCH_SCHEMA)
+            conn.execute(JOB_BUILDS_SCHEMA)
+            conn.execute(JOB_FLAKINESS_SCHEMA)
+            conn.execute(build_staging_schema(self.dialect))
+            for statement in build_history_staging_schema(self.dialect):
+                conn.execute(statement)
+            print("✅ DuckDB database initialized successfully")
+        except Exception as e:
+            print(f"❌ Failed to initialize DuckDB database: {e}")
+            raise
+        finally:
+            conn.close()
+
+    def _insert_jobs(self, conn, df, table):
+        """Bulk insert a batch of jobs into table in one columnar insert"""
+        incoming = df.reindex(columns=JOB_COLUMNS)
+        for col in DATE_COLUMNS:
+            incoming[col] = pd.to_datetime(incoming[col], utc=True, errors='coerce')
+
+        conn.register("incoming_jobs", incoming)
+        try:
+            conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM incoming_jobs")
+        finally:
+            conn.unregister("incoming_jobs")
+
+    def _insert_rows(self, conn, df, table):
+        """Bulk insert the rows of df into table in one columnar insert"""
+        if df.empty:
+            return
+        conn.register("incoming_rows", df)
+        try:
+            conn.execute(f"INSERT INTO {table} BY NAME SELECT * FROM incoming_rows")
+        finally:
+            conn.unregister("incoming_rows")
+
+    def _record_snapshots(self, cursor, sync_timestamp):
+        """Append a snapshot for every job whose tracked metrics changed since its latest snapshot"""
+        columns = ", ".join(SNAPSHOT_COLUMNS)
+        changed = " OR ".join(f"s.{col} IS DISTINCT FROM j.{col}" for col in SNAPSHOT_COLUMNS)
+        result = cursor.execute(f"""
+            INSERT INTO job_snapshots (url, name, folder, snapshot_time, {columns})
+            SELECT j.url, j.name, j.folder, ?, {", ".join(f"j.{col}" for col in SNAPSHOT_COLUMNS)}
+            FROM jenkins_items j
+            LEFT JOIN (
+                SELECT url, {columns},
+                       ROW_NUMBER() OVER (PARTITION BY url ORDER BY snapshot_time DESC) AS snapshot_rank
+                FROM job_snapshots
+            ) s ON s.url = j.url AND s.snapshot_rank = 1
+            WHERE s.url IS NULL OR {changed}
+        """, [sync_timestamp])
+        return result.fetchone()[0]
+
+    def cleanup_old_data(self, days_to_keep=90):
+        """Remove job snapshots, sync statistics and sync runs older than the retention window"""
+        conn = self.get_connection()
+        try:
+            cutoff_timestamp = time.time() - (days_to_keep * 24 * 60 * 60)
+            conn.execute("DELETE FROM job_snapshots WHERE snapshot_time < ?", [cutoff_timestamp])
+            conn.execute("DELETE FROM sync_stats WHERE sync_time < ?", [cutoff_timestamp])
+            conn.execute(SYNC_RUNS_RETENTION_DELETE.format(placeholder="?"), [cutoff_timestamp])
+        finally:
+            conn.close()
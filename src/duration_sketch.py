@@ -0,0 +1,204 @@
+import json
+import math
+import numpy as np
+import pandas as pd
+from src.job_query import PLACEHOLDERS
+
+# Build duration percentiles from mergeable quantile sketches. A sketch is a
+# DDSketch-style histogram over logarithmic buckets: a duration d falls in bucket
+# ceil(log(d) / log(GAMMA)), and every bucket is reported by a value within
+# SKETCH_RELATIVE_ACCURACY of the durations it holds. Sketches merge by adding
+# bucket counts, so each job keeps one sketch in job_duration_sketches that a
+# sync extends with the builds it has not seen before (src/build_history.py),
+# and folder and controller percentiles merge the job sketches instead of
+# rescanning builds.
+
+# Relative error of every reported percentile
+SKETCH_RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + SKETCH_RELATIVE_ACCURACY) / (1 - SKETCH_RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Stored percentile columns (milliseconds) -> quantile
+PERCENTILES = {"p50_duration": 0.5, "p90_duration": 0.9, "p99_duration": 0.99}
+PERCENTILE_COLUMNS = list(PERCENTILES)
+
+DURATION_SKETCH_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS job_duration_sketches (
+        url TEXT PRIMARY KEY,
+        sketch TEXT NOT NULL,
+        last_build_time BIGINT,
+        build_count INTEGER,
+        p50_duration DOUBLE PRECISION,
+        p90_duration DOUBLE PRECISION,
+        p99_duration DOUBLE PRECISION
+    )
+"""
+
+# Sketches of jobs no longer on the controller; run after publishing a sync
+DURATION_SKETCH_PRUNE = "DELETE FROM job_duration_sketches WHERE url NOT IN (SELECT url FROM jenkins_items)"
+
+SKETCH_COLUMNS = ["url", "sketch", "last_build_time", "build_count", *PERCENTILE_COLUMNS]
+
+# Existing sketches are looked up this many urls at a time (bounded by driver parameter limits)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def sketch_durations(durations):
+    """
+    Sketch a collection of build durations.
+
+    Args:
+        durations (iterable): Durations in milliseconds; non-positive values are ignored
+
+    Returns:
+        dict: Bucket index -> count
+    """
+    values = np.asarray(list(durations), dtype=float)
+    values = values[values > 0]
+    if values.size == 0:
+        return {}
+    buckets, counts = np.unique(np.ceil(np.log(values) / LOG_GAMMA).astype(np.int64), return_counts=True)
+    return dict(zip(buckets.tolist(), counts.tolist()))
+
+
+def merge_sketches(*sketches):
+    """Merge sketches into a new one covering all their durations"""
+    merged = {}
+    for sketch in sketches:
+        for bucket, count in sketch.items():
+            merged[bucket] = merged.get(bucket, 0) + count
+    return merged
+
+
+def bucket_values(buckets):
+    """Representative duration of each bucket, within SKETCH_RELATIVE_ACCURACY of any duration in it"""
+    return 2 * np.power(GAMMA, np.asarray(buckets, dtype=float)) / (GAMMA + 1)
+
+
+def sketch_quantiles(sketch):
+    """
+    Estimate the PERCENTILES of a sketch.
+
+    Returns:
+        dict: Percentile column -> duration in milliseconds (None for an empty sketch)
+    """
+    if not sketch:
+        return {column: None for column in PERCENTILE_COLUMNS}
+    buckets = np.array(sorted(sketch))
+    cumulative = np.cumsum([sketch[bucket] for bucket in buckets])
+    values = bucket_values(buckets)
+    total = cumulative[-1]
+    return {
+        # Lower quantile: the bucket holding the rank q * (n - 1) (0-based)
+        column: float(values[np.searchsorted(cumulative, q * (total - 1), side="right")])
+        for column, q in PERCENTILES.items()
+    }
+
+
+def encode_sketch(sketch):
+    """Serialize a sketch for storage"""
+    return json.dumps({str(bucket): count for bucket, count in sorted(sketch.items())}, separators=(",", ":"))
+
+
+def decode_sketch(text):
+    """Deserialize a stored sketch"""
+    if not text:
+        return {}
+    return {int(bucket): count for bucket, count in json.loads(text).items()}
+
+
+def update_job_sketches(cursor, dialect, builds):
+    """
+    Fold new builds into the stored sketches of their jobs.
+
+    Every build passed is added, so the caller must pass each build once;
+    src.build_history skips the builds already recorded in job_builds. The
+    sketch thus keeps growing past the build window Jenkins returns.
+    last_build_time is the latest build added so far. Runs inside the
+    caller's write transaction.
+
+    Args:
+        cursor: Cursor of the open write transaction
+        dialect (str): SQL dialect of the cursor
+        builds (DataFrame): url, build_time (epoch ms) and duration (ms) of
+            each new build
+
+    Returns:
+        int: Number of builds added
+    """
+    builds = builds[pd.to_numeric(builds["duration"], errors="coerce") > 0]
+    placeholder = PLACEHOLDERS[dialect]
+    urls = builds["url"].unique().tolist()
+    stored = {}
+    for start in range(0, len(urls), LOOKUP_CHUNK_SIZE):
+        chunk = urls[start:start + LOOKUP_CHUNK_SIZE]
+        cursor.execute(
+            f"SELECT url, sketch, last_build_time, build_count FROM job_duration_sketches "
+            f"WHERE url IN ({', '.join([placeholder] * len(chunk))})",
+            chunk
+        )
+        for url, sketch, last_build_time, build_count in cursor.fetchall():
+            stored[url] = (sketch, last_build_time, build_count)
+
+    rows = []
+    added = 0
+    for url, job_builds in builds.groupby("url", sort=False):
+        sketch_text, last_build_time, build_count = stored.get(url, (None, None, 0))
+        new_builds = sketch_durations(job_builds["duration"])
+        sketch = merge_sketches(decode_sketch(sketch_text), new_builds)
+        latest = max(job_builds["build_time"].max(), last_build_time or 0)
+        count = (build_count or 0) + sum(new_builds.values())
+        added += sum(new_builds.values())
+        quantiles = sketch_quantiles(sketch)
+        rows.append((url, encode_sketch(sketch), int(latest), int(count),
+                     *[quantiles[column] for column in PERCENTILE_COLUMNS]))
+
+    if rows:
+        updates = ", ".join(f"{column} = excluded.{column}" for column in SKETCH_COLUMNS[1:])
+        cursor.executemany(
+            f"INSERT INTO job_duration_sketches ({', '.join(SKETCH_COLUMNS)}) "
+            f"VALUES ({', '.join([placeholder] * len(SKETCH_COLUMNS))}) "
+            f"ON CONFLICT (url) DO UPDATE SET {updates}",
+            rows
+        )
+    return added
+
+
+def grouped_percentiles(sketches, groups):
+    """
+    Percentiles of merged sketches per group, e.g. per folder or for the whole controller.
+
+    Merging is a grouped sum of bucket counts, so the cost depends on the number
+    of (group, bucket) pairs rather than on the number of builds.
+
+    Args:
+        sketches (Series): Stored sketch text per job
+        groups (Series): Group of each job, aligned with sketches
+
+    Returns:
+        DataFrame: Indexed by group, with job_count, build_count and the
+        PERCENTILE_COLUMNS in milliseconds
+    """
+    columns = ["job_count", "build_count", *PERCENTILE_COLUMNS]
+    decoded = [decode_sketch(text) for text in sketches]
+    buckets = pd.DataFrame({
+        "group": np.repeat(groups.to_numpy(), [len(sketch) for sketch in decoded]),
+        "bucket": [bucket for sketch in decoded for bucket in sketch],
+        "count": [count for sketch in decoded for count in sketch.values()],
+    })
+    if buckets.empty:
+        return pd.DataFrame(columns=columns)
+
+    merged = buckets.groupby(["group", "bucket"], sort=True)["count"].sum().reset_index()
+    merged["cumulative"] = merged.groupby("group")["count"].cumsum()
+    totals = merged.groupby("group")["count"].sum()
+    merged["total"] = merged["group"].map(totals)
+    merged["value"] = bucket_values(merged["bucket"])
+
+    result = pd.DataFrame({"build_count": totals})
+    result["job_count"] = pd.Series([len(sketch) > 0 for sketch in decoded]).groupby(groups.to_numpy()).sum()
+    for column, q in PERCENTILES.items():
+        # First bucket per group whose cumulative count passes the rank q * (n - 1)
+        reached = merged[merged["cumulative"] > q * (merged["total"] - 1)]
+        result[column] = reached.groupby("group")["value"].first()
+    return result[columns]
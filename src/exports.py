@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+import uuid
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.config import DashboardConfig
+from src.storage_backend import JOB_COLUMNS, DATE_COLUMNS, SNAPSHOT_COLUMNS
+from src.schema import INTEGER_COLUMNS
+from src.job_query import build_export_query, build_history_export_query
+
+# Server-side exports of the filtered jobs and, optionally, their snapshot
+# history. An ExportJob runs in a background thread, streams the result from the
+# storage backend in EXPORT_CHUNK_SIZE chunks and appends each chunk to a file in
+# EXPORT_DIR, so neither the app's memory nor other sessions depend on the export size.
+
+# Supported formats: key -> (display name, file extension)
+EXPORT_FORMATS = {
+    "csv": ("CSV", ".csv"),
+    "parquet": ("Parquet", ".parquet"),
+    "ndjson": ("JSON Lines", ".ndjson"),
+}
+
+# Columns of the history file (job_snapshots)
+HISTORY_COLUMNS = ["url", "name", "folder", "snapshot_time"] + SNAPSHOT_COLUMNS
+
+# Exported column types; every other column is text. Types are fixed up front so
+# each chunk of a file has the same schema whatever values it happens to hold.
+BOOLEAN_COLUMNS = ["is_disabled", "is_test_job"]
+FLOAT_COLUMNS = ["success_rate", "avg_build_duration", "avg_successful_duration", "avg_failed_duration"]
+TIMESTAMP_COLUMNS = DATE_COLUMNS + ["snapshot_time"]
+
+
+def normalize_chunk(df):
+    """Convert a chunk as returned by any backend driver to the export column types"""
+    for col in df.columns:
+        if col in TIMESTAMP_COLUMNS:
+            if pd.api.types.is_numeric_dtype(df[col]):
+                # Embedded stores keep epoch seconds
+                values = pd.to_datetime(df[col], unit="s", utc=True)
+            else:
+                values = pd.to_datetime(df[col], utc=True, errors="coerce", format="mixed")
+            # One resolution for every chunk, whatever the driver returned
+            df[col] = values.astype("datetime64[us, UTC]")
+        elif col in BOOLEAN_COLUMNS:
+            df[col] = df[col].astype("boolean")
+        elif col in INTEGER_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+        elif col in FLOAT_COLUMNS:
+            df[col] = pd.to_numeric(df[col], errors="coerce").astype("float64")
+        else:
+            df[col] = df[col].astype("string")
+    return df
+
+
+def write_chunks(chunks, path, export_format, on_rows=None):
+    """
+    Append DataFrame chunks to one export file.
+
+    Args:
+        chunks (iterable): DataFrames with the same columns
+        path (str): File to create
+        export_format (str): Key of EXPORT_FORMATS
+        on_rows (callable): Called with the number of rows of each written chunk
+
+    Returns:
+        int: Rows written
+    """
+    rows = 0
+    writer = None
+    with open(path, "wb") as f:
+        try:
+            for chunk in chunks:
+                chunk = normalize_chunk(chunk)
+                if export_format == "parquet":
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(f, table.schema)
+                    # Each chunk becomes one row group
+                    writer.write_table(table.cast(writer.schema))
+                elif export_format == "csv":
+                    f.write(chunk.to_csv(index=False, header=writer is None).encode("utf-8"))
+                    writer = True
+                else:
+                    if len(chunk):
+                        text = chunk.to_json(orient="records", lines=True, date_format="iso", force_ascii=False)
+                        f.write(text.rstrip("\n").encode("utf-8") + b"\n")
+                rows += len(chunk)
+                if on_rows is not None:
+                    on_rows(len(chunk))
+        finally:
+            if export_format == "parquet" and writer is not None:
+                writer.close()
+    return rows
+
+
+def remove_expired_exports(directory, retention_hours):
+    """Delete export files older than the retention window"""
+    if not os.path.isdir(directory):
+        return
+    cutoff = time.time() - retention_hours * 3600
+    for entry in os.scandir(directory):
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError as e:
+            print(f"⚠️ Warning: Failed to remove expired export {entry.path}: {e}")
+
+
+class ExportJob:
+    """
+    One export of the jobs matching a filter set, written by a daemon thread.
+
+    Progress attributes (status, rows, files, error) are updated as the export
+    runs and may be read from any session.
+    """
+
+    def __init__(self, backend, filters, export_format, include_history=False, directory=None):
+        """
+        Args:
+            backend (StorageBackend): Backend to stream from
+            filters (dict): Overview filter values (see src.job_query.empty_filters)
+            export_format (str): Key of EXPORT_FORMATS
+            include_history (bool): Also export the job_snapshots history of the matching jobs
+            directory (str): Directory receiving the files, defaults to EXPORT_DIR
+        """
+        self.backend = backend
+        self.filters = dict(filters)
+        self.export_format = export_format
+        self.include_history = include_history
+        self.directory = directory or DashboardConfig.EXPORT_DIR
+        # Random, so the files' static URLs cannot be guessed
+        self.export_id = uuid.uuid4().hex
+        self.status = "running"
+        self.rows = 0
+        self.files = []  # (label, path, rows) of each finished file
+        self.error = None
+        self.started_at = time.time()
+        self.finished_at = None
+        self._thread = threading.Thread(target=self._run, name=f"export-{self.export_id[:8]}", daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def _add_rows(self, count):
+        self.rows += count
+
+    def _run(self):
+        extension = EXPORT_FORMATS[self.export_format][1]
+        exports = [("Jobs", "jobs", build_export_query, JOB_COLUMNS)]
+        if self.include_history:
+            exports.append(("Build History", "history", build_history_export_query, HISTORY_COLUMNS))
+        path = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            for label, suffix, build_query, columns in exports:
+                query, params = build_query(self.filters, self.backend.dialect, columns)
+                path = os.path.join(self.directory, f"jenkins-{suffix}-{self.export_id}{extension}")
+                chunks = self.backend.iter_query(query, params, DashboardConfig.EXPORT_CHUNK_SIZE)
+                file_rows = write_chunks(chunks, path, self.export_format, on_rows=self._add_rows)
+                self.files.append((label, path, file_rows))
+                path = None
+            self.status = "done"
+            print(f"✅ Export {self.export_id} finished: {self.rows} rows in {time.time() - self.started_at:.1f}s")
+        except Exception as e:
+            self.error = str(e)
+            self.status = "failed"
+            print(f"❌ Export {self.export_id} failed: {e}")
+            if path is not None and os.path.exists(path):
+                # Do not leave a truncated file behind
+                os.remove(path)
+        finally:
+            self.finished_at = time.time()
@@ -0,0 +1,270 @@
+import re
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.job_query import has_active_filters
+
+# In-memory Overview filtering. A FilterEngine is built once per sync over the
+# shared jobs frame: Quick Search matches one precomputed lowercased text per job
+# and the folder, status and ownership filters look up row positions in inverted
+# indexes. Results and their sort orders are memoized by filter set, and a
+# search term that extends the previous one only re-checks the previous matches.
+
+# Raw column names behind src.job_query.SEARCH_COLUMNS, in the same order
+SEARCH_TEXT_COLUMNS = [
+    "name", "folder", "last_build_status", "type", "description", "other_tag", "last_editor", "last_user"
+]
+
+# Columns with an inverted index (value -> row positions)
+INDEXED_COLUMNS = ["folder", "last_build_status", "ownership_status"]
+
+# Sortable columns and the value missing entries sort as, following
+# src.job_query.SORT_EXPRESSIONS
+SORT_NULL_VALUES = {
+    "name": None,
+    "folder": None,
+    "last_build_status": "Unknown",
+    "success_rate": 0,
+    "days_since_last_build": -1,
+    "total_builds": 0,
+}
+
+# Advanced filters matched as case-insensitive substrings of one column
+CONTAINS_FILTERS = [
+    ("name_filter", "name"), ("folder_filter", "folder"),
+    ("description_filter", "description"), ("tag_filter", "other_tag")
+]
+
+
+def lowercase_text(values):
+    """
+    Lowercase a column as a numpy array of str, missing values as "".
+
+    Categorical columns are lowercased once per category rather than per row.
+    """
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        categories = np.array([str(category).lower() for category in values.cat.categories] + [""], dtype=object)
+        # Code -1 (missing) picks the trailing ""
+        return categories[values.cat.codes.to_numpy()]
+    return values.fillna("").astype(str).str.lower().to_numpy(dtype=object)
+
+
+def contains_positions(texts, term, positions=None):
+    """
+    Row positions whose text contains term.
+
+    Args:
+        texts (ndarray): Lowercased texts, one per row
+        term (str): Lowercased substring, matched literally
+        positions (ndarray): Only check these rows (all rows when None)
+
+    Returns:
+        ndarray: Matching row positions in ascending order
+    """
+    if positions is None:
+        positions = np.arange(len(texts))
+    matches = np.fromiter((term in texts[i] for i in positions), dtype=bool, count=len(positions))
+    return positions[matches]
+
+
+class FilterEngine:
+    """
+    Memoized Overview filters over one sync's jobs frame.
+
+    The frame is shared between sessions and never modified; filter results are
+    views selected by row position. Safe to use from concurrent sessions.
+    """
+
+    def __init__(self, df, cache_size=32, reuse_searches=True):
+        """
+        Args:
+            df (DataFrame): Cleaned jobs of one sync
+            cache_size (int): Filter results kept in the LRU cache (0 disables memoization)
+            reuse_searches (bool): Narrow a Quick Search that extends the previous
+                term from its matches (disable to time full searches)
+        """
+        self.df = df
+        self.cache_size = cache_size
+        self.reuse_searches = reuse_searches
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        # Last Quick Search (term, positions), reused when the term is extended
+        self._last_search = ("", None)
+
+        texts = [lowercase_text(df[col]) if col in df.columns else np.full(len(df), "", dtype=object)
+                 for col in SEARCH_TEXT_COLUMNS]
+        # Newline-joined like src.job_query.search_text_expression; a typed term never
+        # contains a newline, so a match always lies within one column
+        self.search_text = np.array(["\n".join(row) for row in zip(*texts)], dtype=object)
+        self._column_text = dict(zip(SEARCH_TEXT_COLUMNS, texts))
+        # All search texts in one NUL-separated string with each row's start offset,
+        # so a full scan is a sequence of C-level str.find calls instead of a per-row loop
+        self._search_blob = "\0".join(self.search_text)
+        lengths = np.fromiter((len(text) + 1 for text in self.search_text), dtype=np.int64, count=len(df))
+        self._row_starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]) if len(df) else lengths
+
+        # Per-column integer sort keys, built on first use
+        self._sort_keys = {}
+
+        self.indexes = {
+            col: {value: np.asarray(rows) for value, rows in df.groupby(col, observed=True, sort=False).indices.items()}
+            for col in INDEXED_COLUMNS if col in df.columns
+        }
+
+    @staticmethod
+    def filter_key(filters):
+        """Normalized, hashable form of a filter set (see src.job_query.empty_filters)"""
+        return (
+            (filters.get("search_term") or "").lower(),
+            *[(filters.get(key) or "").lower() for key, _ in CONTAINS_FILTERS],
+            tuple(sorted(filters.get("folders") or [])),
+            tuple(sorted(filters.get("statuses") or [])),
+            filters.get("ownership_status") or "All",
+        )
+
+    def apply(self, filters, columns=None):
+        """
+        Filter the jobs.
+
+        Args:
+            filters (dict): Overview filter values (see src.job_query.empty_filters)
+            columns (list): Only materialize these columns (all when None)
+
+        Returns:
+            DataFrame: The matching jobs in their original order; the shared
+            frame itself (or a view of its columns) when no filter is active
+        """
+        # Selecting columns first is a lazy view, so only their filtered rows are copied
+        jobs = self.df if columns is None else self.df[columns]
+        if not has_active_filters(filters):
+            return jobs
+        return jobs.iloc[self.positions(filters)]
+
+    def positions(self, filters):
+        """Memoized row positions of the jobs matching a filter set, ascending"""
+        key = self.filter_key(filters)
+        return self._memoized(key, lambda: self._positions(key))
+
+    def page(self, filters, sort_column="name", descending=False, offset=0, limit=50):
+        """
+        Fetch one page of the filtered jobs; only the page's rows are materialized.
+
+        Args:
+            filters (dict): Overview filter values (see src.job_query.empty_filters)
+            sort_column (str): Key of SORT_NULL_VALUES
+            descending (bool): Sort direction
+            offset (int): Number of sorted rows to skip
+            limit (int): Maximum number of rows to return
+
+        Returns:
+            DataFrame: The page, in sort order
+        """
+        return self.df.iloc[self.sorted_positions(filters, sort_column, descending)[offset:offset + limit]]
+
+    def sorted_positions(self, filters, sort_column="name", descending=False):
+        """
+        Memoized row positions of the filtered jobs in sort order.
+
+        Ties are broken by url, like the keyset order of src.job_query.build_page_query.
+        """
+        if sort_column not in SORT_NULL_VALUES:
+            sort_column = "name"
+        key = (self.filter_key(filters), sort_column, descending)
+
+        def sort():
+            positions = self.positions(filters)
+            order = np.lexsort((self._sort_key("url")[positions], self._sort_key(sort_column)[positions]))
+            return positions[order[::-1] if descending else order]
+
+        return self._memoized(key, sort)
+
+    def _memoized(self, key, compute):
+        """Look up key in the LRU cache, computing and storing the value on a miss"""
+        with self._lock:
+            value = self._results.get(key)
+            if value is not None:
+                self._results.move_to_end(key)
+                return value
+        value = compute()
+        if self.cache_size > 0:
+            with self._lock:
+                self._results[key] = value
+                while len(self._results) > self.cache_size:
+                    self._results.popitem(last=False)
+        return value
+
+    def _sort_key(self, col):
+        """Integer or float array ordering the rows by col, with missing values folded per SORT_NULL_VALUES"""
+        sort_key = self._sort_keys.get(col)
+        if sort_key is None:
+            values = pd.Series(self.df[col]) if col in self.df.columns else pd.Series([None] * len(self.df))
+            null_value = SORT_NULL_VALUES.get(col)
+            if pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype):
+                sort_key = pd.to_numeric(values, errors="coerce").astype(float).fillna(null_value).to_numpy()
+            else:
+                values = values.astype(object)
+                if null_value is not None:
+                    values = values.fillna(null_value)
+                # Rank of each text in sorted order; missing values rank first (-1)
+                sort_key = pd.factorize(values, sort=True)[0]
+            self._sort_keys[col] = sort_key
+        return sort_key
+
+    def _positions(self, key):
+        """Compute the matching row positions of a normalized filter set"""
+        search_term, *contains_terms, folders, statuses, ownership_status = key
+        positions = None
+
+        # Exact-match filters first: index lookups that narrow the rows to scan
+        for col, values in [("folder", folders), ("last_build_status", statuses)]:
+            if values:
+                positions = self._intersect(positions, self._lookup(col, values))
+        if ownership_status != "All":
+            positions = self._intersect(positions, self._lookup("ownership_status", [ownership_status]))
+
+        if search_term:
+            positions = self._search(search_term, positions)
+
+        for (_, col), term in zip(CONTAINS_FILTERS, contains_terms):
+            if term:
+                positions = contains_positions(self._column_text[col], term, positions)
+
+        return positions if positions is not None else np.arange(len(self.df))
+
+    def _lookup(self, col, values):
+        """Sorted row positions holding any of values in an indexed column"""
+        index = self.indexes.get(col, {})
+        rows = [index[value] for value in values if value in index]
+        if not rows:
+            return np.array([], dtype=np.intp)
+        return np.sort(np.concatenate(rows))
+
+    @staticmethod
+    def _intersect(positions, rows):
+        return rows if positions is None else np.intersect1d(positions, rows, assume_unique=True)
+
+    def _search(self, term, positions):
+        """Quick Search, starting from the previous search's matches when term extends it"""
+        with self._lock:
+            last_term, last_matches = self._last_search if self.reuse_searches else ("", None)
+        if last_matches is not None and last_term and last_term in term:
+            # Every job containing the longer term also contains the previous one
+            candidates = last_matches if positions is None else np.intersect1d(positions, last_matches, assume_unique=True)
+            matches = contains_positions(self.search_text, term, candidates)
+        elif positions is None:
+            matches = self._scan(term)
+        else:
+            matches = contains_positions(self.search_text, term, positions)
+        if positions is None and self.reuse_searches:
+            # Only unrestricted matches can seed later searches
+            with self._lock:
+                self._last_search = (term, matches)
+        return matches
+
+    def _scan(self, term):
+        """Row positions of all search texts containing term"""
+        offsets = np.fromiter((match.start() for match in re.finditer(re.escape(term), self._search_blob)), dtype=np.int64)
+        # Map each occurrence to its row; a row may contain the term more than once
+        return np.unique(np.searchsorted(self._row_starts, offsets, side="right") - 1).astype(np.intp)
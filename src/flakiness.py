@@ -0,0 +1,197 @@
+import time
+import numpy as np
+import pandas as pd
+from src.config import DashboardConfig
+from src.job_query import PLACEHOLDERS
+
+# Flaky-job detection from build result sequences. Every sync appends the builds
+# it has not seen yet to job_builds (up to BUILD_HISTORY_RETENTION_DAYS old) and
+# recomputes job_flakiness only for the jobs that got new builds or lost builds
+# to the retention window. A build either
+# passed (SUCCESS) or failed (FAILURE, UNSTABLE); aborted and not-built results
+# are stored but do not break or extend a sequence. Per job:
+#   flip_rate               % of consecutive build pairs whose outcome differs
+#   longest_failure_streak  most consecutive failed builds
+#   *_recovery_hours        from the first build of a failure streak to the next passing build
+
+PASS_RESULTS = ["SUCCESS"]
+FAIL_RESULTS = ["FAILURE", "UNSTABLE"]
+
+JOB_BUILDS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS job_builds (
+        url TEXT NOT NULL,
+        build_time BIGINT NOT NULL,
+        result VARCHAR(20),
+        PRIMARY KEY (url, build_time)
+    )
+"""
+
+JOB_FLAKINESS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS job_flakiness (
+        url TEXT PRIMARY KEY,
+        last_build_time BIGINT,
+        build_count INTEGER,
+        failure_count INTEGER,
+        flip_count INTEGER,
+        flip_rate DOUBLE PRECISION,
+        longest_failure_streak INTEGER,
+        mean_recovery_hours DOUBLE PRECISION,
+        max_recovery_hours DOUBLE PRECISION,
+        last_result VARCHAR(20)
+    )
+"""
+
+FLAKINESS_COLUMNS = [
+    "url", "last_build_time", "build_count", "failure_count", "flip_count", "flip_rate",
+    "longest_failure_streak", "mean_recovery_hours", "max_recovery_hours", "last_result"
+]
+
+# Build history of jobs no longer on the controller; run after publishing a sync
+FLAKINESS_PRUNE = [
+    "DELETE FROM job_builds WHERE url NOT IN (SELECT url FROM jenkins_items)",
+    "DELETE FROM job_flakiness WHERE url NOT IN (SELECT url FROM jenkins_items)",
+]
+
+# Jobs are looked up this many urls at a time (bounded by driver parameter limits)
+LOOKUP_CHUNK_SIZE = 500
+
+
+def compute_flakiness(builds):
+    """
+    Compute the flakiness of every job in a build history with grouped, vectorized operations.
+
+    Args:
+        builds (DataFrame): url, build_time (epoch ms) and result of each build
+
+    Returns:
+        DataFrame: FLAKINESS_COLUMNS, one row per job; jobs without passed or
+        failed builds have zero counts and no recovery times
+    """
+    builds = builds.sort_values(["url", "build_time"], kind="stable")
+    jobs = builds.groupby("url", sort=False).agg(
+        last_build_time=("build_time", "max"), last_result=("result", "last")
+    )
+
+    outcomes = builds[builds["result"].isin(PASS_RESULTS + FAIL_RESULTS)]
+    urls = outcomes["url"].to_numpy()
+    failed = outcomes["result"].isin(FAIL_RESULTS).to_numpy()
+    times = outcomes["build_time"].to_numpy(dtype=float)
+    same_job = np.zeros(len(urls), dtype=bool)
+    same_job[1:] = urls[1:] == urls[:-1]
+    flips = same_job.copy()
+    flips[1:] &= failed[1:] != failed[:-1]
+    # Runs of consecutive builds with the same outcome, numbered across all jobs
+    run_ids = np.cumsum(~same_job | flips)
+    sequence = pd.DataFrame({"url": urls, "failed": failed, "flip": flips, "run": run_ids, "time": times})
+
+    per_job = sequence.groupby("url", sort=False).agg(
+        build_count=("failed", "size"), failure_count=("failed", "sum"), flip_count=("flip", "sum")
+    )
+    runs = sequence.groupby("run", sort=True).agg(
+        url=("url", "first"), failed=("failed", "first"), length=("failed", "size"), start=("time", "first")
+    )
+    # A failure run has recovered when the next run belongs to the same job (so it passed)
+    recovered = runs["failed"] & (runs["url"].shift(-1) == runs["url"])
+    recovery_hours = ((runs["start"].shift(-1) - runs["start"]) / 3600000)[recovered]
+    failure_runs = runs[runs["failed"]]
+
+    jobs = jobs.join(per_job)
+    jobs["longest_failure_streak"] = failure_runs.groupby("url")["length"].max()
+    jobs["mean_recovery_hours"] = recovery_hours.groupby(runs.loc[recovered, "url"]).mean()
+    jobs["max_recovery_hours"] = recovery_hours.groupby(runs.loc[recovered, "url"]).max()
+    for col in ["build_count", "failure_count", "flip_count", "longest_failure_streak"]:
+        jobs[col] = jobs[col].fillna(0).astype(int)
+    jobs["flip_rate"] = np.where(
+        jobs["build_count"] > 1, jobs["flip_count"] / (jobs["build_count"] - 1).clip(lower=1) * 100, 0.0
+    )
+    return jobs.rename_axis("url").reset_index()[FLAKINESS_COLUMNS]
+
+
+def retention_cutoff():
+    """Start time (epoch ms) before which builds leave job_builds"""
+    return int((time.time() - DashboardConfig.BUILD_HISTORY_RETENTION_DAYS * 86400) * 1000)
+
+
+def append_builds(cursor, dialect, builds):
+    """
+    Append builds to the build history inside the caller's write transaction.
+
+    Builds are identified by (url, build_time), so a build stored by an earlier
+    sync is skipped however late it finished.
+
+    Args:
+        cursor: Cursor of the open write transaction
+        dialect (str): SQL dialect of the cursor
+        builds (DataFrame): url, build_time (epoch ms) and result of each completed build
+
+    Returns:
+        int: Number of builds passed
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    rows = [
+        (url, int(build_time), result)
+        for url, build_time, result in zip(builds["url"], builds["build_time"], builds["result"])
+    ]
+    if rows:
+        cursor.executemany(
+            f"INSERT INTO job_builds (url, build_time, result) VALUES ({placeholder}, {placeholder}, {placeholder}) "
+            f"ON CONFLICT (url, build_time) DO NOTHING",
+            rows
+        )
+    return len(rows)
+
+
+def prune_build_history(cursor, dialect):
+    """
+    Remove builds and flakiness of deleted jobs, and builds older than BUILD_HISTORY_RETENTION_DAYS.
+
+    Returns:
+        list: Urls of the remaining jobs that lost builds to the retention window,
+        whose flakiness must be refreshed
+    """
+    for statement in FLAKINESS_PRUNE:
+        cursor.execute(statement)
+    placeholder = PLACEHOLDERS[dialect]
+    cutoff = retention_cutoff()
+    cursor.execute(f"SELECT DISTINCT url FROM job_builds WHERE build_time < {placeholder}", (cutoff,))
+    urls = [url for url, in cursor.fetchall()]
+    cursor.execute(f"DELETE FROM job_builds WHERE build_time < {placeholder}", (cutoff,))
+    return urls
+
+
+def refresh_flakiness(cursor, dialect, urls):
+    """
+    Recompute the flakiness of jobs from their stored build history.
+
+    Jobs left without builds lose their job_flakiness row. Runs inside the
+    caller's write transaction.
+
+    Args:
+        cursor: Cursor of the open write transaction
+        dialect (str): SQL dialect of the cursor
+        urls (list): Jobs whose build history changed
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    for chunk in _chunks(urls):
+        marks = ", ".join([placeholder] * len(chunk))
+        cursor.execute(f"SELECT url, build_time, result FROM job_builds WHERE url IN ({marks})", chunk)
+        history = pd.DataFrame(cursor.fetchall(), columns=["url", "build_time", "result"])
+        cursor.execute(f"DELETE FROM job_flakiness WHERE url IN ({marks})", chunk)
+        if history.empty:
+            continue
+        flakiness = compute_flakiness(history)
+        # Plain Python values for every driver; NaN recovery times become NULL
+        rows = [
+            tuple(None if isinstance(value, float) and np.isnan(value) else value for value in row)
+            for row in flakiness.astype(object).itertuples(index=False, name=None)
+        ]
+        cursor.executemany(
+            f"INSERT INTO job_flakiness ({', '.join(FLAKINESS_COLUMNS)}) "
+            f"VALUES ({', '.join([placeholder] * len(FLAKINESS_COLUMNS))})",
+            rows
+        )
+
+
+def _chunks(values):
+    """Split values into lists of at most LOOKUP_CHUNK_SIZE"""
+    return [values[start:start + LOOKUP_CHUNK_SIZE] for start in range(0, len(values), LOOKUP_CHUNK_SIZE)]
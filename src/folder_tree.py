@@ -0,0 +1,95 @@
+import numpy as np
+import pandas as pd
+from src.config import DashboardConfig
+
+# Folder hierarchy index. Jobs store only their leaf folder ("team/service/deploy",
+# "/" for top-level jobs); build_folder_tree() rolls the job metrics up to every
+# ancestor folder once per sync, so drilling through the hierarchy only selects
+# precomputed nodes.
+
+# Id of the node holding every job
+ROOT = "/"
+ROOT_LABEL = "All jobs"
+
+# Metrics summed from a folder's jobs into the folder and each of its ancestors
+ROLLUP_COLUMNS = ["job_count", "total_builds", "failure_count", "build_minutes", "inactive_count"]
+
+
+def folder_ancestors(folder):
+    """Paths of the root, every ancestor and the folder itself, e.g. "a/b" -> ["/", "a", "a/b"]"""
+    if folder == ROOT:
+        return [ROOT]
+    parts = folder.split("/")
+    return [ROOT] + ["/".join(parts[:depth]) for depth in range(1, len(parts) + 1)]
+
+
+def build_folder_tree(df):
+    """
+    Roll the jobs up into one node per folder and ancestor folder.
+
+    Args:
+        df (DataFrame): Cleaned jobs
+
+    Returns:
+        DataFrame: One row per node, sorted by id, with id (folder path), parent
+        ("" for the root), label, depth, direct_jobs, the ROLLUP_COLUMNS over the
+        whole subtree and failure_rate (% of the subtree's builds that failed)
+    """
+    days = pd.to_numeric(df["days_since_last_build"], errors="coerce")
+    jobs = pd.DataFrame({
+        "folder": df["folder"].astype(object).fillna(ROOT).replace("", ROOT).to_numpy(),
+        "job_count": 1,
+        "total_builds": pd.to_numeric(df["total_builds"], errors="coerce").fillna(0).to_numpy(dtype=float),
+        "failure_count": pd.to_numeric(df["failure_count"], errors="coerce").fillna(0).to_numpy(dtype=float),
+        "build_minutes": pd.to_numeric(df["total_build_duration"], errors="coerce").fillna(0).to_numpy(dtype=float) / 60000,
+        "inactive_count": (days > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS).to_numpy(dtype=bool, na_value=False).astype(int),
+    })
+    # Sum per leaf folder first; the ancestor expansion then scales with folders, not jobs
+    per_folder = jobs.groupby("folder", sort=False).sum()
+    # Whole minutes, so every node equals the exact sum of its children and direct jobs
+    per_folder["build_minutes"] = per_folder["build_minutes"].round().astype(int)
+    ancestors = pd.Series([folder_ancestors(folder) for folder in per_folder.index], index=per_folder.index).explode()
+    nodes = per_folder.loc[ancestors.index].groupby(ancestors.to_numpy()).sum()
+    nodes.index.name = "id"
+    nodes = nodes.sort_index().reset_index()
+
+    ids = nodes["id"]
+    is_root = (ids == ROOT).to_numpy()
+    nodes["parent"] = np.where(is_root, "", np.where(ids.str.contains("/"), ids.str.rsplit("/", n=1).str[0], ROOT))
+    nodes["label"] = np.where(is_root, ROOT_LABEL, ids.str.rsplit("/", n=1).str[-1])
+    nodes["depth"] = np.where(is_root, 0, ids.str.count("/") + 1)
+    nodes["direct_jobs"] = per_folder["job_count"].reindex(ids).fillna(0).astype(int).to_numpy()
+    for col in ROLLUP_COLUMNS:
+        nodes[col] = nodes[col].astype(int)
+    nodes["failure_rate"] = np.where(
+        nodes["total_builds"] > 0, nodes["failure_count"] / nodes["total_builds"].clip(lower=1) * 100, 0.0
+    )
+    return nodes[["id", "parent", "label", "depth", "direct_jobs", *ROLLUP_COLUMNS, "failure_rate"]]
+
+
+def subtree(nodes, folder, max_depth=None):
+    """
+    Nodes of a folder and its descendants, with the folder as the root.
+
+    Args:
+        nodes (DataFrame): Result of build_folder_tree()
+        folder (str): Node id to start from
+        max_depth (int): Levels below the folder to keep (all when None)
+
+    Returns:
+        DataFrame: The selected nodes; the folder's parent is set to ""
+    """
+    if folder == ROOT:
+        selected = nodes
+    else:
+        ids = nodes["id"]
+        selected = nodes[(ids == folder) | ids.str.startswith(folder + "/")]
+    base_depth = int(nodes.loc[nodes["id"] == folder, "depth"].iloc[0]) if (nodes["id"] == folder).any() else 0
+    if max_depth is not None:
+        selected = selected[selected["depth"] <= base_depth + max_depth]
+    return selected.assign(parent=selected["parent"].where(selected["id"] != folder, ""))
+
+
+def children(nodes, folder):
+    """Direct subfolders of a folder"""
+    return nodes[nodes["parent"] == folder]
@@ -4,6 +4,51 @@ import streamlit as st
 from datetime import datetime, timezone
 from src.config import DashboardConfig
 import re
+import threading
+
+# Request counters of the crawl running on the current thread, recorded in the
+# sync ledger (see src.sync_ledger)
+_fetch_metrics = threading.local()
+
+
+def reset_fetch_metrics():
+    """Start counting requests, bytes and errors for a new crawl on this thread"""
+    _fetch_metrics.request_count = 0
+    _fetch_metrics.bytes_received = 0
+    _fetch_metrics.error_count = 0
+
+
+def get_fetch_metrics():
+    """
+    Get the counters of the crawl started by reset_fetch_metrics().
+    
+    Returns:
+        dict: request_count, bytes_received and error_count
+    """
+    if not hasattr(_fetch_metrics, "request_count"):
+        reset_fetch_metrics()
+    return {
+        "request_count": _fetch_metrics.request_count,
+        "bytes_received": _fetch_metrics.bytes_received,
+        "error_count": _fetch_metrics.error_count,
+    }
+
+
+def _jenkins_get(url, auth, **kwargs):
+    """requests.get that adds the request, its response size and failures to this thread's crawl counters"""
+    if not hasattr(_fetch_metrics, "request_count"):
+        reset_fetch_metrics()
+    _fetch_metrics.request_count += 1
+    try:
+        response = requests.get(url, auth=auth, **kwargs)
+    except requests.exceptions.RequestException:
+        _fetch_metrics.error_count += 1
+        raise
+    _fetch_metrics.bytes_received += len(response.content)
+    # 404 is the expected answer of optional plugin endpoints such as JobConfigHistory
+    if not response.ok and response.status_code != 404:
+        _fetch_metrics.error_count += 1
+    return response
 
 
 def extract_folder_from_url(url):
@@ -38,9 +83,20 @@ def is_test_job(job_name):
     return False
 
 
-@st.cache_data(show_spinner=False)
-def get_all_jenkins_items(url, _auth, _bypass_cache=False):
-    items = []
+def iter_jenkins_items(url, auth):
+    """
+    Crawl Jenkins depth-first, yielding each job's record as soon as it is built.
+    
+    Only the jobs list of the folder being crawled is held in memory, so callers
+    can stream records to storage without collecting the whole instance.
+    
+    Args:
+        url (str): Jenkins or folder URL to crawl
+        auth: Authentication object
+        
+    Yields:
+        dict: One jenkins_items row per job
+    """
     # Enhanced API call to get more detailed information including build duration, description, and user info
     api_url = (
         f"{url.rstrip('/')}/api/json?tree=jobs[name,url,_class,description,lastBuild[result,url,timestamp,duration,actions[causes[userId,userName]],changeSet[items[author[fullName]]]],"
@@ -48,156 +104,198 @@ def get_all_jenkins_items(url, _auth, _bypass_cache=False):
         f"builds[timestamp,result,duration],property[parameterDefinitions[name,defaultParameterValue[value]]],buildable,color]"
     )
     try:
-        response = requests.get(api_url, auth=_auth)
+        response = _jenkins_get(api_url, auth)
         response.raise_for_status()
-        data = response.json()
-        for job in data.get("jobs", []):
-            job_url = job.get("url")
-            job_class = job.get("_class")
-            if "folder" in job_class.lower():
-                items.extend(get_all_jenkins_items(job_url, _auth))
-            else:
-                last_build = job.get("lastBuild")
-                last_successful = job.get("lastSuccessfulBuild")
-                last_failed = job.get("lastFailedBuild")
-                builds = job.get("builds", [])
-                
-                # Determine if job is disabled (not buildable)
-                is_disabled = not job.get("buildable", True)
-                
-                # Get last build info
-                last_editor = None
-                if last_build:
-                    status = last_build.get("result")
-                    if status is None:
-                        status = "IN_PROGRESS"
-                    build_url = last_build.get("url")
-                    last_build_timestamp = last_build.get("timestamp")
-                    last_build_duration = last_build.get("duration", 0)  # Duration in milliseconds
-                    last_build_date = None
-                    if last_build_timestamp:
-                        last_build_date = datetime.fromtimestamp(last_build_timestamp/1000, tz=timezone.utc)
-                    
-                    # Extract last editor information - try JobConfigHistory first, then fallback to build data
-                    last_editor = get_job_config_history(job_url, _auth)
-                    if not last_editor:
-                        last_editor = extract_last_editor_info(last_build)
-                    
-                    # Extract last user who started/triggered the build
-                    last_user = extract_last_user_info(last_build)
-                else:
-                    status = "Not Built"
-                    build_url = ""
-                    last_build_date = None
-                    last_build_duration = 0
-                    last_user = None
-                
-                # Get last successful build info
-                last_successful_date = None
-                last_successful_duration = 0
-                if last_successful and last_successful.get("timestamp"):
-                    last_successful_date = datetime.fromtimestamp(last_successful.get("timestamp")/1000, tz=timezone.utc)
-                    last_successful_duration = last_successful.get("duration", 0)
-                
-                # Get last failed build info
-                last_failed_date = None
-                last_failed_duration = 0
-                if last_failed and last_failed.get("timestamp"):
-                    last_failed_date = datetime.fromtimestamp(last_failed.get("timestamp")/1000, tz=timezone.utc)
-                    last_failed_duration = last_failed.get("duration", 0)
-                
-                # Calculate days since last build
-                days_since_last_build = None
-                if last_build_date:
-                    days_since_last_build = (datetime.now(timezone.utc) - last_build_date).days
-                
-                # Get total build count and calculate success rate
-                total_builds = len(builds) if builds else 0
-                
-                # Calculate success/failure rates and duration statistics from build history
-                success_count = 0
-                failure_count = 0
-                success_rate = 0.0
-                build_durations = []
-                successful_durations = []
-                failed_durations = []
-                
-                if builds:
-                    for build in builds:
-                        build_result = build.get("result")
-                        build_duration = build.get("duration", 0)
-                        
-                        if build_duration > 0:  # Only include builds with valid duration
-                            build_durations.append(build_duration)
-                            
-                            if build_result == "SUCCESS":
-                                success_count += 1
-                                successful_durations.append(build_duration)
-                            elif build_result in ["FAILURE", "UNSTABLE", "ABORTED"]:
-                                failure_count += 1
-                                failed_durations.append(build_duration)
-                    
-                    # Calculate success rate (only if there are builds)
-                    if total_builds > 0:
-                        success_rate = (success_count / total_builds) * 100
-                
-                # Calculate duration statistics
-                avg_build_duration = sum(build_durations) / len(build_durations) if build_durations else 0
-                avg_successful_duration = sum(successful_durations) / len(successful_durations) if successful_durations else 0
-                avg_failed_duration = sum(failed_durations) / len(failed_durations) if failed_durations else 0
-                min_build_duration = min(build_durations) if build_durations else 0
-                max_build_duration = max(build_durations) if build_durations else 0
-                
-                # Use simple test job detection with exclusion list
-                job_name = job.get("name", "")
-                is_test_job_result = is_test_job(job_name)
-                
-                # Get job description and parse ownership
-                job_description = job.get("description", "")
-                ownership_data = parse_pipeline_ownership(job_description)
-
-                items.append(
-                    {
-                        "name": job_name,
-                        "url": job_url,
-                        "type": job_class,
-                        "description": job_description,
-                        # Ownership data
-                        "owner_name": ownership_data.get('owner_name'),
-                        "owner_email": ownership_data.get('owner_email'),
-                        "other_tag": ownership_data.get('other_tag'),
-                        "ownership_status": ownership_data.get('ownership_status'),
-                        "last_build_status": status,
-                        "last_build_url": build_url if build_url else "",
-                        "folder": extract_folder_from_url(job_url),
-                        "is_disabled": is_disabled,
-                        "last_build_date": last_build_date,
-                        "last_successful_date": last_successful_date,
-                        "last_failed_date": last_failed_date,
-                        "days_since_last_build": days_since_last_build,
-                        "total_builds": total_builds,
-                        "success_count": success_count,
-                        "failure_count": failure_count,
-                        "success_rate": success_rate,
-                        "is_test_job": is_test_job_result,
-                        # Duration data
-                        "last_build_duration": last_build_duration,
-                        "last_successful_duration": last_successful_duration,
-                        "last_failed_duration": last_failed_duration,
-                        "avg_build_duration": avg_build_duration,
-                        "avg_successful_duration": avg_successful_duration,
-                        "avg_failed_duration": avg_failed_duration,
-                        "min_build_duration": min_build_duration,
-                        "max_build_duration": max_build_duration,
-                        "total_build_duration": sum(build_durations) if build_durations else 0,
-                        # User data
-                        "last_editor": last_editor,
-                        "last_user": last_user,
-                    }
-                )
+        jobs = response.json().get("jobs", [])
     except requests.exceptions.RequestException as e:
         st.error(f"Error fetching data from {api_url}: {e}")
-    return items
+        return
+    
+    for job in jobs:
+        if "folder" in job.get("_class", "").lower():
+            yield from iter_jenkins_items(job.get("url"), auth)
+        else:
+            yield _build_job_item(job, auth)
+
+
+def iter_jenkins_item_batches(url, auth, batch_size):
+    """
+    Crawl Jenkins, yielding job records in lists of at most batch_size.
+    
+    Args:
+        url (str): Jenkins base URL
+        auth: Authentication object
+        batch_size (int): Maximum records per batch
+        
+    Yields:
+        list: Job records ready for one bulk insert
+    """
+    batch = []
+    for item in iter_jenkins_items(url, auth):
+        batch.append(item)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _build_job_item(job, auth):
+    """
+    Build the dashboard record of a (non-folder) job from its Jenkins API data.
+    
+    Args:
+        job (dict): Job entry of a folder's /api/json response
+        auth: Authentication object
+        
+    Returns:
+        dict: One jenkins_items row
+    """
+    job_url = job.get("url")
+    job_class = job.get("_class")
+    last_build = job.get("lastBuild")
+    last_successful = job.get("lastSuccessfulBuild")
+    last_failed = job.get("lastFailedBuild")
+    builds = job.get("builds", [])
+    
+    # Determine if job is disabled (not buildable)
+    is_disabled = not job.get("buildable", True)
+    
+    # Get last build info
+    last_editor = None
+    if last_build:
+        status = last_build.get("result")
+        if status is None:
+            status = "IN_PROGRESS"
+        build_url = last_build.get("url")
+        last_build_timestamp = last_build.get("timestamp")
+        last_build_duration = last_build.get("duration", 0)  # Duration in milliseconds
+        last_build_date = None
+        if last_build_timestamp:
+            last_build_date = datetime.fromtimestamp(last_build_timestamp/1000, tz=timezone.utc)
+        
+        # Extract last editor information - try JobConfigHistory first, then fallback to build data
+        last_editor = get_job_config_history(job_url, auth)
+        if not last_editor:
+            last_editor = extract_last_editor_info(last_build)
+        
+        # Extract last user who started/triggered the build
+        last_user = extract_last_user_info(last_build)
+    else:
+        status = "Not Built"
+        build_url = ""
+        last_build_date = None
+        last_build_duration = 0
+        last_user = None
+    
+    # Get last successful build info
+    last_successful_date = None
+    last_successful_duration = 0
+    if last_successful and last_successful.get("timestamp"):
+        last_successful_date = datetime.fromtimestamp(last_successful.get("timestamp")/1000, tz=timezone.utc)
+        last_successful_duration = last_successful.get("duration", 0)
+    
+    # Get last failed build info
+    last_failed_date = None
+    last_failed_duration = 0
+    if last_failed and last_failed.get("timestamp"):
+        last_failed_date = datetime.fromtimestamp(last_failed.get("timestamp")/1000, tz=timezone.utc)
+        last_failed_duration = last_failed.get("duration", 0)
+    
+    # Calculate days since last build
+    days_since_last_build = None
+    if last_build_date:
+        days_since_last_build = (datetime.now(timezone.utc) - last_build_date).days
+    
+    # Get total build count and calculate success rate
+    total_builds = len(builds) if builds else 0
+    
+    # Calculate success/failure rates and duration statistics from build history
+    success_count = 0
+    failure_count = 0
+    success_rate = 0.0
+    build_durations = []
+    # (timestamp, result, duration) of each completed build, staged for the
+    # job's duration sketch and build history (src/build_history.py)
+    completed_builds = []
+    successful_durations = []
+    failed_durations = []
+    
+    if builds:
+        for build in builds:
+            build_result = build.get("result")
+            build_duration = build.get("duration", 0)
+            if build_result is not None:
+                completed_builds.append((build.get("timestamp"), build_result, build_duration))
+            
+            if build_duration > 0:  # Only include builds with valid duration
+                build_durations.append(build_duration)
+                
+                if build_result == "SUCCESS":
+                    success_count += 1
+                    successful_durations.append(build_duration)
+                elif build_result in ["FAILURE", "UNSTABLE", "ABORTED"]:
+                    failure_count += 1
+                    failed_durations.append(build_duration)
+        
+        # Calculate success rate (only if there are builds)
+        if total_builds > 0:
+            success_rate = (success_count / total_builds) * 100
+    
+    # Calculate duration statistics
+    avg_build_duration = sum(build_durations) / len(build_durations) if build_durations else 0
+    avg_successful_duration = sum(successful_durations) / len(successful_durations) if successful_durations else 0
+    avg_failed_duration = sum(failed_durations) / len(failed_durations) if failed_durations else 0
+    min_build_duration = min(build_durations) if build_durations else 0
+    max_build_duration = max(build_durations) if build_durations else 0
+    
+    # Use simple test job detection with exclusion list
+    job_name = job.get("name", "")
+    is_test_job_result = is_test_job(job_name)
+    
+    # Get job description and parse ownership
+    job_description = job.get("description", "")
+    ownership_data = parse_pipeline_ownership(job_description)
+
+    return {
+        "name": job_name,
+        "url": job_url,
+        "type": job_class,
+        "description": job_description,
+        # Ownership data
+        "owner_name": ownership_data.get('owner_name'),
+        "owner_email": ownership_data.get('owner_email'),
+        "other_tag": ownership_data.get('other_tag'),
+        "ownership_status": ownership_data.get('ownership_status'),
+        "last_build_status": status,
+        "last_build_url": build_url if build_url else "",
+        "folder": extract_folder_from_url(job_url),
+        "is_disabled": is_disabled,
+        "last_build_date": last_build_date,
+        "last_successful_date": last_successful_date,
+        "last_failed_date": last_failed_date,
+        "days_since_last_build": days_since_last_build,
+        "total_builds": total_builds,
+        "success_count": success_count,
+        "failure_count": failure_count,
+        "success_rate": success_rate,
+        "is_test_job": is_test_job_result,
+        # Duration data
+        "last_build_duration": last_build_duration,
+        "last_successful_duration": last_successful_duration,
+        "last_failed_duration": last_failed_duration,
+        "avg_build_duration": avg_build_duration,
+        "avg_successful_duration": avg_successful_duration,
+        "avg_failed_duration": avg_failed_duration,
+        "min_build_duration": min_build_duration,
+        "max_build_duration": max_build_duration,
+        "total_build_duration": sum(build_durations) if build_durations else 0,
+        # Not stored in jenkins_items; staged for the job's duration sketch and build history
+        "builds": completed_builds,
+        # User data
+        "last_editor": last_editor,
+        "last_user": last_user,
+    }
 
 
 def parse_pipeline_ownership(description):
@@ -290,7 +388,7 @@ def get_job_config_history(job_url, auth):
     try:
         # Try JobConfigHistory API first
         config_history_url = f"{job_url.rstrip('/')}/jobConfigHistory/api/json?tree=jobConfigHistory[0][user]"
-        response = requests.get(config_history_url, auth=auth, timeout=10)
+        response = _jenkins_get(config_history_url, auth, timeout=10)
         
         if response.status_code == 200:
             data = response.json()
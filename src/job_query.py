@@ -0,0 +1,283 @@
+import re
+from src.config import DashboardConfig
+
+# Columns matched by Quick Search, mirroring src.filter_engine.SEARCH_TEXT_COLUMNS
+SEARCH_COLUMNS = [
+    "name", "folder", "COALESCE(last_build_status, 'Unknown')", "type",
+    "description", "other_tag", "last_editor", "last_user"
+]
+
+# Parameter placeholders of the supported DB drivers
+PLACEHOLDERS = {"sqlite": "?", "postgresql": "%s", "duckdb": "?"}
+
+# Columns fetched for one page of the Overview jobs table
+PAGE_COLUMNS = [
+    "name", "folder", "owner_name", "owner_email", "description", "last_build_status", "success_rate",
+    "days_since_last_build", "total_builds", "last_editor", "last_user", "url"
+]
+
+# Sortable columns and their SQL sort expressions. NULLs are folded into comparable
+# values so keyset comparisons never drop rows; name and folder are always set and
+# stay bare so their indexes can serve the ORDER BY.
+SORT_EXPRESSIONS = {
+    "name": "name",
+    "folder": "folder",
+    "last_build_status": "COALESCE(last_build_status, 'Unknown')",
+    "success_rate": "COALESCE(success_rate, 0)",
+    "days_since_last_build": "COALESCE(days_since_last_build, -1)",
+    "total_builds": "COALESCE(total_builds, 0)",
+}
+
+
+def empty_filters():
+    """Return a filter set that matches every job"""
+    return {
+        "search_term": "",
+        "name_filter": "",
+        "folder_filter": "",
+        "description_filter": "",
+        "tag_filter": "",
+        "folders": [],
+        "statuses": [],
+        "ownership_status": "All",
+    }
+
+
+def has_active_filters(filters):
+    """Check whether any filter in the set narrows the result"""
+    return any(value and value != "All" for value in filters.values())
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so the term is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_text_expression(dialect):
+    """
+    SQL expression for the lowercased, newline-joined search columns of a job.
+    
+    A term typed into Quick Search never contains a newline, so a substring
+    match on this text is a match on at least one individual column.
+    """
+    newline = "char(10)" if dialect == "sqlite" else "chr(10)"
+    parts = [f"COALESCE({column}, '')" if not column.startswith("COALESCE") else column
+             for column in SEARCH_COLUMNS]
+    return f"lower({f' || {newline} || '.join(parts)})"
+
+
+def build_search_condition(search_term, dialect):
+    """
+    Build the index-backed Quick Search condition.
+    
+    PostgreSQL matches the generated search_text column, served by its pg_trgm
+    GIN index. SQLite matches the jenkins_items_fts FTS5 table, whose trigram
+    tokenizer answers substring phrase queries of three or more characters.
+    DuckDB scans the search text directly; its columnar scans need no index.
+    
+    Returns:
+        tuple: (condition_sql, params)
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    term = search_term.lower()
+    if dialect == "postgresql":
+        return f"search_text LIKE {placeholder} ESCAPE '\\'", [f"%{escape_like(term)}%"]
+    if dialect == "duckdb":
+        return f"{search_text_expression(dialect)} LIKE {placeholder} ESCAPE '\\'", [f"%{escape_like(term)}%"]
+    if len(term) >= 3:
+        # Quoted FTS5 phrase; embedded quotes are doubled
+        phrase = '"' + term.replace('"', '""') + '"'
+        return f"url IN (SELECT url FROM jenkins_items_fts WHERE jenkins_items_fts MATCH {placeholder})", [phrase]
+    # Too short for trigrams - scan the single FTS text column instead
+    return (
+        f"url IN (SELECT url FROM jenkins_items_fts WHERE search_text LIKE {placeholder} ESCAPE '\\')",
+        [f"%{escape_like(term)}%"]
+    )
+
+
+def build_search_rank(search_term, dialect):
+    """
+    Build a relevance expression for the Quick Search term where lower sorts first.
+    Falls back to the job name when the term cannot be ranked.
+    
+    PostgreSQL ranks the search_vector tsvector against the term's words as
+    prefixes; SQLite uses FTS5's bm25 rank joined in by build_page_query.
+    DuckDB has no search index to rank with.
+    
+    Returns:
+        tuple: (rank_sql, params)
+    """
+    if dialect == "postgresql":
+        words = re.findall(r"\w+", search_term.lower())
+        if not words:
+            return "name", []
+        ts_query = " & ".join(f"{word}:*" for word in words)
+        # ts_rank is a float4; rounding to numeric keeps keyset cursors exact across round trips
+        return f"-ROUND(ts_rank(search_vector, to_tsquery('simple', {PLACEHOLDERS[dialect]}))::numeric, 6)", [ts_query]
+    if dialect == "sqlite" and len(search_term) >= 3:
+        return "COALESCE(search_rank, 0)", []
+    # DuckDB, and terms too short for the FTS5 trigram index, are matched unranked
+    return "name", []
+
+
+def build_filter_clause(filters, dialect):
+    """
+    Translate the Overview filters into a parameterized WHERE clause.
+
+    Matching follows src.filter_engine: case-insensitive substring search, exact
+    membership for the multiselects and equality for the ownership filter.
+
+    Args:
+        filters (dict): Filter values as returned by empty_filters()
+        dialect (str): "sqlite", "postgresql" or "duckdb"
+
+    Returns:
+        tuple: (where_sql, params) where where_sql is "" when nothing is filtered
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    conditions = []
+    params = []
+
+    def contains(column_sql, term):
+        params.append(f"%{escape_like(term.lower())}%")
+        return f"LOWER({column_sql}) LIKE {placeholder} ESCAPE '\\'"
+
+    # Quick search across all fields through the search index
+    search_term = filters.get("search_term")
+    if search_term:
+        search_condition, search_params = build_search_condition(search_term, dialect)
+        conditions.append(search_condition)
+        params.extend(search_params)
+
+    # Advanced filters
+    for key, column in [("name_filter", "name"), ("folder_filter", "folder"),
+                        ("description_filter", "description"), ("tag_filter", "other_tag")]:
+        if filters.get(key):
+            conditions.append(contains(column, filters[key]))
+
+    # Multi-select filters (only apply if selections are made)
+    folders = filters.get("folders")
+    if folders:
+        conditions.append(f"folder IN ({', '.join([placeholder] * len(folders))})")
+        params.extend(folders)
+
+    statuses = filters.get("statuses")
+    if statuses:
+        status_condition = f"last_build_status IN ({', '.join([placeholder] * len(statuses))})"
+        params.extend(statuses)
+        # A missing status is shown as "Unknown" in the dashboard
+        if "Unknown" in statuses:
+            status_condition = f"({status_condition} OR last_build_status IS NULL)"
+        conditions.append(status_condition)
+
+    # Ownership status filter
+    ownership_status = filters.get("ownership_status")
+    if ownership_status and ownership_status != "All":
+        conditions.append(f"ownership_status = {placeholder}")
+        params.append(ownership_status)
+
+    where_sql = " AND ".join(conditions)
+    return where_sql, params
+
+
+def build_page_query(filters, dialect, sort_column="name", descending=False, page_size=50, after=None):
+    """
+    Build a keyset-paginated query for one page of filtered jobs.
+
+    Args:
+        filters (dict): Filter values as returned by empty_filters()
+        dialect (str): "sqlite", "postgresql" or "duckdb"
+        sort_column (str): Key of SORT_EXPRESSIONS, or "relevance" to rank Quick Search matches
+        descending (bool): Sort direction
+        page_size (int): Maximum number of rows to return
+        after (tuple): (sort_key, url) of the last row of the previous page, or None for the first page
+
+    Returns:
+        tuple: (query, params). Each row carries a sort_key column for the next page's cursor.
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    from_sql = "jenkins_items"
+    join_params = []
+    
+    search_term = filters.get("search_term")
+    if sort_column == "relevance" and search_term:
+        sort_expression, sort_params = build_search_rank(search_term, dialect)
+        if dialect == "sqlite" and len(search_term) >= 3:
+            # Join in the bm25 rank of each FTS5 match
+            from_sql += (
+                " LEFT JOIN (SELECT url AS match_url, rank AS search_rank FROM jenkins_items_fts"
+                f" WHERE jenkins_items_fts MATCH {placeholder}) ON match_url = url"
+            )
+            join_params.append('"' + search_term.lower().replace('"', '""') + '"')
+    else:
+        sort_expression, sort_params = SORT_EXPRESSIONS.get(sort_column, "name"), []
+    
+    where_sql, where_params = build_filter_clause(filters, dialect)
+    conditions = [where_sql] if where_sql else []
+    
+    if after is not None:
+        comparison = "<" if descending else ">"
+        conditions.append(f"({sort_expression}, url) {comparison} ({placeholder}, {placeholder})")
+        where_params = where_params + sort_params + list(after)
+    
+    direction = "DESC" if descending else "ASC"
+    query = (
+        f"SELECT {', '.join(PAGE_COLUMNS)}, {sort_expression} AS sort_key FROM {from_sql}"
+        + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+        + f" ORDER BY {sort_expression} {direction}, url {direction} LIMIT {placeholder}"
+    )
+    # Parameters in the order their placeholders appear in the query
+    params = sort_params + join_params + where_params + sort_params + [page_size]
+    return query, params
+
+
+def build_export_query(filters, dialect, columns):
+    """
+    Build the query streaming every job matching a filter set, in name order.
+
+    Returns:
+        tuple: (query, params)
+    """
+    where_sql, params = build_filter_clause(filters, dialect)
+    query = (
+        f"SELECT {', '.join(columns)} FROM jenkins_items"
+        + (f" WHERE {where_sql}" if where_sql else "")
+        + " ORDER BY name, url"
+    )
+    return query, params
+
+
+def build_history_export_query(filters, dialect, columns):
+    """
+    Build the query streaming the job_snapshots history of the jobs matching a
+    filter set, by job and then oldest snapshot first.
+
+    Returns:
+        tuple: (query, params)
+    """
+    where_sql, params = build_filter_clause(filters, dialect)
+    query = (
+        f"SELECT {', '.join(columns)} FROM job_snapshots"
+        + (f" WHERE url IN (SELECT url FROM jenkins_items WHERE {where_sql})" if where_sql else "")
+        + " ORDER BY url, snapshot_time"
+    )
+    return query, params
+
+
+def build_overview_counts_query(filters, dialect):
+    """
+    Build the aggregate query behind the Overview KPIs for a filter set.
+
+    Returns:
+        tuple: (query, params) yielding one row per build status with job and inactive counts
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    where_sql, where_params = build_filter_clause(filters, dialect)
+    query = (
+        "SELECT COALESCE(last_build_status, 'Unknown') AS last_build_status, COUNT(*) AS job_count, "
+        f"SUM(CASE WHEN days_since_last_build > {placeholder} THEN 1 ELSE 0 END) AS inactive_count "
+        "FROM jenkins_items"
+        + (f" WHERE {where_sql}" if where_sql else "")
+        + " GROUP BY COALESCE(last_build_status, 'Unknown')"
+    )
+    return query, [DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS] + where_params
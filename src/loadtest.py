@@ -0,0 +1,198 @@
+import gc
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from src.config import DashboardConfig
+
+# Memory load test of concurrent dashboard sessions: `python -m src.loadtest [jobs]`.
+# A synthetic jobs frame is synced into a temporary SQLite database, then
+# main.py is run in SESSION_COUNTS Streamlit AppTest sessions that stay alive
+# side by side in this process, printing the process RSS at each step. Every
+# session browses like a viewer (SESSION_JOURNEY): a Quick Search, then every
+# Cleanup Insights and Analytics view, so its filter results, cleanup lists and
+# Analytics bundle are alive when RSS is measured. Sessions share the cached
+# jobs frame, so RSS should stay roughly flat as they are added.
+
+SESSION_COUNTS = [1, 10, 25, 50]
+DEFAULT_JOB_COUNT = 20000
+
+# Seconds a single session may take to render the dashboard
+SESSION_TIMEOUT = 300
+
+# Quick Search term typed into every session's Overview
+SEARCH_TERM = "service-1"
+
+# (view selector key, view label) of each view a session opens, in order; see src/ui.py
+SESSION_JOURNEY = [
+    ("main_view", "🧹 Cleanup Insights"),
+    ("cleanup_view", "📊 Summary"),
+    ("cleanup_view", "🧪 Test Jobs"),
+    ("cleanup_view", "⏰ Inactive Jobs"),
+    ("cleanup_view", "🚫 Disabled Jobs"),
+    ("main_view", "📈 Analytics"),
+    ("analytics_view", "⏱️ Build Duration Analysis"),
+    ("analytics_view", "📊 Performance Insights"),
+    ("analytics_view", "🔍 Outlier Analysis"),
+    ("analytics_view", "🎲 Flaky Jobs"),
+    ("analytics_view", "📋 Metadata Analysis"),
+    ("main_view", "📊 Overview"),
+]
+
+STATUSES = ["SUCCESS", "FAILURE", "UNSTABLE", "ABORTED", "NOT_BUILT"]
+OWNERSHIP_STATUSES = ["complete", "attention_required", "unassigned"]
+
+
+def synthetic_jobs(count, seed=0):
+    """
+    Build a jobs frame shaped like a Jenkins crawl.
+
+    Args:
+        count (int): Number of jobs
+        seed (int): Random seed, so runs are comparable
+
+    Returns:
+        DataFrame: One row per job with the JOB_COLUMNS stored in jenkins_items
+    """
+    rng = np.random.default_rng(seed)
+    index = np.arange(count)
+    folders = np.array([f"team-{team}/service-{service}" for team in range(20) for service in range(25)])
+    folder = folders[rng.integers(0, len(folders), count)]
+    names = np.char.add("job-", index.astype(str))
+    urls = np.char.add(np.char.add(np.char.add("https://jenkins.example.com/job/", folder), "/job/"), names)
+    now = pd.Timestamp.now(tz="UTC")
+    last_build = now - pd.to_timedelta(rng.exponential(30, count), unit="D")
+    total_builds = rng.integers(0, 100, count)
+    success_count = (total_builds * rng.uniform(0.5, 1, count)).astype(int)
+    durations = rng.lognormal(12, 1, (count, 3))
+    owners = np.array([f"owner-{owner}" for owner in range(200)])[rng.integers(0, 200, count)]
+
+    return pd.DataFrame({
+        "name": names,
+        "url": urls,
+        "type": np.where(rng.random(count) < 0.7, "WorkflowJob", "FreeStyleProject"),
+        "description": np.char.add("Synthetic job owned by ", owners),
+        "last_build_status": np.array(STATUSES)[rng.integers(0, len(STATUSES), count)],
+        "last_build_url": np.char.add(urls, "/lastBuild/"),
+        "folder": folder,
+        "is_disabled": rng.random(count) < 0.1,
+        "last_build_date": last_build,
+        "last_successful_date": last_build - pd.to_timedelta(rng.exponential(5, count), unit="D"),
+        "last_failed_date": last_build - pd.to_timedelta(rng.exponential(15, count), unit="D"),
+        "days_since_last_build": (now - last_build).days,
+        "total_builds": total_builds,
+        "success_count": success_count,
+        "failure_count": total_builds - success_count,
+        "success_rate": np.where(total_builds > 0, success_count / np.maximum(total_builds, 1) * 100, 0.0),
+        "is_test_job": rng.random(count) < 0.2,
+        "last_build_duration": durations[:, 0].astype(int),
+        "last_successful_duration": durations[:, 1].astype(int),
+        "last_failed_duration": durations[:, 2].astype(int),
+        "avg_build_duration": durations.mean(axis=1),
+        "avg_successful_duration": durations[:, 1],
+        "avg_failed_duration": durations[:, 2],
+        "min_build_duration": durations.min(axis=1).astype(int),
+        "max_build_duration": durations.max(axis=1).astype(int),
+        "total_build_duration": (durations.mean(axis=1) * total_builds).astype(int),
+        "owner_name": owners,
+        "owner_email": np.char.add(owners, "@example.com"),
+        "other_tag": None,
+        "ownership_status": np.array(OWNERSHIP_STATUSES)[rng.integers(0, len(OWNERSHIP_STATUSES), count)],
+        "last_editor": owners,
+        "last_user": owners,
+    })
+
+
+def process_rss_mib():
+    """Resident memory of this process in MiB (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and KiB elsewhere
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def browse(session):
+    """
+    Run a new AppTest session through SESSION_JOURNEY.
+
+    Returns:
+        str: Error message of the first failed step, or None
+    """
+    session.run()
+    if not session.exception:
+        search = next((widget for widget in session.text_input if widget.label == "🔎 Quick Search"), None)
+        if search is None:
+            return "Quick Search input not found on the Overview"
+        search.input(SEARCH_TERM).run()
+    for key, label in SESSION_JOURNEY:
+        if session.exception:
+            break
+        # Keyed widgets take their value from session state, as if the segment were clicked
+        session.session_state[key] = label
+        session.run()
+    return session.exception[0].message if session.exception else None
+
+
+def run_load_test(job_count=DEFAULT_JOB_COUNT, session_counts=SESSION_COUNTS):
+    """
+    Print process RSS as dashboard sessions are added over a synthetic jobs frame.
+
+    Args:
+        job_count (int): Number of synthetic jobs
+        session_counts (list): Numbers of live sessions to measure at, ascending
+    """
+    from streamlit.testing.v1 import AppTest
+    from src.sqlite_manager import SQLiteManager
+
+    app_file = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    with tempfile.TemporaryDirectory(prefix="jenkins_dashboard_loadtest.") as directory:
+        # main.py runs in this process, so its sessions read this configuration
+        DashboardConfig.DB_TYPE = "sqlite"
+        DashboardConfig.DB_FILE = os.path.join(directory, "jenkins_data.db")
+        DashboardConfig.COLUMNAR_CACHE_FILE = os.path.join(directory, "jenkins_items.parquet")
+        # Never touch the deployment's bundles and exports
+        DashboardConfig.ANALYTICS_BUNDLE_DIR = os.path.join(directory, "analytics")
+        DashboardConfig.EXPORT_DIR = os.path.join(directory, "exports")
+        DashboardConfig.JENKINS_BASE_URL = DashboardConfig.JENKINS_BASE_URL or "https://jenkins.example.com"
+        DashboardConfig.JENKINS_USER = DashboardConfig.JENKINS_USER or "loadtest"
+        DashboardConfig.JENKINS_TOKEN = DashboardConfig.JENKINS_TOKEN or "loadtest"
+
+        backend = SQLiteManager(DashboardConfig.DB_FILE)
+        backend.init_db()
+        backend.cache_data(synthetic_jobs(job_count))
+        gc.collect()
+        baseline = process_rss_mib()
+        print(f"Jobs:           {job_count:,}")
+        print(f"RSS before app: {baseline:,.1f} MiB")
+        print()
+        print(f"{'Sessions':>8}  {'RSS (MiB)':>10}  {'Growth (MiB)':>12}  {'Per session (MiB)':>17}")
+
+        sessions = []
+        first = None
+        for target in session_counts:
+            while len(sessions) < target:
+                session = AppTest.from_file(app_file, default_timeout=SESSION_TIMEOUT)
+                error = browse(session)
+                if error:
+                    print(f"❌ Session {len(sessions) + 1} failed: {error}")
+                    return
+                sessions.append(session)
+            gc.collect()
+            rss = process_rss_mib()
+            if first is None:
+                first = (len(sessions), rss)
+            added = len(sessions) - first[0]
+            per_session = (rss - first[1]) / added if added else 0.0
+            print(f"{len(sessions):>8}  {rss:>10,.1f}  {rss - first[1]:>12,.1f}  {per_session:>17,.2f}")
+
+
+if __name__ == "__main__":
+    run_load_test(int(sys.argv[1]) if len(sys.argv) > 1 else DEFAULT_JOB_COUNT)
@@ -1,14 +1,28 @@
 import pandas as pd
 import psycopg2
 import psycopg2.extras
+import psycopg2.sql
+import select
+import threading
 import time
 from datetime import datetime, timezone
 from src.config import DashboardConfig
+from src.storage_backend import StorageBackend, JOB_COLUMNS, DATE_COLUMNS, SNAPSHOT_COLUMNS, build_staging_schema
+from src.job_query import search_text_expression
+from src.aggregates import AGGREGATE_SCHEMA, SYNC_STATS_SCHEMA, refresh_aggregates
+from src.sync_ledger import SYNC_RUNS_SCHEMA, SYNC_LOCK_SCHEMA, SYNC_RUNS_RETENTION_DELETE, backfill_sync_run
+from src.duration_sketch import DURATION_SKETCH_SCHEMA
+from src.flakiness import JOB_BUILDS_SCHEMA, JOB_FLAKINESS_SCHEMA
+from src.build_history import build_history_staging_schema
 
 
-class PostgreSQLManager:
+class PostgreSQLManager(StorageBackend):
     """PostgreSQL database manager for Jenkins Dashboard"""
     
+    dialect = "postgresql"
+    name = "PostgreSQL"
+    supports_percentiles = True
+    
     def __init__(self):
         self.connection_string = (
             f"postgresql://{DashboardConfig.POSTGRES_USER}:{DashboardConfig.POSTGRES_PASSWORD}"
@@ -23,227 +37,312 @@ class PostgreSQLManager:
         except psycopg2.Error as e:
             raise Exception(f"Failed to connect to PostgreSQL: {e}")
     
+    def _stream_cursor(self, conn):
+        """Named (server-side) cursor; a client-side cursor would buffer the whole result"""
+        return conn.cursor(name=f"export_{threading.get_ident()}_{time.monotonic_ns()}")
+    
+    def _notify_sync(self, cursor, sync_run_id):
+        """NOTIFY listening app processes of the new sync version; delivered on commit"""
+        if DashboardConfig.SYNC_NOTIFY_ENABLED:
+            cursor.execute("SELECT pg_notify(%s, %s)", (DashboardConfig.SYNC_NOTIFY_CHANNEL, str(sync_run_id)))
+    
     def init_db(self):
         """Initialize database (tables are created by init script)"""
         try:
             conn = self.get_connection()
+            cursor = conn.cursor()
+            # Snapshot history may be missing on databases created before it existed
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS job_snapshots (
+                    url TEXT NOT NULL,
+                    name VARCHAR(500) NOT NULL,
+                    folder VARCHAR(500),
+                    snapshot_time TIMESTAMP WITH TIME ZONE NOT NULL,
+                    last_build_status VARCHAR(50),
+                    success_rate DECIMAL(10,2),
+                    last_build_duration BIGINT,
+                    avg_build_duration DECIMAL(10,2),
+                    max_build_duration BIGINT,
+                    is_disabled BOOLEAN
+                ) PARTITION BY RANGE (snapshot_time)
+            """)
+            cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_job_snapshots_url_time ON job_snapshots(url, snapshot_time DESC)"
+            )
+            # Quick Search columns, maintained by PostgreSQL as each sync inserts rows
+            cursor.execute(f"""
+                ALTER TABLE jenkins_items
+                ADD COLUMN IF NOT EXISTS search_text TEXT
+                    GENERATED ALWAYS AS ({search_text_expression("postgresql")}) STORED,
+                ADD COLUMN IF NOT EXISTS search_vector tsvector
+                    GENERATED ALWAYS AS (to_tsvector('simple', {search_text_expression("postgresql")})) STORED
+            """)
+            # Dashboard aggregates, backfilled for data synced before they existed
+            for statement in AGGREGATE_SCHEMA:
+                cursor.execute(statement)
+            cursor.execute(SYNC_STATS_SCHEMA)
+            cursor.execute("SELECT 1 FROM agg_summary LIMIT 1")
+            if cursor.fetchone() is None:
+                refresh_aggregates(cursor, "postgresql")
+            # Sync ledger and the link from each job to the run that wrote it
+            cursor.execute(SYNC_RUNS_SCHEMA)
+            cursor.execute("ALTER TABLE jenkins_items ADD COLUMN IF NOT EXISTS sync_run_id INTEGER")
+            backfill_sync_run(cursor, "postgresql")
+            for statement in SYNC_LOCK_SCHEMA:
+                cursor.execute(statement)
+            # Build duration sketches and build history may be missing on databases created before they existed
+            cursor.execute(DURATION_SKETCH_SCHEMA)
+            cursor.execute(JOB_BUILDS_SCHEMA)
+            cursor.execute(JOB_FLAKINESS_SCHEMA)
+            cursor.execute(build_staging_schema("postgresql"))
+            for statement in build_history_staging_schema("postgresql"):
+                cursor.execute(statement)
+            conn.commit()
+            
+            # Trigram index for substring search; without pg_trgm search still works on search_text
+            try:
+                cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+                cursor.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_jenkins_items_search_trgm "
+                    "ON jenkins_items USING gin (search_text gin_trgm_ops)"
+                )
+                conn.commit()
+            except psycopg2.Error as e:
+                conn.rollback()
+                print(f"⚠️ Warning: pg_trgm unavailable, Quick Search will scan search_text: {e}")
+            cursor.close()
             conn.close()
             print("✅ PostgreSQL database initialized successfully")
         except Exception as e:
             print(f"❌ Failed to initialize PostgreSQL database: {e}")
             raise
     
-    def get_cached_data(self):
-        """Get cached data from PostgreSQL"""
-        try:
-            conn = self.get_connection()
-            
-            # Get the data
-            query = """
-                SELECT name, url, type, description, last_build_status, last_build_url, folder,
-                       is_disabled, last_build_date, last_successful_date, last_failed_date,
-                       days_since_last_build, total_builds, success_count, failure_count,
-                       success_rate, is_test_job, last_build_duration, last_successful_duration,
-                       last_failed_duration, avg_build_duration, avg_successful_duration,
-                       avg_failed_duration, min_build_duration, max_build_duration,
-                       total_build_duration, owner_name, owner_email, other_tag, ownership_status, last_editor, last_user, timestamp
-                FROM jenkins_items
-                ORDER BY name
-            """
-            
-            df = pd.read_sql_query(query, conn)
-            
-            # Get the timestamp of when data was last cached
-            timestamp_query = "SELECT timestamp FROM jenkins_items ORDER BY timestamp DESC LIMIT 1"
-            cursor = conn.cursor()
-            cursor.execute(timestamp_query)
-            result = cursor.fetchone()
-            last_sync_timestamp = result[0] if result else None
-            cursor.close()
-            
-            # Handle data types and nulls
-            if not df.empty:
-                df["last_build_status"] = df["last_build_status"].fillna("Unknown")
-                df["is_disabled"] = df["is_disabled"].fillna(False).astype(bool)
-                df["is_test_job"] = df["is_test_job"].fillna(False).astype(bool)
-                df["success_rate"] = df["success_rate"].fillna(0.0)
-                # Ensure success_rate is within PostgreSQL DECIMAL(10,2) range
-                df["success_rate"] = df["success_rate"].clip(-99999999.99, 99999999.99)
-                
-                # Debug: Check for any extreme values
-                max_rate = df["success_rate"].max()
-                min_rate = df["success_rate"].min()
-                print(f"Debug: success_rate range - min: {min_rate}, max: {max_rate}")
+    def _insert_jobs(self, conn, df, table):
+        """Bulk insert a batch of jobs into table"""
+        cursor = conn.cursor()
+        
+        # Prepare data for insertion
+        columns = JOB_COLUMNS
+        df_copy = df.reindex(columns=JOB_COLUMNS)
+        
+        # Convert datetime columns to proper format and handle NaT values
+        for col in DATE_COLUMNS:
+            # Convert to datetime and replace NaT with None
+            df_copy[col] = pd.to_datetime(df_copy[col], utc=True, errors='coerce')
+            df_copy[col] = df_copy[col].replace({pd.NaT: None})
+        
+        # Prepare data tuples with proper data type handling
+        data_tuples = []
+        for _, row in df_copy.iterrows():
+            data_tuple = []
+            for col in columns:
+                value = row[col]
                 
-                # Check for any infinite values
-                if df["success_rate"].isin([float('inf'), float('-inf')]).any():
-                    print("Warning: Found infinite values in success_rate, replacing with 0.0")
-                    df["success_rate"] = df["success_rate"].replace([float('inf'), float('-inf')], 0.0)
-                df["success_count"] = df["success_count"].fillna(0)
-                df["failure_count"] = df["failure_count"].fillna(0)
-                
-                # Fill NaN values for duration columns
-                duration_columns = [
-                    "last_build_duration", "last_successful_duration", "last_failed_duration",
-                    "avg_build_duration", "avg_successful_duration", "avg_failed_duration",
-                    "min_build_duration", "max_build_duration", "total_build_duration"
-                ]
-                for col in duration_columns:
-                    df[col] = df[col].fillna(0)
-            
-            conn.close()
-            return df, last_sync_timestamp
-            
-        except Exception as e:
-            print(f"❌ Error getting cached data from PostgreSQL: {e}")
-            return None, None
+                # Handle NaN/NaT values
+                if pd.isna(value) or (hasattr(value, 'value') and pd.isna(value.value)):
+                    data_tuple.append(None)
+                else:
+                    # Handle numeric fields specifically
+                    if col == 'success_rate':
+                        # Ensure success_rate is within PostgreSQL DECIMAL(10,2) range
+                        try:
+                            rate = float(value)
+                            if rate > 99999999.99:
+                                rate = 99999999.99
+                            elif rate < -99999999.99:
+                                rate = -99999999.99
+                            data_tuple.append(rate)
+                        except (ValueError, TypeError):
+                            data_tuple.append(0.0)
+                    elif col in ['avg_build_duration', 'avg_successful_duration', 'avg_failed_duration']:
+                        # Handle other numeric fields
+                        try:
+                            val = float(value)
+                            if val > 99999999.99:
+                                val = 99999999.99
+                            elif val < -99999999.99:
+                                val = -99999999.99
+                            data_tuple.append(val)
+                        except (ValueError, TypeError):
+                            data_tuple.append(0.0)
+                    else:
+                        data_tuple.append(value)
+            data_tuples.append(tuple(data_tuple))
+        
+        # Insert data
+        insert_query = f"""
+            INSERT INTO {table} ({', '.join(columns)})
+            VALUES ({', '.join(['%s'] * len(columns))})
+        """
+        
+        psycopg2.extras.execute_batch(cursor, insert_query, data_tuples, page_size=1000)
+
+    def _insert_rows(self, conn, df, table):
+        """Bulk insert the rows of df into table"""
+        if df.empty:
+            return
+        # Plain Python values; NaN becomes NULL
+        rows = list(df.astype(object).where(df.notna(), None).itertuples(index=False, name=None))
+        psycopg2.extras.execute_batch(
+            conn.cursor(),
+            f"INSERT INTO {table} ({', '.join(df.columns)}) VALUES ({', '.join(['%s'] * len(df.columns))})",
+            rows,
+            page_size=1000
+        )
     
-    def cache_data(self, df):
-        """Cache data to PostgreSQL"""
+    def _ensure_snapshot_partition(self, cursor, snapshot_time):
+        """Create the monthly job_snapshots partition covering snapshot_time"""
+        start = datetime(snapshot_time.year, snapshot_time.month, 1, tzinfo=timezone.utc)
+        if start.month == 12:
+            end = start.replace(year=start.year + 1, month=1)
+        else:
+            end = start.replace(month=start.month + 1)
+        
+        cursor.execute(
+            psycopg2.sql.SQL(
+                "CREATE TABLE IF NOT EXISTS {} PARTITION OF job_snapshots FOR VALUES FROM (%s) TO (%s)"
+            ).format(psycopg2.sql.Identifier(f"job_snapshots_{start:%Y_%m}")),
+            (start, end)
+        )
+    
+    def _record_snapshots(self, cursor, sync_timestamp):
+        """
+        Append a snapshot for every job whose tracked metrics changed since its latest snapshot.
+        
+        Runs inside the cache_data transaction against the freshly written jenkins_items.
+        
+        Returns:
+            int: Number of snapshot rows written
+        """
+        snapshot_time = datetime.fromtimestamp(sync_timestamp, tz=timezone.utc)
+        self._ensure_snapshot_partition(cursor, snapshot_time)
+        
+        columns = ", ".join(SNAPSHOT_COLUMNS)
+        changed = " OR ".join(f"s.{col} IS DISTINCT FROM j.{col}" for col in SNAPSHOT_COLUMNS)
+        cursor.execute(f"""
+            INSERT INTO job_snapshots (url, name, folder, snapshot_time, {columns})
+            SELECT j.url, j.name, j.folder, %s, {", ".join(f"j.{col}" for col in SNAPSHOT_COLUMNS)}
+            FROM jenkins_items j
+            LEFT JOIN (
+                SELECT DISTINCT ON (url) url, {columns}
+                FROM job_snapshots
+                ORDER BY url, snapshot_time DESC
+            ) s ON s.url = j.url
+            WHERE s.url IS NULL OR {changed}
+        """, (snapshot_time,))
+        return cursor.rowcount
+    
+    def cleanup_old_data(self, days_to_keep=90):
+        """Drop job_snapshots partitions that lie entirely outside the retention window"""
         try:
             conn = self.get_connection()
             cursor = conn.cursor()
             
-            # Clear existing data
-            cursor.execute("DELETE FROM jenkins_items")
-            
-            # Prepare data for insertion
-            df_copy = df.copy()
-            df_copy["timestamp"] = time.time()
+            cutoff = datetime.fromtimestamp(time.time() - (days_to_keep * 24 * 60 * 60), tz=timezone.utc)
             
-            # Convert datetime columns to proper format and handle NaT values
-            datetime_columns = ["last_build_date", "last_successful_date", "last_failed_date"]
-            for col in datetime_columns:
-                if col in df_copy.columns:
-                    # Convert to datetime and replace NaT with None
-                    df_copy[col] = pd.to_datetime(df_copy[col], utc=True, errors='coerce')
-                    df_copy[col] = df_copy[col].replace({pd.NaT: None})
+            cursor.execute("""
+                SELECT child.relname
+                FROM pg_inherits
+                JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+                JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+                WHERE parent.relname = 'job_snapshots'
+            """)
             
-            # Insert data using executemany for better performance
-            columns = [
-                "name", "url", "type", "description", "last_build_status", "last_build_url", 
-                "folder", "is_disabled", "last_build_date", "last_successful_date", 
-                "last_failed_date", "days_since_last_build", "total_builds", "success_count", 
-                "failure_count", "success_rate", "is_test_job", "last_build_duration", 
-                "last_successful_duration", "last_failed_duration", "avg_build_duration", 
-                "avg_successful_duration", "avg_failed_duration", "min_build_duration", 
-                "max_build_duration", "total_build_duration", "owner_name", "owner_email", 
-                "other_tag", "ownership_status", "last_editor", "last_user", "timestamp"
-            ]
+            dropped_partitions = []
+            for (partition_name,) in cursor.fetchall():
+                try:
+                    year, month = (int(part) for part in partition_name.rsplit("_", 2)[-2:])
+                except ValueError:
+                    continue  # Not one of our monthly partitions
+                # A partition ends where the next month starts
+                partition_end = datetime(year + month // 12, month % 12 + 1, 1, tzinfo=timezone.utc)
+                if partition_end <= cutoff:
+                    cursor.execute(
+                        psycopg2.sql.SQL("DROP TABLE IF EXISTS {}").format(psycopg2.sql.Identifier(partition_name))
+                    )
+                    dropped_partitions.append(partition_name)
             
-            # Prepare data tuples with proper data type handling
-            data_tuples = []
-            for _, row in df_copy.iterrows():
-                data_tuple = []
-                for col in columns:
-                    value = row[col]
-                    
-                    # Handle NaN/NaT values
-                    if pd.isna(value) or (hasattr(value, 'value') and pd.isna(value.value)):
-                        data_tuple.append(None)
-                    else:
-                        # Handle numeric fields specifically
-                        if col == 'success_rate':
-                            # Ensure success_rate is within PostgreSQL DECIMAL(10,2) range
-                            try:
-                                rate = float(value)
-                                if rate > 99999999.99:
-                                    rate = 99999999.99
-                                elif rate < -99999999.99:
-                                    rate = -99999999.99
-                                data_tuple.append(rate)
-                            except (ValueError, TypeError):
-                                data_tuple.append(0.0)
-                        elif col in ['avg_build_duration', 'avg_successful_duration', 'avg_failed_duration']:
-                            # Handle other numeric fields
-                            try:
-                                val = float(value)
-                                if val > 99999999.99:
-                                    val = 99999999.99
-                                elif val < -99999999.99:
-                                    val = -99999999.99
-                                data_tuple.append(val)
-                            except (ValueError, TypeError):
-                                data_tuple.append(0.0)
-                        else:
-                            data_tuple.append(value)
-                data_tuples.append(tuple(data_tuple))
-            
-            # Insert data
-            insert_query = f"""
-                INSERT INTO jenkins_items ({', '.join(columns)})
-                VALUES ({', '.join(['%s'] * len(columns))})
-            """
-            
-            psycopg2.extras.execute_batch(cursor, insert_query, data_tuples, page_size=1000)
+            # Per-sync statistics and the sync ledger share the snapshot retention window
+            cursor.execute("DELETE FROM sync_stats WHERE sync_time < %s", (cutoff.timestamp(),))
+            cursor.execute(SYNC_RUNS_RETENTION_DELETE.format(placeholder="%s"), (cutoff.timestamp(),))
             
             conn.commit()
             cursor.close()
             conn.close()
             
-            print(f"✅ Successfully cached {len(df)} jobs to PostgreSQL")
+            print(f"✅ Dropped {len(dropped_partitions)} snapshot partitions (older than {days_to_keep} days)")
             
         except Exception as e:
-            print(f"❌ Error caching data to PostgreSQL: {e}")
+            print(f"❌ Error cleaning up old data: {e}")
             raise
+
+
+class SyncListener:
+    """
+    Process-wide LISTEN connection tracking the latest sync version.
     
-    def get_database_stats(self):
-        """Get database statistics"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            # Get basic stats
-            cursor.execute("SELECT COUNT(*) FROM jenkins_items")
-            total_jobs = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM jenkins_items WHERE is_disabled = TRUE")
-            disabled_jobs = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM jenkins_items WHERE is_test_job = TRUE")
-            test_jobs = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(*) FROM jenkins_items WHERE description IS NULL OR description = ''")
-            jobs_without_desc = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT MAX(timestamp) FROM jenkins_items")
-            last_sync = cursor.fetchone()[0]
-            
-            cursor.close()
-            conn.close()
-            
-            return {
-                "total_jobs": total_jobs,
-                "disabled_jobs": disabled_jobs,
-                "test_jobs": test_jobs,
-                "jobs_without_description": jobs_without_desc,
-                "last_sync": last_sync
-            }
-            
-        except Exception as e:
-            print(f"❌ Error getting database stats: {e}")
-            return None
+    A daemon thread waits on the notification channel and records the version
+    carried by each NOTIFY, so the app knows about syncs written by any replica
+    without querying the database. The current version is read once per
+    (re)connect to catch up on syncs missed while disconnected.
+    """
     
-    def cleanup_old_data(self, days_to_keep=90):
-        """Clean up old data (optional maintenance function)"""
-        try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            cutoff_timestamp = time.time() - (days_to_keep * 24 * 60 * 60)
-            
-            cursor.execute(
-                "DELETE FROM jenkins_items WHERE timestamp < %s",
-                (cutoff_timestamp,)
-            )
-            
-            deleted_count = cursor.rowcount
-            conn.commit()
-            cursor.close()
-            conn.close()
-            
-            print(f"✅ Cleaned up {deleted_count} old records (older than {days_to_keep} days)")
-            
-        except Exception as e:
-            print(f"❌ Error cleaning up old data: {e}")
-            raise 
\ No newline at end of file
+    # Seconds between reconnect attempts after the connection is lost
+    RECONNECT_DELAY = 5
+    
+    def __init__(self, backend, channel, on_new_version=None):
+        self.backend = backend
+        self.channel = channel
+        self.on_new_version = on_new_version
+        self.version = None
+        self.connected = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="sync-listener", daemon=True)
+        self._thread.start()
+    
+    def advance(self, version):
+        """Record a sync version if it is newer than the known one, notifying on_new_version"""
+        if version is None:
+            return
+        with self._lock:
+            if self.version is not None and version <= self.version:
+                return
+            previous, self.version = self.version, version
+        if previous is not None and self.on_new_version is not None:
+            self.on_new_version(version)
+    
+    def _run(self):
+        while True:
+            conn = None
+            try:
+                # Keepalives detect a silently dropped connection while idle
+                conn = psycopg2.connect(
+                    self.backend.connection_string, keepalives=1, keepalives_idle=30,
+                    keepalives_interval=10, keepalives_count=3
+                )
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                cursor = conn.cursor()
+                cursor.execute(psycopg2.sql.SQL("LISTEN {}").format(psycopg2.sql.Identifier(self.channel)))
+                cursor.execute("SELECT id FROM sync_runs WHERE status = 'success' ORDER BY id DESC LIMIT 1")
+                result = cursor.fetchone()
+                self.advance(int(result[0]) if result else None)
+                self.connected = True
+                print(f"✅ Listening for sync notifications on '{self.channel}'")
+                while True:
+                    # Block until a notification arrives; the timeout only bounds the wait
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        try:
+                            self.advance(int(notify.payload))
+                        except ValueError:
+                            print(f"⚠️ Ignoring sync notification with payload {notify.payload!r}")
+            except Exception as e:
+                print(f"⚠️ Sync listener disconnected, retrying in {self.RECONNECT_DELAY}s: {e}")
+            finally:
+                self.connected = False
+                if conn is not None:
+                    conn.close()
+            time.sleep(self.RECONNECT_DELAY)
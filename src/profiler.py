@@ -0,0 +1,253 @@
+import functools
+import json
+import threading
+import time
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+from src.config import DashboardConfig
+
+# Arrow sizes of st.dataframe payloads need pyarrow (shipped with Streamlit)
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Opt-in render profiler (RENDER_PROFILER=true). instrument() wraps the render_*
+# functions and data-layer calls of a module so each call records a span of the
+# current rerun; st.plotly_chart and st.dataframe spans also record the size of
+# the payload sent to the browser. Measuring a payload is excluded from every
+# span's time, so the waterfall shows what the page costs without the profiler.
+# render_profile_panel() draws the rerun's waterfall and keeps the last
+# RENDER_PROFILER_HISTORY reruns of the session for the JSON export. Fragment
+# reruns skip main.py, so each top-level instrumented call they make is kept
+# there as a run of its own.
+
+# Streamlit elements whose browser payload is measured
+PAYLOAD_ELEMENTS = ["plotly_chart", "dataframe"]
+
+_local = threading.local()
+
+
+def profiler_enabled():
+    """Check whether the render profiler is switched on"""
+    return DashboardConfig.RENDER_PROFILER_ENABLED
+
+
+def _clock():
+    """Seconds on a monotonic clock that stands still while the profiler measures payloads"""
+    return time.perf_counter() - getattr(_local, "overhead", 0.0)
+
+
+def start_run(label="rerun"):
+    """Start recording the spans of a script run in this thread"""
+    _local.run = {"label": label, "started_at": time.time(), "start": _clock(), "spans": []}
+    _local.depth = 0
+
+
+def finish_run():
+    """
+    Stop recording and return the run.
+
+    Returns:
+        dict: label, started_at (epoch seconds), total_ms and spans, each with
+        name, depth, start_ms (from the start of the run), duration_ms and
+        payload_bytes (None unless the span sent a chart or table); None if no
+        run was recording
+    """
+    run = getattr(_local, "run", None)
+    if run is None:
+        return None
+    _local.run = None
+    return {
+        "label": run["label"],
+        "started_at": run["started_at"],
+        "total_ms": (_clock() - run["start"]) * 1000,
+        "spans": run["spans"],
+    }
+
+
+class span:
+    """Context manager recording one span of the current run (a no-op when nothing is recording)"""
+
+    def __init__(self, name):
+        self.name = name
+        self.record = None
+
+    def __enter__(self):
+        run = getattr(_local, "run", None)
+        if run is None:
+            # Fragment reruns execute without main.py; record them as their own run
+            if not profiler_enabled() or getattr(_local, "suspended", False):
+                return self
+            start_run("fragment")
+            run = _local.run
+        self.record = {"name": self.name, "depth": _local.depth, "start_ms": None,
+                       "duration_ms": None, "payload_bytes": None}
+        run["spans"].append(self.record)
+        _local.depth += 1
+        self.start = _clock()
+        self.record["start_ms"] = (self.start - run["start"]) * 1000
+        return self
+
+    def __exit__(self, *exc):
+        if self.record is not None:
+            self.record["duration_ms"] = (_clock() - self.start) * 1000
+            _local.depth -= 1
+            run = getattr(_local, "run", None)
+            if _local.depth == 0 and run is not None and run["label"] == "fragment":
+                _keep_run(finish_run())
+        return False
+
+    def set_payload(self, measure):
+        """Record the payload size returned by measure(), excluding the measurement from every span"""
+        if self.record is None:
+            return
+        measure_start = time.perf_counter()
+        try:
+            self.record["payload_bytes"] = measure()
+        except Exception:
+            # A payload that cannot be measured must not break the page
+            self.record["payload_bytes"] = None
+        _local.overhead = getattr(_local, "overhead", 0.0) + time.perf_counter() - measure_start
+
+
+def profiled(name, func):
+    """Wrap func so every call records a span named name"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+def figure_bytes(figure):
+    """Size of a Plotly figure's JSON spec, which is what the browser receives"""
+    return len(figure.to_json().encode("utf-8"))
+
+
+def dataframe_bytes(data):
+    """Size of a DataFrame as Arrow buffers, the format st.dataframe sends to the browser"""
+    if not PYARROW_AVAILABLE or not isinstance(data, pd.DataFrame):
+        return None
+    return pa.Table.from_pandas(data, preserve_index=False).nbytes
+
+
+def _profiled_element(name, element, measure):
+    """Wrap a Streamlit element so its span records the size of its first argument"""
+    @functools.wraps(element)
+    def wrapper(data=None, *args, **kwargs):
+        with span(f"st.{name}") as current:
+            result = element(data, *args, **kwargs)
+            if data is not None:
+                current.set_payload(lambda: measure(data))
+            return result
+    wrapper._profiled = True
+    return wrapper
+
+
+def instrument(namespace, names=(), prefix="render_"):
+    """
+    Record a span for every call of a module's render functions and the given data-layer calls.
+
+    Calls resolve module globals at call time, so replacing them in the module's
+    namespace covers calls from anywhere in that module. Does nothing unless the
+    profiler is enabled.
+
+    Args:
+        namespace (dict): globals() of the module to instrument
+        names (iterable): Further functions or classes of the namespace; for a
+            class, pass "Class.method"
+        prefix (str): Functions starting with this prefix are instrumented
+    """
+    if not profiler_enabled():
+        return
+    for name, value in list(namespace.items()):
+        if name.startswith(prefix) and callable(value):
+            namespace[name] = profiled(name, value)
+    for name in names:
+        if "." in name:
+            owner_name, attribute = name.split(".", 1)
+            owner = namespace[owner_name]
+            setattr(owner, attribute, profiled(name, getattr(owner, attribute)))
+        else:
+            namespace[name] = profiled(name, namespace[name])
+
+    # Streamlit elements are patched once per process
+    measures = {"plotly_chart": figure_bytes, "dataframe": dataframe_bytes}
+    for element in PAYLOAD_ELEMENTS:
+        if not getattr(getattr(st, element), "_profiled", False):
+            setattr(st, element, _profiled_element(element, getattr(st, element), measures[element]))
+
+
+def profile_to_json(runs):
+    """Serialize recorded runs for regression tracking"""
+    return json.dumps({"runs": runs}, indent=2)
+
+
+def _keep_run(run):
+    """Add a finished run to the session's history and return the history"""
+    history = st.session_state.setdefault("render_profile_history", [])
+    history.append(run)
+    del history[:-DashboardConfig.RENDER_PROFILER_HISTORY]
+    return history
+
+
+def render_profile_panel():
+    """Finish the current run and show its waterfall in a collapsible debug panel"""
+    run = finish_run()
+    if run is None:
+        return
+    history = _keep_run(run)
+    # The panel's own chart and table are not part of the page being profiled
+    _local.suspended = True
+    try:
+        _render_profile(run, history)
+    finally:
+        _local.suspended = False
+
+
+def _render_profile(run, history):
+    """Waterfall, span table and JSON export of a finished run"""
+    with st.expander(f"⏱️ Render Profile ({run['total_ms']:,.0f} ms)", expanded=False):
+        spans = pd.DataFrame(run["spans"], columns=["name", "depth", "start_ms", "duration_ms", "payload_bytes"])
+        if spans.empty:
+            st.info("No instrumented calls in this rerun.")
+        else:
+            labels = [" " * depth + name for name, depth in zip(spans["name"], spans["depth"])]
+            # One row per span, so repeated calls of the same function stay separate
+            rows = list(range(len(spans)))
+            fig = go.Figure(go.Bar(
+                y=rows,
+                x=spans["duration_ms"],
+                base=spans["start_ms"],
+                orientation="h",
+                customdata=spans[["duration_ms", "payload_bytes"]].fillna(0).assign(name=spans["name"]),
+                hovertemplate='%{customdata[2]}<br>%{customdata[0]:,.1f} ms<br>%{customdata[1]:,} bytes<extra></extra>'
+            ))
+            fig.update_layout(
+                height=max(200, 22 * len(spans) + 60),
+                margin=dict(t=10, b=30, l=10, r=10),
+                xaxis_title="ms since start of rerun",
+                yaxis=dict(autorange="reversed", tickmode="array", tickvals=rows, ticktext=labels)
+            )
+            st.plotly_chart(fig, use_container_width=True)
+
+            st.dataframe(
+                spans.assign(name=labels),
+                column_config={
+                    "name": st.column_config.TextColumn("Call"),
+                    "depth": None,
+                    "start_ms": st.column_config.NumberColumn("Start (ms)", format="%.1f"),
+                    "duration_ms": st.column_config.NumberColumn("Duration (ms)", format="%.1f"),
+                    "payload_bytes": st.column_config.NumberColumn("Payload (bytes)", format="%d"),
+                },
+                use_container_width=True,
+                hide_index=True
+            )
+
+        st.download_button(
+            f"📥 Download last {len(history)} reruns as JSON", profile_to_json(history),
+            file_name="render_profile.json", mime="application/json", key="render_profile_download"
+        )
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+from src.config import DashboardConfig
+
+# Cleanup and outlier recommendations as vectorized threshold rules. Each rule
+# set is an ordered list of (condition, label) pairs evaluated with np.select
+# over whole columns, first match wins; classify_jobs() runs once per sync and
+# stores one label column per rule set on the jobs frame.
+
+# Label column written by classify_jobs() for each rule set
+RECOMMENDATION_COLUMNS = {
+    "test_job": "test_job_recommendation",
+    "inactive_job": "inactive_job_recommendation",
+    "disabled_job": "disabled_job_recommendation",
+    "outlier_type": "outlier_type",
+    "outlier": "outlier_recommendation",
+}
+
+
+def _above(values, threshold):
+    """values > threshold as a plain bool array; missing values never match"""
+    return (pd.to_numeric(values, errors="coerce") > threshold).to_numpy(dtype=bool, na_value=False)
+
+
+def _below(values, threshold):
+    """values < threshold as a plain bool array; missing values never match"""
+    return (pd.to_numeric(values, errors="coerce") < threshold).to_numpy(dtype=bool, na_value=False)
+
+
+def format_hours(hours, plus=False):
+    """Human duration label for an hour threshold, e.g. 72 -> "3 days" ("3+ days" with plus)"""
+    for unit_hours, unit in [(168, "week"), (24, "day"), (1, "hour")]:
+        if hours % unit_hours == 0:
+            count = int(hours // unit_hours)
+            return f"{count}{'+' if plus else ''} {unit}{'s' if count != 1 else ''}"
+    return f"{hours:g}{'+' if plus else ''} hours"
+
+
+def build_rules(df):
+    """
+    Evaluate the rule conditions of every rule set against the jobs.
+
+    Thresholds are read from DashboardConfig on each call.
+
+    Args:
+        df (DataFrame): Cleaned jobs
+
+    Returns:
+        dict: Rule set name -> (rules, default) where rules is a list of
+        (bool ndarray, label) pairs in priority order
+    """
+    days = df["days_since_last_build"]
+    duration_hours = pd.to_numeric(df["avg_build_duration"], errors="coerce") / 3600000
+    config = DashboardConfig
+    outlier_tiers = [
+        (config.OUTLIER_EXTREME_HOURS, f"🚨 Extremely Long Build (>{format_hours(config.OUTLIER_EXTREME_HOURS)})",
+         "🔧 Investigate immediately - likely stuck or misconfigured"),
+        (config.OUTLIER_VERY_LONG_HOURS, f"⚠️ Very Long Build ({format_hours(config.OUTLIER_VERY_LONG_HOURS, plus=True)})",
+         "📋 Review build process - consider optimization or parallelization"),
+        (config.OUTLIER_LONG_HOURS, f"🐌 Long Build ({format_hours(config.OUTLIER_LONG_HOURS, plus=True)})",
+         "👀 Monitor closely - may need process improvements"),
+        (config.OUTLIER_EXTENDED_HOURS, f"⏰ Extended Build ({format_hours(config.OUTLIER_EXTENDED_HOURS, plus=True)})",
+         "📊 Analyze build steps - look for optimization opportunities"),
+    ]
+    return {
+        "test_job": ([
+            (_above(days, config.TEST_JOB_STALE_DAYS), "🔄 Consider removing - inactive test job"),
+            (_below(df["total_builds"], config.TEST_JOB_MIN_BUILDS), "⚠️ Review - low build count test job"),
+        ], "📋 Review - active test job"),
+        "inactive_job": ([
+            (_above(days, config.INACTIVE_REMOVAL_DAYS), "🗑️ Strong candidate for removal - very old"),
+            (_above(days, config.INACTIVE_ARCHIVE_DAYS), "📋 Review for archiving - moderately old"),
+        ], "👀 Monitor - recently inactive"),
+        "disabled_job": ([
+            (_above(days, config.INACTIVE_JOB_THRESHOLD_DAYS), "🗑️ Consider removal - disabled and inactive"),
+        ], "📋 Review - disabled but recently active"),
+        "outlier_type": ([
+            (_above(duration_hours, hours), label) for hours, label, _ in outlier_tiers
+        ], "📊 Unusual Build Duration"),
+        "outlier": ([
+            (_above(duration_hours, hours), recommendation) for hours, _, recommendation in outlier_tiers
+        ], "🔍 Review build configuration"),
+    }
+
+
+def classify_jobs(df):
+    """
+    Label every job with the recommendation of each rule set.
+
+    Labels are computed for all jobs; each view shows the column for its own
+    subset (e.g. test_job_recommendation for test jobs).
+
+    Args:
+        df (DataFrame): Cleaned jobs of one sync
+
+    Returns:
+        DataFrame: The same frame with the RECOMMENDATION_COLUMNS added as categoricals
+    """
+    for rule_set, (rules, default) in build_rules(df).items():
+        labels = [label for _, label in rules] + [default]
+        # Select the index of the first matching rule; the default is the last label
+        codes = np.select([condition for condition, _ in rules], np.arange(len(rules)), default=len(rules))
+        df[RECOMMENDATION_COLUMNS[rule_set]] = pd.Categorical.from_codes(codes, categories=labels)
+    return df
@@ -0,0 +1,134 @@
+import time
+import pandas as pd
+from src.storage_backend import DATE_COLUMNS
+
+# Compact in-memory schema of the jobs DataFrame. Run `python -m src.schema` for
+# the per-column memory report and a before/after benchmark of footprint and
+# Overview filter speed on the jobs stored in the configured database.
+
+# Labels shared by many jobs, stored once per distinct value
+CATEGORY_COLUMNS = [
+    "type", "folder", "last_build_status", "ownership_status", "owner_name",
+    "owner_email", "other_tag", "last_editor", "last_user"
+]
+
+# Whole-number columns, stored as the smallest nullable integer type that fits but
+# at least MIN_INTEGER_DTYPE, so sums and products of counters do not overflow
+INTEGER_COLUMNS = [
+    "days_since_last_build", "total_builds", "success_count", "failure_count",
+    "last_build_duration", "last_successful_duration", "last_failed_duration",
+    "min_build_duration", "max_build_duration", "total_build_duration"
+]
+
+MIN_INTEGER_DTYPE = "Int32"
+
+# Percentages shown with one decimal, so single precision is plenty
+FLOAT32_COLUMNS = ["success_rate"]
+
+# Build dates, stored as nullable int64 Unix epoch seconds
+EPOCH_COLUMNS = DATE_COLUMNS
+
+
+def to_epoch_seconds(values):
+    """Convert datetimes or date strings to nullable int64 Unix epoch seconds"""
+    timestamps = pd.to_datetime(values, utc=True, errors="coerce", format="mixed")
+    return ((timestamps - pd.Timestamp(0, tz="UTC")) // pd.Timedelta(seconds=1)).astype("Int64")
+
+
+def apply_job_schema(df):
+    """
+    Convert a cleaned jobs frame to the compact schema. Converting an
+    already converted frame is a no-op.
+
+    Args:
+        df (DataFrame): Jobs as returned by clean_jobs_frame()
+
+    Returns:
+        DataFrame: The same frame with compact dtypes
+    """
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+            df[col] = df[col].astype("category")
+    for col in INTEGER_COLUMNS:
+        if col in df.columns and not pd.api.types.is_extension_array_dtype(df[col].dtype):
+            values = pd.to_numeric(df[col], errors="coerce").round().astype("Int64")
+            values = pd.to_numeric(values, downcast="integer")
+            if values.dtype.itemsize < pd.api.types.pandas_dtype(MIN_INTEGER_DTYPE).itemsize:
+                values = values.astype(MIN_INTEGER_DTYPE)
+            df[col] = values
+    for col in FLOAT32_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("float32")
+    for col in EPOCH_COLUMNS:
+        if col in df.columns and df[col].dtype != "Int64":
+            df[col] = to_epoch_seconds(df[col])
+    return df
+
+
+def memory_report(df):
+    """
+    Report the memory used by each column of a frame.
+
+    Returns:
+        DataFrame: dtype, bytes and share of the total per column, largest first
+    """
+    usage = df.memory_usage(deep=True, index=False)
+    report = pd.DataFrame({
+        "dtype": df.dtypes.astype(str),
+        "bytes": usage,
+        "share": usage / usage.sum(),
+    })
+    return report.sort_values("bytes", ascending=False)
+
+
+def _time_filters(df, repeat=20):
+    """Median seconds per run of representative Overview filters (memoization disabled)"""
+    from src.filter_engine import FilterEngine
+    from src.job_query import empty_filters
+
+    # Every run searches from scratch, without memoization or extended-term reuse
+    engine = FilterEngine(df, cache_size=0, reuse_searches=False)
+    folders = list(pd.Series(df["folder"]).dropna().unique()[:2])
+    filter_sets = [
+        {**empty_filters(), "search_term": "test"},
+        {**empty_filters(), "folders": folders, "statuses": ["FAILURE", "UNSTABLE"]},
+        {**empty_filters(), "ownership_status": "unassigned"},
+    ]
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for filters in filter_sets:
+            engine.apply(filters)
+        timings.append(time.perf_counter() - start)
+    return sorted(timings)[len(timings) // 2]
+
+
+def benchmark(df):
+    """Print memory and filter speed of a cleaned jobs frame before and after apply_job_schema"""
+    before = df
+    after = apply_job_schema(df.copy())
+
+    print("Per-column memory (compact schema):")
+    print(memory_report(after).to_string(formatters={"share": "{:.1%}".format}))
+
+    before_bytes = before.memory_usage(deep=True).sum()
+    after_bytes = after.memory_usage(deep=True).sum()
+    before_seconds = _time_filters(before)
+    after_seconds = _time_filters(after)
+    print()
+    print(f"Jobs:           {len(df):,}")
+    print(f"Memory before:  {before_bytes / 1024 / 1024:.2f} MiB")
+    print(f"Memory after:   {after_bytes / 1024 / 1024:.2f} MiB ({after_bytes / before_bytes:.0%} of before)")
+    print(f"Filters before: {before_seconds * 1000:.1f} ms")
+    print(f"Filters after:  {after_seconds * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    from src.storage_backend import clean_jobs_frame, JOB_COLUMNS
+    from src.data_manager import get_storage_backend
+
+    raw = get_storage_backend().read_query(f"SELECT {', '.join(JOB_COLUMNS)} FROM jenkins_items")
+    if raw.empty:
+        print("❌ No jobs stored - sync data from Jenkins first")
+    else:
+        benchmark(clean_jobs_frame(raw))
@@ -0,0 +1,189 @@
+import sqlite3
+import threading
+import time
+import pandas as pd
+from contextlib import contextmanager
+from src.config import DashboardConfig
+from src.storage_backend import StorageBackend, JOB_COLUMNS, DATE_COLUMNS, SNAPSHOT_COLUMNS, build_staging_schema
+from src.job_query import search_text_expression
+from src.aggregates import AGGREGATE_SCHEMA, SYNC_STATS_SCHEMA, refresh_aggregates
+from src.sync_ledger import SYNC_RUNS_SCHEMA, SYNC_LOCK_SCHEMA, SYNC_RUNS_RETENTION_DELETE, backfill_sync_run
+from src.duration_sketch import DURATION_SKETCH_SCHEMA
+from src.flakiness import JOB_BUILDS_SCHEMA, JOB_FLAKINESS_SCHEMA
+from src.build_history import build_history_staging_schema
+
+
+# Indexes on jenkins_items, matching db/init/01_init.sql (plus url for the
+# per-sync job diff and snapshot joins)
+JOB_INDEX_COLUMNS = [
+    "name", "url", "folder", "last_build_status", "timestamp", "is_disabled", "is_test_job",
+    "owner_name", "owner_email", "other_tag", "ownership_status", "last_editor", "last_user"
+]
+
+# Idle reader connections per database file, shared by all sessions. Streamlit
+# runs every rerun on a new thread, so readers are pooled process-wide rather
+# than per thread; a borrowed reader is used by one thread at a time.
+_idle_readers = {}
+_idle_readers_lock = threading.Lock()
+
+# Idle readers kept per database file; extra concurrent readers are closed after use
+READER_POOL_SIZE = 4
+
+
+class SQLiteManager(StorageBackend):
+    """SQLite database manager for Jenkins Dashboard (default, single file)"""
+
+    dialect = "sqlite"
+    name = "SQLite"
+
+    def __init__(self, db_file=None):
+        self.db_file = db_file or DashboardConfig.DB_FILE
+
+    def get_connection(self, check_same_thread=True):
+        """Get SQLite database connection with the performance pragmas applied"""
+        conn = sqlite3.connect(self.db_file, check_same_thread=check_same_thread)
+        conn.execute(f"PRAGMA mmap_size = {DashboardConfig.SQLITE_MMAP_SIZE_MB * 1024 * 1024}")
+        # Negative cache_size is in KiB
+        conn.execute(f"PRAGMA cache_size = -{DashboardConfig.SQLITE_CACHE_SIZE_MB * 1024}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if DashboardConfig.SQLITE_JOURNAL_MODE.lower() == "wal":
+            # Durable across application crashes; only an OS crash can lose the last commits
+            conn.execute("PRAGMA synchronous = NORMAL")
+        return conn
+
+    @contextmanager
+    def _read_connection(self):
+        """Borrow a pooled reader connection; under WAL it never blocks a sync"""
+        with _idle_readers_lock:
+            idle = _idle_readers.setdefault(self.db_file, [])
+            conn = idle.pop() if idle else None
+        if conn is None:
+            conn = self.get_connection(check_same_thread=False)
+        try:
+            yield conn
+        except BaseException:
+            # Do not keep a connection in an unknown state, e.g. after an
+            # interrupted rerun or an abandoned stream
+            conn.close()
+            raise
+        if not conn.in_transaction:
+            with _idle_readers_lock:
+                idle = _idle_readers.setdefault(self.db_file, [])
+                if len(idle) < READER_POOL_SIZE:
+                    idle.append(conn)
+                    return
+        conn.close()
+
+    def init_db(self):
+        """Create the tables, search index and aggregates if they do not exist"""
+        conn = self.get_connection()
+        # WAL is a property of the database file, so it only needs setting once
+        conn.execute(f"PRAGMA journal_mode = {DashboardConfig.SQLITE_JOURNAL_MODE}")
+        c = conn.cursor()
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS jenkins_items
+            (name TEXT, url TEXT, type TEXT, description TEXT, last_build_status TEXT,
+             last_build_url TEXT, folder TEXT, timestamp REAL,
+             is_disabled INTEGER, last_build_date TEXT, last_successful_date TEXT,
+             last_failed_date TEXT, days_since_last_build INTEGER, total_builds INTEGER,
+             success_count INTEGER, failure_count INTEGER, success_rate REAL,
+             is_test_job INTEGER, last_build_duration INTEGER, last_successful_duration INTEGER,
+             last_failed_duration INTEGER, avg_build_duration REAL, avg_successful_duration REAL,
+             avg_failed_duration REAL, min_build_duration INTEGER, max_build_duration INTEGER,
+             total_build_duration INTEGER, owner_name TEXT, owner_email TEXT, other_tag TEXT,
+             ownership_status TEXT, last_editor TEXT, last_user TEXT, sync_run_id INTEGER)
+        """)
+        # Databases synced before the sync ledger existed lack the run link
+        columns = [row[1] for row in c.execute("PRAGMA table_info(jenkins_items)")]
+        if "sync_run_id" not in columns:
+            c.execute("ALTER TABLE jenkins_items ADD COLUMN sync_run_id INTEGER")
+        for column in JOB_INDEX_COLUMNS:
+            c.execute(f"CREATE INDEX IF NOT EXISTS idx_jenkins_items_{column} ON jenkins_items({column})")
+        c.execute("""
+            CREATE TABLE IF NOT EXISTS job_snapshots
+            (url TEXT NOT NULL, name TEXT NOT NULL, folder TEXT, snapshot_time REAL NOT NULL,
+             last_build_status TEXT, success_rate REAL, last_build_duration INTEGER,
+             avg_build_duration REAL, max_build_duration INTEGER, is_disabled INTEGER)
+        """)
+        c.execute("CREATE INDEX IF NOT EXISTS idx_job_snapshots_url_time ON job_snapshots(url, snapshot_time)")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_job_snapshots_time ON job_snapshots(snapshot_time)")
+        # Quick Search index; the trigram tokenizer supports substring matching
+        c.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS jenkins_items_fts
+            USING fts5(url UNINDEXED, search_text, tokenize='trigram')
+        """)
+        # Backfill the index for data synced before it existed
+        if c.execute("SELECT 1 FROM jenkins_items_fts LIMIT 1").fetchone() is None:
+            self._rebuild_search_index(conn)
+        for statement in AGGREGATE_SCHEMA:
+            c.execute(statement)
+        c.execute(SYNC_STATS_SCHEMA)
+        # Backfill the dashboard aggregates likewise
+        if c.execute("SELECT 1 FROM agg_summary LIMIT 1").fetchone() is None:
+            refresh_aggregates(c, self.dialect)
+        c.execute(SYNC_RUNS_SCHEMA)
+        backfill_sync_run(c, self.dialect)
+        for statement in SYNC_LOCK_SCHEMA:
+            c.execute(statement)
+        c.execute(DURATION_SKETCH_SCHEMA)
+        c.execute(JOB_BUILDS_SCHEMA)
+        c.execute(JOB_FLAKINESS_SCHEMA)
+        c.execute(build_staging_schema(self.dialect))
+        for statement in build_history_staging_schema(self.dialect):
+            c.execute(statement)
+        conn.commit()
+        conn.close()
+
+    def _insert_jobs(self, conn, df, table):
+        """Bulk insert a batch of jobs into table"""
+        df = df.reindex(columns=JOB_COLUMNS)
+        # Dates are stored as ISO text
+        for col in DATE_COLUMNS:
+            dates = pd.to_datetime(df[col], utc=True, errors="coerce")
+            df[col] = dates.astype(str).where(dates.notna(), None)
+        # Plain Python values; NaN/NaT become NULL
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(JOB_COLUMNS)}) VALUES ({', '.join(['?'] * len(JOB_COLUMNS))})",
+            rows
+        )
+
+    def _publish_staged_jobs(self, cursor, sync_timestamp, sync_run_id):
+        """Replace jenkins_items and its search index with the staged jobs"""
+        super()._publish_staged_jobs(cursor, sync_timestamp, sync_run_id)
+        self._rebuild_search_index(cursor.connection)
+
+    def _rebuild_search_index(self, conn):
+        """Repopulate the FTS5 Quick Search index from the freshly written jobs table"""
+        conn.execute("DELETE FROM jenkins_items_fts")
+        conn.execute(f"""
+            INSERT INTO jenkins_items_fts (url, search_text)
+            SELECT url, {search_text_expression(self.dialect)} FROM jenkins_items
+        """)
+
+    def _record_snapshots(self, cursor, sync_timestamp):
+        """Append a snapshot for every job whose tracked metrics changed since its latest snapshot"""
+        columns = ", ".join(SNAPSHOT_COLUMNS)
+        changed = " OR ".join(f"s.{col} IS NOT j.{col}" for col in SNAPSHOT_COLUMNS)
+        cursor.execute(f"""
+            INSERT INTO job_snapshots (url, name, folder, snapshot_time, {columns})
+            SELECT j.url, j.name, j.folder, ?, {", ".join(f"j.{col}" for col in SNAPSHOT_COLUMNS)}
+            FROM jenkins_items j
+            LEFT JOIN (
+                SELECT url, {columns},
+                       ROW_NUMBER() OVER (PARTITION BY url ORDER BY snapshot_time DESC) AS snapshot_rank
+                FROM job_snapshots
+            ) s ON s.url = j.url AND s.snapshot_rank = 1
+            WHERE s.url IS NULL OR {changed}
+        """, (sync_timestamp,))
+        return cursor.rowcount
+
+    def cleanup_old_data(self, days_to_keep=90):
+        """Remove job snapshots, sync statistics and sync runs older than the retention window"""
+        conn = self.get_connection()
+        cutoff_timestamp = time.time() - (days_to_keep * 24 * 60 * 60)
+        conn.execute("DELETE FROM job_snapshots WHERE snapshot_time < ?", (cutoff_timestamp,))
+        conn.execute("DELETE FROM sync_stats WHERE sync_time < ?", (cutoff_timestamp,))
+        conn.execute(SYNC_RUNS_RETENTION_DELETE.format(placeholder="?"), (cutoff_timestamp,))
+        conn.commit()
+        conn.close()
@@ -0,0 +1,543 @@
+import json
+import time
+import uuid
+from abc import ABC, abstractmethod
+import pandas as pd
+from contextlib import contextmanager
+from src.config import DashboardConfig
+from src.aggregates import (
+    DURATION_BUCKETS, refresh_aggregates, record_sync_stats, compute_sync_stats, build_duration_stats_query
+)
+from src.job_query import PLACEHOLDERS
+from src.duration_sketch import PERCENTILE_COLUMNS
+from src.build_history import BUILD_STAGING_TABLE, staged_builds, publish_staged_builds
+from src.sync_ledger import (
+    SYNC_RUN_COLUMNS, new_sync_run, add_fetch_metrics, timed_phase, next_sync_run_id, count_job_changes,
+    record_sync_run, claim_sync_lock, release_sync_lock
+)
+
+# Job columns stored in jenkins_items (every backend also stores the sync timestamp
+# and the id of the sync run that wrote the row)
+JOB_COLUMNS = [
+    "name", "url", "type", "description", "last_build_status", "last_build_url",
+    "folder", "is_disabled", "last_build_date", "last_successful_date",
+    "last_failed_date", "days_since_last_build", "total_builds", "success_count",
+    "failure_count", "success_rate", "is_test_job", "last_build_duration",
+    "last_successful_duration", "last_failed_duration", "avg_build_duration",
+    "avg_successful_duration", "avg_failed_duration", "min_build_duration",
+    "max_build_duration", "total_build_duration", "owner_name", "owner_email",
+    "other_tag", "ownership_status", "last_editor", "last_user"
+]
+
+DATE_COLUMNS = ["last_build_date", "last_successful_date", "last_failed_date"]
+
+DURATION_COLUMNS = [
+    "last_build_duration", "last_successful_duration", "last_failed_duration",
+    "avg_build_duration", "avg_successful_duration", "avg_failed_duration",
+    "min_build_duration", "max_build_duration", "total_build_duration"
+]
+
+# Table a sync streams the crawled jobs into before publishing them to jenkins_items
+STAGING_TABLE = "jenkins_items_staging"
+
+# Seconds between attempts to take the sync lease while another sync holds it
+SYNC_LOCK_POLL_SECONDS = 5
+
+# Job metrics tracked per sync in job_snapshots; a snapshot row is only written
+# when one of these differs from the job's latest snapshot
+SNAPSHOT_COLUMNS = [
+    "last_build_status", "success_rate", "last_build_duration",
+    "avg_build_duration", "max_build_duration", "is_disabled"
+]
+
+
+def build_staging_schema(dialect):
+    """
+    DDL of the staging table: the JOB_COLUMNS of jenkins_items with the same types.
+    PostgreSQL skips the write-ahead log for it, as its contents never outlive a sync.
+    """
+    unlogged = "UNLOGGED " if dialect == "postgresql" else ""
+    return (
+        f"CREATE {unlogged}TABLE IF NOT EXISTS {STAGING_TABLE} AS "
+        f"SELECT {', '.join(JOB_COLUMNS)} FROM jenkins_items WHERE 1 = 0"
+    )
+
+
+def clean_jobs_frame(df):
+    """
+    Apply the dashboard's null handling and types to jobs read from any backend.
+
+    Args:
+        df (DataFrame): Raw JOB_COLUMNS rows
+
+    Returns:
+        DataFrame: The cleaned frame
+    """
+    df["last_build_status"] = df["last_build_status"].fillna("Unknown")
+    # Convert boolean columns
+    df["is_disabled"] = df["is_disabled"].fillna(False).astype(bool)
+    df["is_test_job"] = df["is_test_job"].fillna(False).astype(bool)
+    # Fill NaN values for numeric columns
+    df["success_rate"] = df["success_rate"].astype(float).replace([float('inf'), float('-inf')], 0.0).fillna(0.0)
+    df["success_count"] = df["success_count"].fillna(0)
+    df["failure_count"] = df["failure_count"].fillna(0)
+    # Fill NaN values for duration columns
+    for col in DURATION_COLUMNS:
+        df[col] = df[col].fillna(0)
+    return df
+
+
+class StorageBackend(ABC):
+    """
+    Job store used by the dashboard.
+
+    Reading, the sync write transaction, ad-hoc queries and statistics are
+    implemented once here on top of a DB-API connection; subclasses must provide
+    the connection, schema, bulk load, snapshot diff and retention for their
+    engine (the abstract methods), or they cannot be instantiated.
+    """
+
+    # SQL dialect understood by src.job_query and src.aggregates
+    dialect = None
+    # Display name used in log messages
+    name = None
+    # Whether the engine has percentile_cont ... WITHIN GROUP for Analytics
+    supports_percentiles = False
+
+    @abstractmethod
+    def get_connection(self):
+        """Open a connection to the job store"""
+
+    @abstractmethod
+    def init_db(self):
+        """Create or migrate the schema"""
+
+    @abstractmethod
+    def _insert_jobs(self, conn, df, table):
+        """Bulk insert a batch of jobs (JOB_COLUMNS) into table inside the open write transaction"""
+
+    def _insert_rows(self, conn, df, table):
+        """Bulk insert the rows of df into table, its columns matching df's"""
+        if df.empty:
+            return
+        placeholder = PLACEHOLDERS[self.dialect]
+        # Plain Python values; NaN becomes NULL
+        rows = df.astype(object).where(df.notna(), None).itertuples(index=False, name=None)
+        self._cursor(conn).executemany(
+            f"INSERT INTO {table} ({', '.join(df.columns)}) VALUES ({', '.join([placeholder] * len(df.columns))})",
+            rows
+        )
+
+    @abstractmethod
+    def _record_snapshots(self, cursor, sync_timestamp):
+        """
+        Append a snapshot for every job whose tracked metrics changed since its latest snapshot.
+
+        Returns:
+            int: Number of snapshot rows written
+        """
+
+    @abstractmethod
+    def cleanup_old_data(self, days_to_keep=90):
+        """Remove job snapshots and sync statistics older than the retention window"""
+
+    def _cursor(self, conn):
+        """Cursor for running statements on conn"""
+        return conn.cursor()
+
+    def _begin_write(self, conn):
+        """Start the sync write transaction and return the cursor to run it on"""
+        return self._cursor(conn)
+
+    def _notify_sync(self, cursor, sync_run_id):
+        """Announce the new sync version to other app processes when the publish transaction commits"""
+
+    def _rollback(self, conn):
+        """Roll back the open write transaction, if any"""
+        conn.rollback()
+
+    @contextmanager
+    def _read_connection(self):
+        """Connection for read-only queries, closed afterwards unless the backend reuses it"""
+        conn = self.get_connection()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def read_query(self, query, params=None):
+        """Run a read-only query and return the result as a DataFrame"""
+        with self._read_connection() as conn:
+            return pd.read_sql_query(query, conn, params=params)
+
+    def _stream_cursor(self, conn):
+        """Cursor for iter_query; fetchmany() must not load the whole result at once"""
+        return self._cursor(conn)
+
+    def iter_query(self, query, params=None, chunk_size=10000):
+        """
+        Run a read-only query and yield its result in DataFrames of at most chunk_size rows.
+
+        Rows are fetched as the chunks are consumed, so memory is bounded by one
+        chunk. At least one (possibly empty) chunk is yielded.
+        """
+        with self._read_connection() as conn:
+            cursor = self._stream_cursor(conn)
+            try:
+                cursor.execute(query, list(params or []))
+                columns = None
+                while True:
+                    rows = cursor.fetchmany(chunk_size)
+                    if columns is None:
+                        # Server-side cursors describe the result once the first rows arrive
+                        columns = [column[0] for column in cursor.description]
+                    elif not rows:
+                        break
+                    yield pd.DataFrame.from_records(rows, columns=columns)
+                    if len(rows) < chunk_size:
+                        break
+            finally:
+                cursor.close()
+
+    def _fetch_value(self, query):
+        """Run a single-value query, returning None on failure"""
+        try:
+            with self._read_connection() as conn:
+                cursor = self._cursor(conn)
+                cursor.execute(query)
+                result = cursor.fetchone()
+                return result[0] if result else None
+        except Exception as e:
+            print(f"❌ Error querying {self.name}: {e}")
+            return None
+
+    def get_sync_version(self):
+        """
+        Get the id of the latest successful sync run, or None if no data is stored.
+
+        A single-row lookup on the sync_runs primary key, used as the cache version key.
+        """
+        version = self._fetch_value("SELECT id FROM sync_runs WHERE status = 'success' ORDER BY id DESC LIMIT 1")
+        return int(version) if version is not None else None
+
+    def get_last_sync_time(self):
+        """Get the timestamp of the last sync, or None if no data is stored"""
+        last_sync = self._fetch_value("SELECT MAX(timestamp) FROM jenkins_items")
+        return float(last_sync) if last_sync is not None else None
+
+    def get_cached_data(self):
+        """
+        Read and clean the stored jobs with the build duration percentiles of their sketches.
+
+        Returns:
+            tuple: (DataFrame, last sync timestamp), or (None, None) on failure
+        """
+        columns = ", ".join(f"j.{col}" for col in JOB_COLUMNS)
+        percentiles = ", ".join(f"s.{col}" for col in PERCENTILE_COLUMNS)
+        try:
+            # Per-job build duration percentiles come from the jobs' duration sketches
+            df = self.read_query(
+                f"SELECT {columns}, {percentiles} FROM jenkins_items j "
+                f"LEFT JOIN job_duration_sketches s ON s.url = j.url ORDER BY j.name"
+            )
+        except Exception as e:
+            print(f"❌ Error getting cached data from {self.name}: {e}")
+            return None, None
+        return clean_jobs_frame(df), self.get_last_sync_time()
+
+    def cache_data(self, df):
+        """Store a sync's jobs from a complete DataFrame (see cache_batches)"""
+        return self.cache_batches([df])
+
+    def cache_batches(self, batches, fetch_metrics=None):
+        """
+        Stream a sync's jobs into the staging table and publish them in one transaction.
+
+        Each batch's jobs and completed builds are bulk inserted into the
+        staging tables and committed as they arrive, so memory is bounded by
+        the batch size. Once the batches are exhausted, jenkins_items is
+        swapped for the staged jobs, the staged builds are folded into the
+        duration sketches, build history and flakiness, and snapshots,
+        aggregates, statistics and the sync_runs ledger entry are written in a
+        single transaction; readers see either the previous sync or the new one.
+        The sync holds the sync lease (src/sync_ledger.py) from clearing the
+        staging tables until it publishes, so a sync started while another one
+        is running, in this or another process, waits for it first.
+
+        Args:
+            batches (iterable): Lists of job records or DataFrames, e.g. from
+                src.jenkins_api.iter_jenkins_item_batches()
+            fetch_metrics (callable): Returns the crawl counters once the batches
+                are exhausted, e.g. src.jenkins_api.get_fetch_metrics
+
+        Returns:
+            int: Number of jobs published; nothing is published when the crawl
+            returned no jobs
+        """
+        run = new_sync_run()
+        batches = iter(batches)
+        holder = uuid.uuid4().hex
+        released = False
+        conn = self.get_connection()
+        try:
+            self._acquire_sync_lock(conn, holder)
+            run["started_at"] = time.time()
+            cursor = self._begin_write(conn)
+            # Leftovers of an interrupted sync
+            cursor.execute(f"DELETE FROM {STAGING_TABLE}")
+            cursor.execute(f"DELETE FROM {BUILD_STAGING_TABLE}")
+            conn.commit()
+            while True:
+                with timed_phase(run, "fetch"):
+                    batch = next(batches, None)
+                if batch is None:
+                    break
+                if len(batch) == 0:
+                    continue
+                with timed_phase(run, "write"):
+                    cursor = self._begin_write(conn)
+                    self._renew_sync_lock(cursor, holder)
+                    jobs = pd.DataFrame(batch)
+                    self._insert_jobs(conn, jobs, STAGING_TABLE)
+                    self._insert_rows(conn, staged_builds(jobs), BUILD_STAGING_TABLE)
+                    conn.commit()
+                run["jobs_seen"] += len(batch)
+            if fetch_metrics is not None:
+                add_fetch_metrics(run, fetch_metrics())
+            if run["jobs_seen"] == 0:
+                print(f"⚠️ No jobs received - keeping the data stored in {self.name}")
+                return 0
+
+            sync_timestamp = time.time()
+            cursor = self._begin_write(conn)
+            self._renew_sync_lock(cursor, holder)
+            cursor.execute(f"SELECT COUNT(*) FROM {STAGING_TABLE}")
+            staged = int(cursor.fetchone()[0])
+            if staged != run["jobs_seen"]:
+                raise RuntimeError(
+                    f"{staged} jobs staged but {run['jobs_seen']} crawled - refusing to publish an incomplete sync"
+                )
+            run["id"] = next_sync_run_id(cursor)
+            count_job_changes(cursor, STAGING_TABLE, run)
+            with timed_phase(run, "write"):
+                self._publish_staged_jobs(cursor, sync_timestamp, run["id"])
+                publish_staged_builds(cursor, self.dialect)
+            with timed_phase(run, "snapshot"):
+                snapshot_count = self._record_snapshots(cursor, sync_timestamp)
+            with timed_phase(run, "aggregate"):
+                refresh_aggregates(cursor, self.dialect)
+                record_sync_stats(cursor, self.dialect, sync_timestamp)
+            # Snapshots are written for new jobs and jobs whose tracked metrics changed
+            run["jobs_changed"] = max(snapshot_count - run["jobs_added"], 0)
+            record_sync_run(cursor, self.dialect, run, "success")
+            self._notify_sync(cursor, run["id"])
+            release_sync_lock(cursor, self.dialect, holder)
+            conn.commit()
+            released = True
+        except Exception as e:
+            self._rollback(conn)
+            print(f"❌ Error caching data to {self.name}: {e}")
+            if fetch_metrics is not None and run["request_count"] is None:
+                add_fetch_metrics(run, fetch_metrics())
+            self._record_failed_run(run, e)
+            raise
+        finally:
+            conn.close()
+            if not released:
+                self._release_sync_lock(holder)
+
+        print(
+            f"✅ Successfully cached {run['jobs_seen']} jobs to {self.name} (sync run {run['id']}: "
+            f"{run['jobs_added']} added, {run['jobs_changed']} changed, {run['jobs_deleted']} deleted)"
+        )
+
+        # Retention is best effort - a failed cleanup must not fail the sync
+        try:
+            self.cleanup_old_data(DashboardConfig.SNAPSHOT_RETENTION_DAYS)
+        except Exception as e:
+            print(f"⚠️ Snapshot retention cleanup failed: {e}")
+        return run["jobs_seen"]
+
+    def _acquire_sync_lock(self, conn, holder):
+        """Wait until holder holds the sync lease, polling while another sync runs"""
+        waiting = False
+        while True:
+            cursor = self._begin_write(conn)
+            acquired = claim_sync_lock(cursor, self.dialect, holder)
+            conn.commit()
+            if acquired:
+                return
+            if not waiting:
+                print("⏳ Another sync is running - waiting for it to publish")
+                waiting = True
+            time.sleep(SYNC_LOCK_POLL_SECONDS)
+
+    def _renew_sync_lock(self, cursor, holder):
+        """Extend holder's sync lease inside the open write transaction; fail if it was taken over"""
+        if not claim_sync_lock(cursor, self.dialect, holder):
+            raise RuntimeError(
+                "Sync lease taken over by another sync - a batch took longer than SYNC_LOCK_TIMEOUT_SECONDS"
+            )
+
+    def _release_sync_lock(self, holder):
+        """Release holder's sync lease after a sync that did not publish (best effort)"""
+        try:
+            conn = self.get_connection()
+            try:
+                cursor = self._begin_write(conn)
+                release_sync_lock(cursor, self.dialect, holder)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"⚠️ Could not release the sync lease; it expires on its own: {e}")
+
+    def _publish_staged_jobs(self, cursor, sync_timestamp, sync_run_id):
+        """Replace jenkins_items with the staged jobs inside the open write transaction"""
+        columns = ", ".join(JOB_COLUMNS)
+        placeholder = PLACEHOLDERS[self.dialect]
+        cursor.execute("DELETE FROM jenkins_items")
+        cursor.execute(
+            f"INSERT INTO jenkins_items ({columns}, timestamp, sync_run_id) "
+            f"SELECT {columns}, {placeholder}, {placeholder} FROM {STAGING_TABLE}",
+            (sync_timestamp, sync_run_id)
+        )
+        cursor.execute(f"DELETE FROM {STAGING_TABLE}")
+
+    def _record_failed_run(self, run, error):
+        """Record a rolled back sync in the ledger (best effort)"""
+        try:
+            conn = self.get_connection()
+            try:
+                cursor = self._begin_write(conn)
+                run["id"] = next_sync_run_id(cursor)
+                record_sync_run(cursor, self.dialect, run, "failed", error)
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"⚠️ Could not record the failed sync run: {e}")
+
+    def get_sync_runs(self, limit=50):
+        """
+        Get the sync ledger, newest run first.
+
+        Args:
+            limit (int): Maximum number of runs to return
+
+        Returns:
+            DataFrame: SYNC_RUN_COLUMNS plus duration_seconds, or None on failure
+        """
+        try:
+            df = self.read_query(
+                f"SELECT {', '.join(SYNC_RUN_COLUMNS)} FROM sync_runs ORDER BY id DESC LIMIT {int(limit)}"
+            )
+        except Exception as e:
+            print(f"❌ Error getting sync runs from {self.name}: {e}")
+            return None
+        # Columns never filled in (e.g. unmeasured crawls) come back as all-None objects
+        for col in SYNC_RUN_COLUMNS:
+            if col not in ("status", "error"):
+                df[col] = pd.to_numeric(df[col], errors="coerce")
+        df["duration_seconds"] = df["finished_at"] - df["started_at"]
+        for col in ["started_at", "finished_at"]:
+            df[col] = pd.to_datetime(df[col], unit="s", utc=True)
+        return df
+
+    def get_job_snapshots(self, url=None):
+        """Get per-sync snapshot history, optionally for a single job, oldest first"""
+        try:
+            query = f"SELECT url, name, folder, snapshot_time, {', '.join(SNAPSHOT_COLUMNS)} FROM job_snapshots"
+            params = None
+            if url:
+                query += f" WHERE url = {PLACEHOLDERS[self.dialect]}"
+                params = (url,)
+            query += " ORDER BY url, snapshot_time"
+            df = self.read_query(query, params)
+            # Embedded stores keep the sync's epoch seconds
+            if pd.api.types.is_numeric_dtype(df["snapshot_time"]):
+                df["snapshot_time"] = pd.to_datetime(df["snapshot_time"], unit="s", utc=True)
+            return df
+        except Exception as e:
+            print(f"❌ Error getting job snapshots from {self.name}: {e}")
+            return None
+
+    def get_duration_sketches(self):
+        """
+        Get the stored build duration sketches of the current jobs.
+
+        Returns:
+            DataFrame: url, folder, build_count and sketch (see src.duration_sketch),
+            or None on failure
+        """
+        try:
+            return self.read_query(
+                "SELECT s.url, j.folder, s.build_count, s.sketch FROM job_duration_sketches s "
+                "JOIN jenkins_items j ON j.url = s.url"
+            )
+        except Exception as e:
+            print(f"❌ Error getting duration sketches from {self.name}: {e}")
+            return None
+
+    def get_job_flakiness(self):
+        """
+        Get the flakiness of the current jobs, most flaky first.
+
+        Returns:
+            DataFrame: name, folder, last_build_status, url and the
+            src.flakiness.FLAKINESS_COLUMNS, or None on failure
+        """
+        try:
+            return self.read_query(
+                "SELECT j.name, j.folder, j.last_build_status, f.* FROM job_flakiness f "
+                "JOIN jenkins_items j ON j.url = f.url ORDER BY f.flip_rate DESC, f.build_count DESC"
+            )
+        except Exception as e:
+            print(f"❌ Error getting job flakiness from {self.name}: {e}")
+            return None
+
+    def get_database_stats(self):
+        """
+        Get the statistics recorded with the latest sync.
+
+        Returns:
+            dict: Job counters, last_sync and per-folder, per-status and per-owner
+            job counts (see src.aggregates), or None when unavailable
+        """
+        try:
+            with self._read_connection() as conn:
+                cursor = self._cursor(conn)
+                # Single-row lookup on the sync_stats primary key
+                cursor.execute("SELECT stats FROM sync_stats ORDER BY sync_time DESC LIMIT 1")
+                result = cursor.fetchone()
+                if result:
+                    return json.loads(result[0])
+                # Data synced before stats were recorded
+                return compute_sync_stats(cursor, self.dialect)
+        except Exception as e:
+            print(f"❌ Error getting database stats: {e}")
+            return None
+
+    def get_duration_statistics(self):
+        """
+        Compute the Analytics duration summary inside the database.
+
+        Returns:
+            dict: job_count, avg/median/max duration (minutes), total_build_time_hours
+            and duration_distribution (Series by bucket label), or None when the
+            engine cannot compute percentiles
+        """
+        if not self.supports_percentiles:
+            return None
+        row = self.read_query(build_duration_stats_query()).iloc[0]
+        return {
+            "job_count": int(row["job_count"]),
+            "avg_duration": row["avg_duration"],
+            "median_duration": row["median_duration"],
+            "max_duration": row["max_duration"],
+            "total_build_time_hours": row["total_build_time_hours"],
+            "duration_distribution": pd.Series(
+                [int(row[f"bucket_{index}"]) for index in range(len(DURATION_BUCKETS))],
+                index=[label for _, label in DURATION_BUCKETS]
+            ),
+        }
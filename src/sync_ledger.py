@@ -0,0 +1,189 @@
+import time
+from contextlib import contextmanager
+from src.config import DashboardConfig
+from src.job_query import PLACEHOLDERS
+
+# Ledger of Jenkins syncs: one sync_runs row per sync with its timing per phase,
+# what changed and what the Jenkins crawl cost. jenkins_items.sync_run_id links
+# every job to the run that wrote it, and the id of the latest successful run is
+# the dashboard's cache version key.
+
+SYNC_RUNS_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS sync_runs (
+        id INTEGER PRIMARY KEY,
+        status VARCHAR(20) NOT NULL,
+        started_at DOUBLE PRECISION NOT NULL,
+        finished_at DOUBLE PRECISION,
+        fetch_seconds DOUBLE PRECISION,
+        write_seconds DOUBLE PRECISION,
+        snapshot_seconds DOUBLE PRECISION,
+        aggregate_seconds DOUBLE PRECISION,
+        jobs_seen INTEGER,
+        jobs_added INTEGER,
+        jobs_changed INTEGER,
+        jobs_deleted INTEGER,
+        request_count INTEGER,
+        bytes_received BIGINT,
+        error_count INTEGER,
+        error TEXT
+    )
+"""
+
+# Lease serializing syncs across processes and replicas sharing the database. A
+# sync holds it from clearing the staging tables until its publish commits and
+# renews it with every batch, so two syncs never stage into the same tables; a
+# lease not renewed for SYNC_LOCK_TIMEOUT_SECONDS (a crashed sync) can be taken over.
+# The same row counts the sync run ids handed out (see next_sync_run_id); the
+# counter starts from the runs recorded before it existed.
+SYNC_LOCK_SCHEMA = [
+    """
+        CREATE TABLE IF NOT EXISTS sync_lock (
+            id INTEGER PRIMARY KEY,
+            holder TEXT,
+            expires_at DOUBLE PRECISION,
+            last_run_id INTEGER
+        )
+    """,
+    "INSERT INTO sync_lock (id) VALUES (1) ON CONFLICT (id) DO NOTHING",
+    "UPDATE sync_lock SET last_run_id = (SELECT COALESCE(MAX(id), 0) FROM sync_runs) WHERE id = 1 AND last_run_id IS NULL",
+]
+
+# Retention delete; the latest successful run is kept as it is the current version key
+SYNC_RUNS_RETENTION_DELETE = """
+    DELETE FROM sync_runs
+    WHERE started_at < {placeholder}
+      AND id < (SELECT MAX(id) FROM sync_runs WHERE status = 'success')
+"""
+
+# Timed phases of a sync, each stored as <phase>_seconds
+SYNC_PHASES = ["fetch", "write", "snapshot", "aggregate"]
+
+SYNC_RUN_COLUMNS = [
+    "id", "status", "started_at", "finished_at",
+    *[f"{phase}_seconds" for phase in SYNC_PHASES],
+    "jobs_seen", "jobs_added", "jobs_changed", "jobs_deleted",
+    "request_count", "bytes_received", "error_count", "error"
+]
+
+# Crawl counters reported by src.jenkins_api.get_fetch_metrics()
+FETCH_METRICS = ["request_count", "bytes_received", "error_count"]
+
+
+def new_sync_run():
+    """
+    Start the ledger entry of a sync.
+
+    Returns:
+        dict: Run fields (SYNC_RUN_COLUMNS) filled in by the sync as it progresses
+    """
+    run = {column: None for column in SYNC_RUN_COLUMNS}
+    run["started_at"] = time.time()
+    run["jobs_seen"] = 0
+    run["error_count"] = 0
+    return run
+
+
+def add_fetch_metrics(run, fetch_metrics):
+    """Copy the crawl counters (FETCH_METRICS) onto the run"""
+    run.update({key: fetch_metrics.get(key) for key in FETCH_METRICS})
+    run["error_count"] = run["error_count"] or 0
+
+
+@contextmanager
+def timed_phase(run, phase):
+    """Add the wall-clock seconds spent in a sync phase to the run's total for that phase"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        run[f"{phase}_seconds"] = (run[f"{phase}_seconds"] or 0) + time.perf_counter() - start
+
+
+def claim_sync_lock(cursor, dialect, holder):
+    """
+    Take or renew the sync lease for holder inside the open write transaction.
+
+    Returns:
+        bool: Whether holder holds the lease; False while another sync's lease is live
+    """
+    placeholder = PLACEHOLDERS[dialect]
+    now = time.time()
+    cursor.execute(
+        f"UPDATE sync_lock SET holder = {placeholder}, expires_at = {placeholder} "
+        f"WHERE id = 1 AND (holder IS NULL OR holder = {placeholder} OR expires_at < {placeholder})",
+        [holder, now + DashboardConfig.SYNC_LOCK_TIMEOUT_SECONDS, holder, now]
+    )
+    cursor.execute("SELECT holder FROM sync_lock WHERE id = 1")
+    row = cursor.fetchone()
+    return row is not None and row[0] == holder
+
+
+def release_sync_lock(cursor, dialect, holder):
+    """Release holder's sync lease, if it still holds it, inside the open write transaction"""
+    cursor.execute(
+        f"UPDATE sync_lock SET holder = NULL, expires_at = NULL WHERE id = 1 AND holder = {PLACEHOLDERS[dialect]}",
+        [holder]
+    )
+
+
+def next_sync_run_id(cursor):
+    """
+    Allocate the next run id inside the open write transaction.
+
+    The id comes from the counter row in sync_lock rather than MAX(id) + 1:
+    a concurrent transaction allocating an id waits on (or, under DuckDB,
+    conflicts with) the row update until this one ends, so two processes never
+    record runs, and cache versions, under the same id.
+    """
+    cursor.execute("UPDATE sync_lock SET last_run_id = last_run_id + 1 WHERE id = 1")
+    cursor.execute("SELECT last_run_id FROM sync_lock WHERE id = 1")
+    return int(cursor.fetchone()[0])
+
+
+def count_job_changes(cursor, staging_table, run):
+    """
+    Fill in the added and deleted job counts of a run by comparing the staged
+    jobs with the published ones, before the staged jobs are published.
+    """
+    cursor.execute(f"""
+        SELECT COUNT(DISTINCT s.url) FROM {staging_table} s
+        LEFT JOIN jenkins_items j ON j.url = s.url WHERE j.url IS NULL
+    """)
+    run["jobs_added"] = int(cursor.fetchone()[0])
+    cursor.execute(f"""
+        SELECT COUNT(DISTINCT j.url) FROM jenkins_items j
+        LEFT JOIN {staging_table} s ON s.url = j.url WHERE s.url IS NULL
+    """)
+    run["jobs_deleted"] = int(cursor.fetchone()[0])
+
+
+def record_sync_run(cursor, dialect, run, status, error=None):
+    """Insert the finished run into sync_runs"""
+    run["status"] = status
+    run["finished_at"] = time.time()
+    if error is not None:
+        run["error"] = str(error)[:1000]
+        run["error_count"] = (run["error_count"] or 0) + 1
+    placeholders = ", ".join([PLACEHOLDERS[dialect]] * len(SYNC_RUN_COLUMNS))
+    cursor.execute(
+        f"INSERT INTO sync_runs ({', '.join(SYNC_RUN_COLUMNS)}) VALUES ({placeholders})",
+        [run[column] for column in SYNC_RUN_COLUMNS]
+    )
+
+
+def backfill_sync_run(cursor, dialect):
+    """Record the data synced before the ledger existed as run 1 so it keeps a version key"""
+    cursor.execute("SELECT 1 FROM sync_runs LIMIT 1")
+    if cursor.fetchone() is not None:
+        return
+    cursor.execute("SELECT MAX(timestamp), COUNT(*) FROM jenkins_items")
+    last_sync, job_count = cursor.fetchone()
+    if not job_count:
+        return
+    placeholder = PLACEHOLDERS[dialect]
+    cursor.execute(
+        f"INSERT INTO sync_runs (id, status, started_at, finished_at, jobs_seen, error_count) "
+        f"VALUES (1, 'success', {placeholder}, {placeholder}, {placeholder}, 0)",
+        [float(last_sync or time.time())] * 2 + [int(job_count)]
+    )
+    cursor.execute("UPDATE jenkins_items SET sync_run_id = 1")
@@ -1,9 +1,50 @@
+import math
+import os
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
 import pandas as pd
 from src.config import DashboardConfig
+from src.data_manager import (
+    query_jobs_page, get_filtered_overview, get_dashboard_aggregates, get_sync_runs,
+    get_sync_version, sync_listener_active, get_filter_engine, get_analytics_bundle, start_export, get_export,
+    get_job_flakiness
+)
+from src.analytics_bundle import compute_analytics_bundle
+from src.exports import EXPORT_FORMATS
+from src.folder_tree import ROOT, ROOT_LABEL, subtree, children
+from src.job_query import SORT_EXPRESSIONS, has_active_filters
+from src.filter_engine import FilterEngine
+from src.charts import scatter_mode, build_scatter_figure, cap_bars
+from src.profiler import instrument
+
+# Page sizes offered by the Overview jobs tables; larger pages stay cheap because
+# only the selected page is sliced and st.dataframe draws just the visible rows
+PAGE_SIZE_OPTIONS = [25, 50, 100, 200, 500, 1000]
+
+# Rows visible at once in the jobs table before it scrolls
+JOBS_TABLE_VISIBLE_ROWS = 20
+
+# Display names of the Overview sort options (see SORT_EXPRESSIONS)
+SORT_LABELS = {
+    "relevance": "Relevance",
+    "name": "Name",
+    "folder": "Folder",
+    "last_build_status": "Status",
+    "success_rate": "Success Rate",
+    "days_since_last_build": "Days Since Last Build",
+    "total_builds": "Total Builds",
+}
+
+# Jobs listed in the per-job duration percentile table (slowest p99 first)
+PERCENTILE_TABLE_ROWS = 100
+
+# Folder levels drawn below the focused folder in the hierarchy treemap
+FOLDER_TREEMAP_LEVELS = 3
+
+# Folder hierarchy treemap size options: label -> folder tree column
+FOLDER_TREE_SIZES = {"Jobs": "job_count", "Build minutes": "build_minutes"}
 
 # Custom CSS for modern styling
 def load_custom_css():
@@ -313,16 +354,22 @@ def render_ui(df):
     </div>
     """, unsafe_allow_html=True)
     
+    # Syncs published by other replicas arrive as notifications; offer them to open sessions
+    if sync_listener_active():
+        render_new_data_notice(get_sync_version())
+    
     # Create tab layout with sync button
     tab_col, sync_col = st.columns([0.95, 0.05])
     
+    main_views = {
+        "📊 Overview": render_dashboard_tab,
+        "🧹 Cleanup Insights": render_cleanup_tab,
+        "📈 Analytics": render_analytics_tab,
+    }
+    
     with tab_col:
-        # Use tabs for main navigation with enhanced styling
-        main_tab1, main_tab2, main_tab3 = st.tabs([
-            "📊 Overview", 
-            "🧹 Cleanup Insights", 
-            "📈 Analytics"
-        ])
+        # Main navigation; only the selected view is rendered
+        selected_view = render_view_selector(list(main_views), key="main_view")
     
     with sync_col:
         # Data sync button - small and subtle
@@ -365,18 +412,86 @@ def render_ui(df):
             st.session_state.show_sync_modal = False
             st.rerun()
         
+        render_sync_history()
+        
         st.markdown("---")
     
-    with main_tab1:
-        render_dashboard_tab(df)
+    main_views[selected_view](df)
+
+
+def render_view_selector(labels, key):
+    """
+    Tab-style navigation returning the selected label.
+    
+    Unlike st.tabs, which runs the body of every tab on each rerun, callers render
+    only the selected view, so an interaction costs what is on screen.
+    
+    Args:
+        labels (list): View labels, the first one selected initially
+        key (str): Widget key, unique per selector
+        
+    Returns:
+        str: The selected label
+    """
+    last_key = f"{key}_last"
+    # Clicking the active segment deselects it; keep showing the last view
+    if st.session_state.get(key) is None:
+        st.session_state[key] = st.session_state.get(last_key, labels[0])
+    selected = st.segmented_control("View", labels, key=key, label_visibility="collapsed")
+    st.session_state[last_key] = selected
+    return selected
+
+
+@st.fragment(run_every=DashboardConfig.NEW_DATA_CHECK_SECONDS)
+def render_new_data_notice(rendered_version):
+    """Offer a reload once a newer sync is published (checked in memory, without database queries)"""
+    if not sync_listener_active():
+        return
+    latest_version = get_sync_version()
+    if latest_version is None or rendered_version is None or latest_version <= rendered_version:
+        return
     
-    with main_tab2:
-        render_cleanup_tab(df)
+    notice_col, button_col = st.columns([0.8, 0.2])
+    with notice_col:
+        st.info("🆕 New Jenkins data is available.")
+    with button_col:
+        if st.button("🔄 Load New Data", key="load_new_data", use_container_width=True):
+            st.rerun(scope="app")
+
+
+def render_sync_history():
+    """Render the recent runs of the sync ledger with their timing and Jenkins crawl cost"""
+    runs = get_sync_runs(limit=20)
+    if runs is None or runs.empty:
+        return
     
-    with main_tab3:
-        render_analytics_tab(df)
+    with st.expander("📜 Sync History", expanded=False):
+        history = pd.DataFrame({
+            "Run": runs["id"],
+            "Status": runs["status"],
+            "Started": runs["started_at"].dt.tz_convert(DashboardConfig.TIMEZONE).dt.strftime(DashboardConfig.TIMEZONE_DISPLAY_FORMAT),
+            "Duration (s)": runs["duration_seconds"].round(1),
+            "Fetch (s)": runs["fetch_seconds"].round(1),
+            "Write (s)": runs["write_seconds"].round(2),
+            "Snapshots (s)": runs["snapshot_seconds"].round(2),
+            "Aggregates (s)": runs["aggregate_seconds"].round(2),
+            "Jobs": runs["jobs_seen"],
+            "Added": runs["jobs_added"],
+            "Changed": runs["jobs_changed"],
+            "Deleted": runs["jobs_deleted"],
+            "Requests": runs["request_count"],
+            "MB Received": (runs["bytes_received"] / 1024 / 1024).round(2),
+            "Errors": runs["error_count"],
+        })
+        st.dataframe(history, use_container_width=True, hide_index=True)
+        
+        failed = runs[runs["status"] != "success"]
+        if not failed.empty:
+            latest = failed.iloc[0]
+            st.error(f"❌ Sync run {latest['id']} failed: {latest['error']}")
 
 
+@st.fragment
 def render_dashboard_tab(df):
     """Render the main dashboard with modern styling and enhanced visualizations"""
     
@@ -435,69 +550,69 @@ def render_dashboard_tab(df):
         with adv_col5:
             ownership_status_filter = st.selectbox("Filter by Ownership", ["All", "complete", "attention_required", "unassigned"])
     
-    # Apply filters
-    filtered_df = apply_filters(df, search_term, name_filter, folder_filter, description_filter, tag_filter, 
-                               folder_filter_multiselect, status_filter_multiselect, [], ownership_status_filter)
+    filters = {
+        "search_term": search_term,
+        "name_filter": name_filter,
+        "folder_filter": folder_filter,
+        "description_filter": description_filter,
+        "tag_filter": tag_filter,
+        "folders": folder_filter_multiselect,
+        "statuses": status_filter_multiselect,
+        "ownership_status": ownership_status_filter,
+    }
     
-    # Enhanced visualizations with modern styling (showing filtered data)
-    render_enhanced_visualizations(filtered_df, len(filtered_df), total_items)
+    # The unfiltered view reads the aggregates precomputed at sync time
+    aggregates = None if has_active_filters(filters) else get_dashboard_aggregates()
     
-    # Enhanced data display with integrated pagination
-    render_enhanced_data_table(filtered_df, len(filtered_df))
-
-
-def apply_filters(df, search_term, name_filter, folder_filter, description_filter, tag_filter, 
-                 folder_filter_multiselect, status_filter_multiselect, type_filter, ownership_status_filter):
-    """Apply all filters to the dataframe"""
-    filtered_df = df.copy()
-    
-    # Quick search across all fields
-    if search_term:
-        search_mask = (
-            filtered_df["name"].str.contains(search_term, case=False, na=False) |
-            filtered_df["folder"].str.contains(search_term, case=False, na=False) |
-            filtered_df["last_build_status"].str.contains(search_term, case=False, na=False) |
-            filtered_df["type"].str.contains(search_term, case=False, na=False) |
-            filtered_df["description"].str.contains(search_term, case=False, na=False) |
-            filtered_df["other_tag"].str.contains(search_term, case=False, na=False)
-        )
-        
-        # Add last_editor to search if column exists
-        if "last_editor" in filtered_df.columns:
-            search_mask = search_mask | filtered_df["last_editor"].str.contains(search_term, case=False, na=False)
-        
-        # Add last_user to search if column exists
-        if "last_user" in filtered_df.columns:
-            search_mask = search_mask | filtered_df["last_user"].str.contains(search_term, case=False, na=False)
-        
-        filtered_df = filtered_df[search_mask]
+    if DashboardConfig.QUERY_MODE == "database":
+        # Push filtering, sorting and paging down to the database
+        overview_stats = aggregates["overview"] if aggregates else get_filtered_overview(filters)
+        render_enhanced_visualizations(overview_stats, total_items)
+        render_query_data_table(filters, overview_stats["job_count"], unique_statuses)
+        render_export_panel(filters)
+        return
     
-    # Advanced filters
-    if name_filter:
-        filtered_df = filtered_df[filtered_df["name"].str.contains(name_filter, case=False, na=False)]
-    if folder_filter:
-        filtered_df = filtered_df[filtered_df["folder"].str.contains(folder_filter, case=False, na=False)]
-    if description_filter:
-        filtered_df = filtered_df[filtered_df["description"].str.contains(description_filter, case=False, na=False)]
-    if tag_filter:
-        filtered_df = filtered_df[filtered_df["other_tag"].str.contains(tag_filter, case=False, na=False)]
+    # Memoized filters over the search text and indexes built once per sync
+    filter_engine = get_filter_engine()
+    if filter_engine is None or filter_engine.df is not df:
+        # A newer sync landed during this run; filter the frame being rendered
+        filter_engine = FilterEngine(df, cache_size=0)
+    
+    if aggregates:
+        overview_stats = aggregates["overview"]
+    else:
+        overview_stats = compute_overview_stats(filter_engine.apply(filters, columns=OVERVIEW_STATS_COLUMNS))
     
-    # Multi-select filters (only apply if selections are made)
-    if folder_filter_multiselect:
-        filtered_df = filtered_df[filtered_df["folder"].isin(folder_filter_multiselect)]
-    if status_filter_multiselect:
-        filtered_df = filtered_df[filtered_df["last_build_status"].isin(status_filter_multiselect)]
+    # Enhanced visualizations with modern styling (showing filtered data)
+    render_enhanced_visualizations(overview_stats, total_items)
     
-    # Ownership status filter
-    if ownership_status_filter and ownership_status_filter != "All":
-        filtered_df = filtered_df[filtered_df["ownership_status"] == ownership_status_filter]
+    # Enhanced data display with integrated pagination
+    render_enhanced_data_table(filter_engine, filters, overview_stats["job_count"], unique_statuses)
     
-    return filtered_df
+    render_export_panel(filters)
+
 
+# Columns read by compute_overview_stats
+OVERVIEW_STATS_COLUMNS = ["last_build_status", "days_since_last_build"]
 
-def render_enhanced_visualizations(df, total_filtered_items, total_items):
+
+def compute_overview_stats(df):
+    """Compute the Overview KPI inputs (see get_filtered_overview) from a filtered DataFrame"""
+    inactive_count = len(df[df["days_since_last_build"].notna() & (df["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS)]) if "days_since_last_build" in df.columns else 0
+    return {
+        "job_count": len(df),
+        # Categorical value_counts also lists statuses absent from the filtered jobs
+        "status_counts": df["last_build_status"].value_counts().loc[lambda counts: counts > 0],
+        "inactive_count": inactive_count,
+    }
+
+
+def render_enhanced_visualizations(overview_stats, total_items):
     """Render enhanced visualizations with modern styling and better charts"""
-    if not df.empty:
+    total_filtered_items = overview_stats["job_count"]
+    status_counts = overview_stats["status_counts"]
+    
+    if total_filtered_items > 0:
         # Simple header without card
         st.markdown("""
         <div class="section-header">
@@ -530,8 +645,8 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
         """, unsafe_allow_html=True)
         
         with col1:
-            success_count = len(df[df["last_build_status"] == "SUCCESS"])
-            success_rate = (success_count / len(df)) * 100 if len(df) > 0 else 0
+            success_count = int(status_counts.get("SUCCESS", 0))
+            success_rate = (success_count / total_filtered_items) * 100 if total_filtered_items > 0 else 0
             st.metric(
                 "✅ Success Rate", 
                 f"{success_rate:.1f}%", 
@@ -540,8 +655,8 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
             )
         
         with col2:
-            failure_count = len(df[df["last_build_status"] == "FAILURE"])
-            failure_rate = (failure_count / len(df)) * 100 if len(df) > 0 else 0
+            failure_count = int(status_counts.get("FAILURE", 0))
+            failure_rate = (failure_count / total_filtered_items) * 100 if total_filtered_items > 0 else 0
             st.metric(
                 "❌ Failure Rate", 
                 f"{failure_rate:.1f}%", 
@@ -550,10 +665,9 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
             )
         
         with col3:
-            inactive_count = len(df[df["days_since_last_build"].notna() & (df["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS)]) if "days_since_last_build" in df.columns else 0
             st.metric(
                 "⏰ Inactive Jobs", 
-                inactive_count, 
+                overview_stats["inactive_count"], 
                 f">{DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS} days",
                 delta_color="normal"
             )
@@ -586,8 +700,6 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
         </div>
         """, unsafe_allow_html=True)
         
-        status_counts = df["last_build_status"].value_counts()
-        
         # Create enhanced pie chart with custom colors
         fig = go.Figure(data=[go.Pie(
             labels=status_counts.index,
@@ -623,8 +735,7 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
         """, unsafe_allow_html=True)
         
         # Calculate build status distribution with percentages
-        status_counts = df["last_build_status"].value_counts()
-        total_jobs = len(df)
+        total_jobs = total_filtered_items
         status_percentages = (status_counts / total_jobs * 100).round(1)
         
         # Create a more informative status chart
@@ -653,179 +764,316 @@ def render_enhanced_visualizations(df, total_filtered_items, total_items):
         st.info("No data matches the current filters.")
 
 
-def render_enhanced_data_table(df, total_filtered_items):
-    """Render enhanced data table with modern styling and integrated pagination"""
-    # Enhanced pagination controls with modern styling
-    total_pages = (total_filtered_items + DashboardConfig.ITEMS_PER_PAGE_DEFAULT - 1) // DashboardConfig.ITEMS_PER_PAGE_DEFAULT
+def render_enhanced_data_table(filter_engine, filters, total_filtered_items, status_options):
+    """
+    Render the in-memory jobs table one sorted page at a time.
+    
+    Page, page size and sort order are kept in the session; only the visible
+    page is sliced from the shared frame and sent to the browser, so browsing a
+    large result costs the same as browsing a small one.
+    """
+    if total_filtered_items == 0:
+        st.warning("No jobs found matching the current filters.")
+        return
     
-    if total_pages > 1:
-        current_page = 1
-    else:
-        current_page = 1
+    st.markdown("""
+    <div class="section-header">
+        <h2>📊 Jobs Data</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns([0.2, 0.2, 0.2, 0.4])
+    with col1:
+        items_per_page = st.selectbox("📄 Items per page", PAGE_SIZE_OPTIONS, key="jobs_page_size",
+                                      index=default_page_size_index())
+    with col2:
+        sort_column = st.selectbox("↕️ Sort by", list(SORT_EXPRESSIONS), key="jobs_sort_column",
+                                   format_func=lambda col: SORT_LABELS[col])
+    with col3:
+        descending = st.selectbox("Order", ["Ascending", "Descending"], key="jobs_sort_order") == "Descending"
     
-    start_idx = (current_page - 1) * DashboardConfig.ITEMS_PER_PAGE_DEFAULT
-    end_idx = start_idx + DashboardConfig.ITEMS_PER_PAGE_DEFAULT
-    paginated_df = df.iloc[start_idx:end_idx]
+    total_pages = (total_filtered_items + items_per_page - 1) // items_per_page
+    # A new result or ordering starts again from the first page
+    page_signature = (FilterEngine.filter_key(filters), sort_column, descending, items_per_page)
+    if st.session_state.get("jobs_page_signature") != page_signature:
+        st.session_state.jobs_page_signature = page_signature
+        st.session_state.jobs_page = 1
+    st.session_state.jobs_page = min(max(st.session_state.get("jobs_page", 1), 1), total_pages)
     
-    # Summary info with modern styling
-    start_item = (current_page - 1) * DashboardConfig.ITEMS_PER_PAGE_DEFAULT + 1
-    end_item = min(current_page * DashboardConfig.ITEMS_PER_PAGE_DEFAULT, total_filtered_items)
+    def turn_page(step):
+        st.session_state.jobs_page = min(max(st.session_state.jobs_page + step, 1), total_pages)
     
-    if not paginated_df.empty:
-        # Enhanced dataframe with modern styling
-        st.markdown("""
-        <div class="section-header">
-            <h2>📊 Jobs Data</h2>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # Items per page and page controls side by side
-        col1, col2, col3, col4 = st.columns([0.2, 0.15, 0.1, 0.55])
+    with col4:
+        prev_col, page_col, next_col = st.columns([0.3, 0.4, 0.3])
+        with prev_col:
+            st.button("◀ Previous", key="jobs_page_prev", disabled=st.session_state.jobs_page <= 1,
+                      use_container_width=True, on_click=turn_page, args=(-1,))
+        with page_col:
+            current_page = st.number_input(f"Page (of {total_pages})", min_value=1, max_value=total_pages,
+                                           step=1, key="jobs_page")
+        with next_col:
+            st.button("Next ▶", key="jobs_page_next", disabled=st.session_state.jobs_page >= total_pages,
+                      use_container_width=True, on_click=turn_page, args=(1,))
+    
+    start_idx = (current_page - 1) * items_per_page
+    paginated_df = filter_engine.page(filters, sort_column, descending, offset=start_idx, limit=items_per_page)
+    start_item = start_idx + 1
+    end_item = start_idx + len(paginated_df)
+    
+    st.info(f"Showing {start_item}-{end_item} of {total_filtered_items} jobs")
+    
+    # Select only the columns we want to display (Overview tab - core fields only)
+    display_columns = [
+        "name", "folder", "owner_name", "owner_email", "description", "last_build_status", "success_rate",
+        "days_since_last_build", "total_builds", "last_editor", "last_user", "url"
+    ]
+    
+    # Filter dataframe to only show selected columns (handle missing columns gracefully)
+    available_display_columns = [col for col in display_columns if col in paginated_df.columns]
+    display_df = paginated_df[available_display_columns].copy()
+    
+    # Add missing columns with default values if they don't exist
+    missing_columns = []
+    for col in display_columns:
+        if col not in display_df.columns:
+            if col == "last_editor":
+                display_df[col] = None  # Will show as empty cells
+                missing_columns.append("Last Editor")
+            elif col == "last_user":
+                display_df[col] = None  # Will show as empty cells
+                missing_columns.append("Last User")
+            else:
+                display_df[col] = None
+    
+    # Show information message if new columns were missing
+    if missing_columns:
+        if len(missing_columns) == 1:
+            feature_name = missing_columns[0]
+            if feature_name == "Last Editor":
+                st.info("💡 **New Feature Available**: The 'Last Editor' column is now available! Click the '🔄' sync button above to refresh data from Jenkins and see who last modified each job.")
+            elif feature_name == "Last User":
+                st.info("💡 **New Feature Available**: The 'Last User' column is now available! Click the '🔄' sync button above to refresh data from Jenkins and see who started each job's last build.")
+        else:
+            features = " and ".join(missing_columns)
+            st.info(f"💡 **New Features Available**: The '{features}' columns are now available! Click the '🔄' sync button above to refresh data from Jenkins and see the latest user information.")
+    
+    # st.dataframe is a virtualized grid: only the rows scrolled into view are drawn
+    st.dataframe(
+        display_df,
+        column_config=get_jobs_column_config(status_options),
+        use_container_width=True,
+        hide_index=True,
+        height=min(len(display_df), JOBS_TABLE_VISIBLE_ROWS) * 35 + 38
+    )
+
+
+def default_page_size_index():
+    """Index of ITEMS_PER_PAGE_DEFAULT in PAGE_SIZE_OPTIONS (50 rows if it is not offered)"""
+    if DashboardConfig.ITEMS_PER_PAGE_DEFAULT in PAGE_SIZE_OPTIONS:
+        return PAGE_SIZE_OPTIONS.index(DashboardConfig.ITEMS_PER_PAGE_DEFAULT)
+    return PAGE_SIZE_OPTIONS.index(50)
+
+
+def get_jobs_column_config(status_options):
+    """Column configuration for the Overview jobs table"""
+    return {
+        "url": st.column_config.LinkColumn("🔗 Job URL"),
+        "owner_name": st.column_config.TextColumn(
+            "👤 Owner",
+            help="Pipeline owner name",
+            max_chars=50
+        ),
+        "owner_email": st.column_config.TextColumn(
+            "📧 Email",
+            help="Pipeline owner email",
+            max_chars=50
+        ),
+        "description": st.column_config.TextColumn(
+            "📝 Description",
+            help="Job description and purpose",
+            max_chars=100
+        ),
+        "last_build_status": st.column_config.SelectboxColumn(
+            "🎯 Status",
+            options=status_options,
+            required=True
+        ),
+        "success_rate": st.column_config.NumberColumn(
+            "📊 Success Rate",
+            format="%.1f%%",
+            help="Percentage of successful builds",
+            min_value=0,
+            max_value=100
+        ),
+        "days_since_last_build": st.column_config.NumberColumn(
+            "📅 Days Since Last Build",
+            format="%d days",
+            help="Number of days since the last build"
+        ),
+        "total_builds": st.column_config.NumberColumn(
+            "🔢 Total Builds",
+            format="%d",
+            help="Total number of builds for this job"
+        ),
+        "last_editor": st.column_config.TextColumn(
+            "👨‍💻 Last Editor",
+            help="User who last modified the job configuration",
+            max_chars=50
+        ),
+        "last_user": st.column_config.TextColumn(
+            "🚀 Last User",
+            help="User who started/triggered the last build",
+            max_chars=50
+        ),
+    }
+
+
+def render_export_panel(filters):
+    """Start a server-side export of the filtered jobs and show its download links"""
+    with st.expander("📥 Export Filtered Jobs", expanded=False):
+        col1, col2, col3 = st.columns([1, 1, 1])
         with col1:
-            items_per_page = st.selectbox("📄 Items per page", [25, 50, 100, 200], 
-                                        index=[25, 50, 100, 200].index(DashboardConfig.ITEMS_PER_PAGE_DEFAULT))
+            export_format = st.selectbox(
+                "Format", list(EXPORT_FORMATS), format_func=lambda key: EXPORT_FORMATS[key][0], key="export_format"
+            )
+        with col2:
+            include_history = st.checkbox(
+                "Include build history", key="export_history",
+                help="Also export the per-sync snapshots of the matching jobs"
+            )
+        with col3:
+            if st.button("📥 Start Export", key="export_start", use_container_width=True):
+                # Streams from the database in a background thread; this session keeps working
+                st.session_state.export_id = start_export(filters, export_format, include_history)
         
-        # Page changing controls (only show if multiple pages)
-        if total_pages > 1:
-            with col2:
-                current_page = st.selectbox(f"📄 Page", range(1, total_pages + 1), index=0)
-            with col3:
-                st.write(f"of {total_pages}")
-            with col4:
-                st.write("")  # Empty space for balance
+        export_id = st.session_state.get("export_id")
+        job = get_export(export_id) if export_id else None
+        if job is None:
+            return
+        if job.status == "running":
+            render_export_progress(export_id)
+        elif job.status == "failed":
+            st.error(f"❌ Export failed: {job.error}")
         else:
-            with col2:
-                st.write("")  # Empty space when no pagination needed
-            with col3:
-                st.write("")
-            with col4:
-                st.write("")
-        
-        # Recalculate pagination after page selection
-        start_idx = (current_page - 1) * items_per_page
-        end_idx = start_idx + items_per_page
-        paginated_df = df.iloc[start_idx:end_idx]
-        start_item = (current_page - 1) * items_per_page + 1
-        end_item = min(current_page * items_per_page, total_filtered_items)
-        
-        st.info(f"Showing {start_item}-{end_item} of {total_filtered_items} jobs")
-        
-        # Select only the columns we want to display (Overview tab - core fields only)
-        display_columns = [
-            "name", "folder", "owner_name", "owner_email", "description", "last_build_status", "success_rate",
-            "days_since_last_build", "total_builds", "last_editor", "last_user", "url"
-        ]
-        
-        # Filter dataframe to only show selected columns (handle missing columns gracefully)
-        available_display_columns = [col for col in display_columns if col in paginated_df.columns]
-        display_df = paginated_df[available_display_columns].copy()
-        
-        # Add missing columns with default values if they don't exist
-        missing_columns = []
-        for col in display_columns:
-            if col not in display_df.columns:
-                if col == "last_editor":
-                    display_df[col] = None  # Will show as empty cells
-                    missing_columns.append("Last Editor")
-                elif col == "last_user":
-                    display_df[col] = None  # Will show as empty cells
-                    missing_columns.append("Last User")
-                else:
-                    display_df[col] = None
-        
-        # Show information message if new columns were missing
-        if missing_columns:
-            if len(missing_columns) == 1:
-                feature_name = missing_columns[0]
-                if feature_name == "Last Editor":
-                    st.info("💡 **New Feature Available**: The 'Last Editor' column is now available! Click the '🔄' sync button above to refresh data from Jenkins and see who last modified each job.")
-                elif feature_name == "Last User":
-                    st.info("💡 **New Feature Available**: The 'Last User' column is now available! Click the '🔄' sync button above to refresh data from Jenkins and see who started each job's last build.")
-            else:
-                features = " and ".join(missing_columns)
-                st.info(f"💡 **New Features Available**: The '{features}' columns are now available! Click the '🔄' sync button above to refresh data from Jenkins and see the latest user information.")
-        
-        # Enhanced dataframe with cleaner columns and modern styling
-        st.dataframe(
-            display_df,
-            column_config={
-                "url": st.column_config.LinkColumn("🔗 Job URL"),
-                "owner_name": st.column_config.TextColumn(
-                    "👤 Owner",
-                    help="Pipeline owner name",
-                    max_chars=50
-                ),
-                "owner_email": st.column_config.TextColumn(
-                    "📧 Email",
-                    help="Pipeline owner email",
-                    max_chars=50
-                ),
-                "description": st.column_config.TextColumn(
-                    "📝 Description",
-                    help="Job description and purpose",
-                    max_chars=100
-                ),
-                "last_build_status": st.column_config.SelectboxColumn(
-                    "🎯 Status",
-                    options=sorted(df["last_build_status"].unique()),
-                    required=True
-                ),
-                "success_rate": st.column_config.NumberColumn(
-                    "📊 Success Rate",
-                    format="%.1f%%",
-                    help="Percentage of successful builds",
-                    min_value=0,
-                    max_value=100
-                ),
-                "days_since_last_build": st.column_config.NumberColumn(
-                    "📅 Days Since Last Build",
-                    format="%d days",
-                    help="Number of days since the last build"
-                ),
-                "total_builds": st.column_config.NumberColumn(
-                    "🔢 Total Builds",
-                    format="%d",
-                    help="Total number of builds for this job"
-                ),
-                "last_editor": st.column_config.TextColumn(
-                    "👨‍💻 Last Editor",
-                    help="User who last modified the job configuration",
-                    max_chars=50
-                ),
-                "last_user": st.column_config.TextColumn(
-                    "🚀 Last User",
-                    help="User who started/triggered the last build",
-                    max_chars=50
-                ),
-            },
-            use_container_width=True,
-            hide_index=True
+            st.success(f"✅ Exported {job.rows:,} rows in {job.finished_at - job.started_at:.1f}s")
+            for label, path, rows in job.files:
+                render_export_download(label, path, rows)
+
+
+@st.fragment(run_every=1)
+def render_export_progress(export_id):
+    """Poll a running export; the full panel reruns once it has finished"""
+    job = get_export(export_id)
+    if job is None or job.status != "running":
+        st.rerun()
+    st.info(f"⏳ Exporting... {job.rows:,} rows written")
+
+
+def render_export_download(label, path, rows):
+    """Link to an export file, served from disk by Streamlit's static file serving when possible"""
+    file_name = os.path.basename(path)
+    relative = os.path.relpath(os.path.abspath(path), os.path.abspath("static"))
+    if st.get_option("server.enableStaticServing") and not relative.startswith(".."):
+        st.markdown(f"⬇️ [{label} ({rows:,} rows)](app/static/{relative.replace(os.sep, '/')})")
+        return
+    # Without static serving the file is sent through the app process and held in memory
+    with open(path, "rb") as f:
+        st.download_button(
+            f"⬇️ {label} ({rows:,} rows)", f, file_name=file_name, key=f"export_download_{file_name}",
+            use_container_width=True
         )
-    else:
-        st.warning("No jobs found matching the current filters.")
 
 
-def render_cleanup_tab(df):
-    """Render the cleanup insights tab with modern styling and enhanced organization"""
-    # Create sub-tabs with modern styling
-    cleanup_tab1, cleanup_tab2, cleanup_tab3, cleanup_tab4 = st.tabs([
-        "📊 Summary", 
-        "🧪 Test Jobs", 
-        "⏰ Inactive Jobs", 
-        "🚫 Disabled Jobs"
-    ])
+def render_query_data_table(filters, total_filtered_items, status_options):
+    """Render the jobs table one keyset-paginated page at a time straight from the database"""
+    if total_filtered_items == 0:
+        st.warning("No jobs found matching the current filters.")
+        return
     
-    with cleanup_tab1:
-        render_cleanup_summary(df)
+    st.markdown("""
+    <div class="section-header">
+        <h2>📊 Jobs Data</h2>
+    </div>
+    """, unsafe_allow_html=True)
     
-    with cleanup_tab2:
-        render_test_jobs_section(df)
+    col1, col2, col3, col4 = st.columns([0.2, 0.2, 0.2, 0.4])
+    with col1:
+        items_per_page = st.selectbox("📄 Items per page", PAGE_SIZE_OPTIONS, index=default_page_size_index())
+    with col2:
+        # Quick Search matches are ranked by the search index
+        sort_options = (["relevance"] if filters["search_term"] else []) + list(SORT_EXPRESSIONS)
+        sort_column = st.selectbox("↕️ Sort by", sort_options, format_func=lambda col: SORT_LABELS[col])
+    with col3:
+        descending = st.selectbox("Order", ["Ascending", "Descending"]) == "Descending"
+    
+    # Page cursors are only valid for the query they were taken from
+    query_signature = (repr(sorted(filters.items())), sort_column, descending, items_per_page)
+    if st.session_state.get("query_page_signature") != query_signature:
+        st.session_state.query_page_signature = query_signature
+        st.session_state.query_page_cursors = [None]
+    cursors = st.session_state.query_page_cursors
     
-    with cleanup_tab3:
-        render_inactive_jobs_section(df)
+    page_df = query_jobs_page(filters, sort_column, descending, items_per_page, after=cursors[-1])
+    
+    total_pages = (total_filtered_items + items_per_page - 1) // items_per_page
+    current_page = len(cursors)
+    start_item = (current_page - 1) * items_per_page + 1
+    end_item = start_item + len(page_df) - 1
+    
+    with col4:
+        st.write(f"Page {current_page} of {total_pages}")
+        prev_col, next_col = st.columns(2)
+        with prev_col:
+            st.button("◀ Previous", disabled=current_page == 1, use_container_width=True,
+                      on_click=lambda: cursors.pop())
+        with next_col:
+            if not page_df.empty:
+                last_row = page_df.iloc[-1]
+                # Convert numpy scalars so every DB driver can bind the cursor
+                next_cursor = tuple(value.item() if hasattr(value, "item") else value
+                                    for value in (last_row["sort_key"], last_row["url"]))
+            else:
+                next_cursor = None
+            st.button("Next ▶", disabled=current_page >= total_pages or next_cursor is None, use_container_width=True,
+                      on_click=lambda: cursors.append(next_cursor))
     
-    with cleanup_tab4:
-        render_disabled_jobs_section(df)
+    st.info(f"Showing {start_item}-{end_item} of {total_filtered_items} jobs")
+    
+    st.dataframe(
+        page_df.drop(columns=["sort_key"]),
+        column_config=get_jobs_column_config(status_options),
+        use_container_width=True,
+        hide_index=True,
+        height=min(len(page_df), JOBS_TABLE_VISIBLE_ROWS) * 35 + 38
+    )
+
+
+# Columns of the cleanup lists; "recommendation" is each list's *_job_recommendation column
+CLEANUP_COLUMNS = ["name", "folder", "description", "last_build_status", "days_since_last_build", "total_builds", "recommendation", "url"]
+
+
+def select_cleanup_jobs(df, mask, recommendation_column):
+    """
+    Copy the displayed columns of the jobs matching mask out of the shared jobs frame.
+    
+    Recommendations are labelled once per sync (see src/recommendations.py);
+    recommendation_column is shown as "recommendation".
+    """
+    columns = [recommendation_column if col == "recommendation" else col for col in CLEANUP_COLUMNS]
+    return df.loc[mask, columns].rename(columns={recommendation_column: "recommendation"})
+
+
+@st.fragment
+def render_cleanup_tab(df):
+    """Render the cleanup insights tab; its widgets rerun only this tab"""
+    cleanup_views = {
+        "📊 Summary": render_cleanup_summary,
+        "🧪 Test Jobs": render_test_jobs_section,
+        "⏰ Inactive Jobs": render_inactive_jobs_section,
+        "🚫 Disabled Jobs": render_disabled_jobs_section,
+    }
+    selected_view = render_view_selector(list(cleanup_views), key="cleanup_view")
+    cleanup_views[selected_view](df)
 
 
 def render_test_jobs_section(df):
@@ -836,7 +1084,7 @@ def render_test_jobs_section(df):
     </div>
     """, unsafe_allow_html=True)
     
-    test_jobs = df[df["is_test_job"] == True].copy()
+    test_jobs = select_cleanup_jobs(df, df["is_test_job"] == True, "test_job_recommendation")
     
     if not test_jobs.empty:
         st.info(f"Found {len(test_jobs)} potential test jobs")
@@ -850,14 +1098,8 @@ def render_test_jobs_section(df):
             ]
             st.info(f"Showing {len(test_jobs)} test jobs matching '{test_search}'")
         
-        # Add recommendations
-        test_jobs = test_jobs.copy()
-        test_jobs["recommendation"] = test_jobs.apply(
-            lambda row: get_test_job_recommendation(row), axis=1
-        )
-        
         st.dataframe(
-            test_jobs[["name", "folder", "description", "last_build_status", "days_since_last_build", "total_builds", "recommendation", "url"]],
+            test_jobs,
             column_config={
                 "url": st.column_config.LinkColumn("Job URL"),
                 "description": st.column_config.TextColumn("Description", max_chars=80),
@@ -879,10 +1121,12 @@ def render_inactive_jobs_section(df):
     """, unsafe_allow_html=True)
     
     # Filter for jobs with last build more than threshold days ago
-    inactive_jobs = df[
+    inactive_jobs = select_cleanup_jobs(
+        df,
         (df["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS) & 
-        (df["days_since_last_build"].notna())
-    ].copy()
+        (df["days_since_last_build"].notna()),
+        "inactive_job_recommendation"
+    )
     
     if not inactive_jobs.empty:
         st.info(f"Found {len(inactive_jobs)} inactive jobs")
@@ -896,17 +1140,11 @@ def render_inactive_jobs_section(df):
             ]
             st.info(f"Showing {len(inactive_jobs)} inactive jobs matching '{inactive_search}'")
         
-        # Add recommendations
-        inactive_jobs = inactive_jobs.copy()
-        inactive_jobs["recommendation"] = inactive_jobs.apply(
-            lambda row: get_inactive_job_recommendation(row), axis=1
-        )
-        
         # Sort by days since last build (most inactive first)
         inactive_jobs = inactive_jobs.sort_values("days_since_last_build", ascending=False)
         
         st.dataframe(
-            inactive_jobs[["name", "folder", "description", "last_build_status", "days_since_last_build", "total_builds", "recommendation", "url"]],
+            inactive_jobs,
             column_config={
                 "url": st.column_config.LinkColumn("Job URL"),
                 "description": st.column_config.TextColumn("Description", max_chars=80),
@@ -927,7 +1165,7 @@ def render_disabled_jobs_section(df):
     </div>
     """, unsafe_allow_html=True)
     
-    disabled_jobs = df[df["is_disabled"] == True].copy()
+    disabled_jobs = select_cleanup_jobs(df, df["is_disabled"] == True, "disabled_job_recommendation")
     
     if not disabled_jobs.empty:
         st.info(f"Found {len(disabled_jobs)} disabled jobs")
@@ -941,14 +1179,8 @@ def render_disabled_jobs_section(df):
             ]
             st.info(f"Showing {len(disabled_jobs)} disabled jobs matching '{disabled_search}'")
         
-        # Add recommendations
-        disabled_jobs = disabled_jobs.copy()
-        disabled_jobs["recommendation"] = disabled_jobs.apply(
-            lambda row: get_disabled_job_recommendation(row), axis=1
-        )
-        
         st.dataframe(
-            disabled_jobs[["name", "folder", "description", "last_build_status", "days_since_last_build", "total_builds", "recommendation", "url"]],
+            disabled_jobs,
             column_config={
                 "url": st.column_config.LinkColumn("Job URL"),
                 "description": st.column_config.TextColumn("Description", max_chars=80),
@@ -964,10 +1196,18 @@ def render_disabled_jobs_section(df):
 def render_cleanup_summary(df):
     """Render cleanup summary with modern styling and enhanced insights"""
     
-    # Calculate cleanup metrics
-    test_jobs = df[df["is_test_job"] == True]
-    inactive_jobs = df[df["days_since_last_build"].notna() & (df["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS)] if "days_since_last_build" in df.columns else pd.DataFrame()
-    disabled_jobs = df[df["is_disabled"] == True] if "is_disabled" in df.columns else pd.DataFrame()
+    # Calculate cleanup metrics, preferring the counts precomputed at sync time
+    aggregates = get_dashboard_aggregates()
+    if aggregates:
+        total_count = aggregates["summary"]["job_count"]
+        test_count = aggregates["summary"]["test_jobs"]
+        inactive_count = aggregates["summary"]["inactive_jobs"]
+        disabled_count = aggregates["summary"]["disabled_jobs"]
+    else:
+        total_count = len(df)
+        test_count = int((df["is_test_job"] == True).sum())
+        inactive_count = int((df["days_since_last_build"].notna() & (df["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS)).sum()) if "days_since_last_build" in df.columns else 0
+        disabled_count = int((df["is_disabled"] == True).sum()) if "is_disabled" in df.columns else 0
     
     # Enhanced KPI cards for cleanup summary
     st.markdown("""
@@ -1002,15 +1242,15 @@ def render_cleanup_summary(df):
     with col1:
         st.metric(
             "🧪 Test Jobs", 
-            len(test_jobs),
-            f"{len(test_jobs)/len(df)*100:.1f}% of total",
+            test_count,
+            f"{test_count/total_count*100:.1f}% of total",
             delta_color="normal"
         )
     
     with col2:
         st.metric(
             "⏰ Inactive Jobs", 
-            len(inactive_jobs),
+            inactive_count,
             f">{DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS} days old",
             delta_color="inverse"
         )
@@ -1018,17 +1258,17 @@ def render_cleanup_summary(df):
     with col3:
         st.metric(
             "🚫 Disabled Jobs", 
-            len(disabled_jobs),
-            f"{len(disabled_jobs)/len(df)*100:.1f}% of total",
+            disabled_count,
+            f"{disabled_count/total_count*100:.1f}% of total",
             delta_color="inverse"
         )
     
     with col4:
-        total_cleanup_candidates = len(test_jobs) + len(inactive_jobs) + len(disabled_jobs)
+        total_cleanup_candidates = test_count + inactive_count + disabled_count
         st.metric(
             "📋 Total Candidates", 
             total_cleanup_candidates,
-            f"{total_cleanup_candidates/len(df)*100:.1f}% of total",
+            f"{total_cleanup_candidates/total_count*100:.1f}% of total",
             delta_color="inverse"
         )
     
@@ -1041,19 +1281,19 @@ def render_cleanup_summary(df):
     
     recommendations = []
     
-    if len(test_jobs) > len(df) * 0.1:
+    if test_count > total_count * 0.1:
         recommendations.append("⚠️ **High number of test jobs** - Consider reviewing and removing outdated test jobs")
-    elif len(test_jobs) > 0:
+    elif test_count > 0:
         recommendations.append("✅ **Test jobs under control** - Current test job count is manageable")
     
-    if len(inactive_jobs) > len(df) * 0.2:
+    if inactive_count > total_count * 0.2:
         recommendations.append("⚠️ **Many inactive jobs** - Consider archiving or removing jobs inactive for >60 days")
-    elif len(inactive_jobs) > 0:
+    elif inactive_count > 0:
         recommendations.append("✅ **Inactive jobs manageable** - Consider reviewing long-inactive jobs")
     
-    if len(disabled_jobs) > len(df) * 0.05:
+    if disabled_count > total_count * 0.05:
         recommendations.append("⚠️ **Several disabled jobs** - Review disabled jobs and remove if no longer needed")
-    elif len(disabled_jobs) > 0:
+    elif disabled_count > 0:
         recommendations.append("✅ **Disabled jobs under control** - Current disabled job count is acceptable")
     
 
@@ -1073,8 +1313,8 @@ def render_cleanup_summary(df):
     
     # Create cleanup progress chart
     categories = ['Test Jobs', 'Inactive Jobs', 'Disabled Jobs', 'Active Jobs']
-    values = [len(test_jobs), len(inactive_jobs), len(disabled_jobs),
-              len(df) - len(test_jobs) - len(inactive_jobs) - len(disabled_jobs)]
+    values = [test_count, inactive_count, disabled_count,
+              total_count - test_count - inactive_count - disabled_count]
     colors = ['#f59e0b', '#ef4444', '#8b5cf6', '#10b981']
     
     fig = go.Figure(data=[go.Bar(
@@ -1098,81 +1338,32 @@ def render_cleanup_summary(df):
     st.plotly_chart(fig, use_container_width=True)
 
 
-def get_test_job_recommendation(row):
-    """Generate recommendation for test jobs based on their characteristics"""
-    if pd.notna(row["days_since_last_build"]) and row["days_since_last_build"] > 30:
-        return "🔄 Consider removing - inactive test job"
-    elif row["total_builds"] < 5:
-        return "⚠️ Review - low build count test job"
-    else:
-        return "📋 Review - active test job"
-
-
-def get_inactive_job_recommendation(row):
-    """Generate recommendation for inactive jobs"""
-    if pd.notna(row["days_since_last_build"]) and row["days_since_last_build"] > 180:
-        return "🗑️ Strong candidate for removal - very old"
-    elif pd.notna(row["days_since_last_build"]) and row["days_since_last_build"] > 90:
-        return "📋 Review for archiving - moderately old"
-    else:
-        return "👀 Monitor - recently inactive"
-
-
-def get_disabled_job_recommendation(row):
-    """Generate recommendation for disabled jobs"""
-    if pd.notna(row["days_since_last_build"]) and row["days_since_last_build"] > DashboardConfig.INACTIVE_JOB_THRESHOLD_DAYS:
-        return "🗑️ Consider removal - disabled and inactive"
-    else:
-        return "📋 Review - disabled but recently active"
-
-
-
-
-
+@st.fragment
 def render_analytics_tab(df):
-    """Render the Analytics tab with modern styling and enhanced visualizations"""
-    # Filter out jobs without duration data
-    jobs_with_duration = df[df["avg_build_duration"] > 0].copy()
+    """Render the Analytics tab from the bundle computed at sync time; its widgets rerun only this tab"""
+    bundle = get_analytics_bundle() or compute_analytics_bundle(df)
     
-    if jobs_with_duration.empty:
+    if bundle["summary"]["jobs_with_duration"] == 0:
         st.warning("No build duration data available. Please refresh the data to see analytics.")
         return
     
-    # Convert duration from milliseconds to minutes for better readability
-    jobs_with_duration["avg_build_duration_min"] = jobs_with_duration["avg_build_duration"] / 60000
-    jobs_with_duration["last_build_duration_min"] = jobs_with_duration["last_build_duration"] / 60000
-    jobs_with_duration["avg_successful_duration_min"] = jobs_with_duration["avg_successful_duration"] / 60000
-    jobs_with_duration["avg_failed_duration_min"] = jobs_with_duration["avg_failed_duration"] / 60000
-    
-    # Create sub-tabs with modern styling
-    analytics_tab1, analytics_tab2, analytics_tab3, analytics_tab4 = st.tabs([
-        "⏱️ Build Duration Analysis", 
-        "📊 Performance Insights",
-        "🔍 Outlier Analysis",
-        "📋 Metadata Analysis"
-    ])
-    
-    with analytics_tab1:
-        render_build_duration_analysis(jobs_with_duration)
-    
-    with analytics_tab2:
-        render_performance_insights(jobs_with_duration)
-    
-    with analytics_tab3:
-        render_outlier_analysis(jobs_with_duration, jobs_with_duration)
-    
-    with analytics_tab4:
-        render_ownership_analysis(df)
+    analytics_views = {
+        "⏱️ Build Duration Analysis": render_build_duration_analysis,
+        "📊 Performance Insights": render_performance_insights,
+        "🔍 Outlier Analysis": render_outlier_analysis,
+        "🎲 Flaky Jobs": render_flaky_jobs,
+        "📋 Metadata Analysis": render_ownership_analysis,
+    }
+    selected_view = render_view_selector(list(analytics_views), key="analytics_view")
+    analytics_views[selected_view](bundle)
 
 
-def render_build_duration_analysis(df):
+def render_build_duration_analysis(bundle):
     """Render build duration analysis with modern styling and enhanced charts"""
     
-    # Data cleaning: Remove unrealistic values (more than 24 hours = 1440 minutes)
-    df_clean = df[df["avg_build_duration_min"] <= 1440].copy()
-    
-    if len(df_clean) < len(df):
-        df = df_clean
+    # Jobs with realistic durations (at most 24 hours)
+    df = bundle["duration_jobs"]
+    duration_stats = bundle["summary"]
     
     # Duration statistics with modern styling
     st.markdown("""
@@ -1184,15 +1375,15 @@ def render_build_duration_analysis(df):
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        avg_duration = df["avg_build_duration_min"].mean()
+        avg_duration = duration_stats["avg_duration"]
         st.metric("Average Build Duration", f"{avg_duration:.1f} min")
     
     with col2:
-        median_duration = df["avg_build_duration_min"].median()
+        median_duration = duration_stats["median_duration"]
         st.metric("Median Build Duration", f"{median_duration:.1f} min")
     
     with col3:
-        max_duration = df["avg_build_duration_min"].max()
+        max_duration = duration_stats["max_duration"]
         if max_duration > 60:
             # Format as hours if more than 60 minutes
             max_duration_hrs = max_duration / 60
@@ -1201,9 +1392,11 @@ def render_build_duration_analysis(df):
             st.metric("Longest Average Build", f"{max_duration:.1f} min")
     
     with col4:
-        total_build_time = df["total_build_duration"].sum() / 60000 / 60  # Convert to hours
+        total_build_time = duration_stats["total_build_time_hours"]
         st.metric("Total Build Time", f"{total_build_time:.1f} hours")
     
+    render_duration_percentiles(bundle)
+    
     # Duration distribution chart with modern styling
     st.markdown("""
     <div class="section-header">
@@ -1211,12 +1404,7 @@ def render_build_duration_analysis(df):
     </div>
     """, unsafe_allow_html=True)
     
-    # Create duration bins
-    df["duration_bin"] = pd.cut(df["avg_build_duration_min"], 
-                               bins=[0, 5, 15, 30, 60, 120, float('inf')],
-                               labels=["0-5 min", "5-15 min", "15-30 min", "30-60 min", "1-2 hours", "2+ hours"])
-    
-    duration_dist = df["duration_bin"].value_counts().sort_index()
+    duration_dist = bundle["duration_distribution"]
     
     fig = go.Figure(data=[go.Bar(
         x=duration_dist.index,
@@ -1254,27 +1442,33 @@ def render_build_duration_analysis(df):
         'IN_PROGRESS': '#06b6d4'
     }
     
-    fig = go.Figure()
-    
-    for status in df['last_build_status'].unique():
-        status_data = df[df['last_build_status'] == status]
-        fig.add_trace(go.Scatter(
-            x=status_data["avg_build_duration_min"],
-            y=status_data["success_rate"],
-            mode='markers',
-            name=status,
-            marker=dict(
-                color=color_map.get(status, '#6366f1'),
-                size=8,
-                opacity=0.7
-            ),
-            hovertemplate='<b>%{text}</b><br>' +
-                         'Duration: %{x:.1f} min<br>' +
-                         'Success Rate: %{y:.1f}%<br>' +
-                         'Status: ' + status +
-                         '<extra></extra>',
-            text=status_data['name']
-        ))
+    scatter_df = df
+    x_range = y_range = None
+    if scatter_mode(len(df)) == "density":
+        # Too many jobs to draw one by one; narrowing the ranges drills down to finer bins and then to jobs
+        max_duration = float(math.ceil(df["avg_build_duration_min"].max()))
+        range_col1, range_col2 = st.columns(2)
+        with range_col1:
+            x_range = st.slider("⏱️ Duration range (min)", 0.0, max_duration, (0.0, max_duration))
+        with range_col2:
+            y_range = st.slider("📊 Success rate range (%)", 0.0, 100.0, (0.0, 100.0))
+        scatter_df = df[df["avg_build_duration_min"].between(*x_range) & df["success_rate"].between(*y_range)]
+    
+    fig, mode = build_scatter_figure(
+        scatter_df, "avg_build_duration_min", "success_rate", "last_build_status", color_map, "name",
+        hovertemplate='<b>%{text}</b><br>' +
+                      'Duration: %{x:.1f} min<br>' +
+                      'Success Rate: %{y:.1f}%<br>' +
+                      'Status: {group}' +
+                      '<extra></extra>',
+        density_hovertemplate='Duration: %{x:.1f} min<br>Success Rate: %{y:.1f}%<br>Jobs: %{z:d}<extra></extra>',
+        x_range=x_range, y_range=y_range
+    )
+    if mode == "density":
+        st.caption(f"{len(scatter_df):,} jobs shown as a density map. Narrow the ranges to "
+                   f"{DashboardConfig.CHART_DENSITY_THRESHOLD:,} jobs or fewer to see individual jobs.")
+    elif scatter_df is not df:
+        st.caption(f"Showing the {len(scatter_df):,} jobs in the selected ranges.")
     
     fig.update_layout(
         title="Build Duration vs Success Rate",
@@ -1294,10 +1488,8 @@ def render_build_duration_analysis(df):
     </div>
     """, unsafe_allow_html=True)
     
-    longest_jobs = df.nlargest(10, "avg_build_duration_min")[["name", "folder", "avg_build_duration_min", "success_rate", "total_builds"]]
-    
     st.dataframe(
-        longest_jobs,
+        bundle["longest_jobs"],
         column_config={
             "avg_build_duration_min": st.column_config.NumberColumn("Avg Duration (min)", format="%.1f"),
             "success_rate": st.column_config.NumberColumn("Success Rate (%)", format="%.1f"),
@@ -1307,7 +1499,144 @@ def render_build_duration_analysis(df):
     )
 
 
-def render_outlier_analysis(df_clean, df_original):
+def render_duration_percentiles(bundle):
+    """Render p50/p90/p99 build durations merged from the per-job duration sketches (see src/duration_sketch.py)"""
+    summary = bundle["summary"]
+    if not summary.get("builds_sketched"):
+        return
+    
+    st.markdown("""
+    <div class="section-header">
+        <h2>⏱️ Build Duration Percentiles</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("p50 Build Duration", f"{summary['p50_duration_min']:.1f} min")
+    with col2:
+        st.metric("p90 Build Duration", f"{summary['p90_duration_min']:.1f} min")
+    with col3:
+        st.metric("p99 Build Duration", f"{summary['p99_duration_min']:.1f} min")
+    with col4:
+        st.metric("Builds Tracked", f"{summary['builds_sketched']:,}")
+    
+    percentile_columns = {
+        "build_count": st.column_config.NumberColumn("Builds", format="%d"),
+        "p50_duration_min": st.column_config.NumberColumn("p50 (min)", format="%.1f"),
+        "p90_duration_min": st.column_config.NumberColumn("p90 (min)", format="%.1f"),
+        "p99_duration_min": st.column_config.NumberColumn("p99 (min)", format="%.1f"),
+    }
+    folder_view, job_view = st.columns(2)
+    with folder_view:
+        st.markdown("**By folder** (slowest p99 first)")
+        st.dataframe(
+            bundle["folder_percentiles"],
+            column_config={
+                "folder": st.column_config.TextColumn("Folder"),
+                "job_count": st.column_config.NumberColumn("Jobs", format="%d"),
+                **percentile_columns,
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+    with job_view:
+        st.markdown("**By job** (slowest p99 first)")
+        st.dataframe(
+            bundle["job_percentiles"].head(PERCENTILE_TABLE_ROWS),
+            column_config={
+                "name": st.column_config.TextColumn("Job Name"),
+                "folder": st.column_config.TextColumn("Folder"),
+                "url": st.column_config.LinkColumn("Job URL"),
+                **percentile_columns,
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+def render_flaky_jobs(bundle):
+    """Render jobs ranked by flip rate, maintained at sync time from the stored build results (see src/flakiness.py)"""
+    st.markdown("""
+    <div class="section-header">
+        <h2>🎲 Flaky Jobs</h2>
+        <p>Jobs that keep switching between passing and failing builds</p>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    flakiness = get_job_flakiness()
+    if flakiness is None or flakiness.empty:
+        st.info("No build history recorded yet. It is collected with every sync from Jenkins.")
+        return
+    
+    analysed = flakiness[flakiness["build_count"] >= DashboardConfig.FLAKY_MIN_BUILDS]
+    flaky = analysed[analysed["flip_rate"] >= DashboardConfig.FLAKY_FLIP_RATE_PERCENT]
+    
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Jobs Analysed", f"{len(analysed):,}", help=f"Jobs with at least {DashboardConfig.FLAKY_MIN_BUILDS} passed or failed builds")
+    with col2:
+        st.metric("Flaky Jobs", f"{len(flaky):,}", help=f"Flip rate of at least {DashboardConfig.FLAKY_FLIP_RATE_PERCENT}%")
+    with col3:
+        st.metric("Longest Failure Streak", f"{int(analysed['longest_failure_streak'].max()):,} builds" if not analysed.empty else "-")
+    with col4:
+        recovery = analysed["mean_recovery_hours"].median()
+        st.metric("Median Time to Recovery", f"{recovery:.1f} hours" if pd.notna(recovery) else "-")
+    
+    if flaky.empty:
+        st.success(f"🎉 No job flips between passing and failing in {DashboardConfig.FLAKY_FLIP_RATE_PERCENT}% or more of its builds.")
+    else:
+        chart_jobs, hidden_jobs = cap_bars(flaky)
+        if hidden_jobs:
+            st.caption(f"Chart shows the {len(chart_jobs)} flakiest of {len(flaky)} flaky jobs.")
+        fig = go.Figure(data=[go.Bar(
+            x=chart_jobs["name"],
+            y=chart_jobs["flip_rate"],
+            customdata=chart_jobs[["folder", "build_count", "longest_failure_streak"]],
+            marker_color='#f59e0b',
+            marker_line_color='#d97706',
+            marker_line_width=1,
+            opacity=0.8,
+            hovertemplate='<b>%{x}</b><br>' +
+                          'Folder: %{customdata[0]}<br>' +
+                          'Flip rate: %{y:.1f}%<br>' +
+                          'Builds: %{customdata[1]}<br>' +
+                          'Longest failure streak: %{customdata[2]}' +
+                          '<extra></extra>'
+        )])
+        fig.update_layout(
+            title="Flip Rate of Flaky Jobs",
+            xaxis_title="Job",
+            yaxis_title="Flip rate (%)",
+            height=400,
+            margin=dict(t=50, b=50, l=50, r=50),
+            showlegend=False
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    
+    st.dataframe(
+        analysed[[
+            "name", "folder", "flip_rate", "build_count", "failure_count", "longest_failure_streak",
+            "mean_recovery_hours", "max_recovery_hours", "last_result", "url"
+        ]],
+        column_config={
+            "name": st.column_config.TextColumn("Job Name"),
+            "folder": st.column_config.TextColumn("Folder"),
+            "flip_rate": st.column_config.NumberColumn("Flip Rate (%)", format="%.1f"),
+            "build_count": st.column_config.NumberColumn("Builds", format="%d"),
+            "failure_count": st.column_config.NumberColumn("Failed Builds", format="%d"),
+            "longest_failure_streak": st.column_config.NumberColumn("Longest Failure Streak", format="%d"),
+            "mean_recovery_hours": st.column_config.NumberColumn("Avg Recovery (h)", format="%.1f"),
+            "max_recovery_hours": st.column_config.NumberColumn("Max Recovery (h)", format="%.1f"),
+            "last_result": st.column_config.TextColumn("Last Result"),
+            "url": st.column_config.LinkColumn("Job URL"),
+        },
+        use_container_width=True,
+        hide_index=True
+    )
+
+
+def render_outlier_analysis(bundle):
     """Render outlier analysis with explanations and recommendations"""
     st.markdown("""
     <div class="section-header">
@@ -1316,17 +1645,12 @@ def render_outlier_analysis(df_clean, df_original):
     </div>
     """, unsafe_allow_html=True)
     
-    # Find outliers (jobs with unrealistic build durations)
-    outliers = df_clean[df_clean["avg_build_duration_min"] > 1440].copy()
+    # Jobs with unrealistic build durations, labelled once per sync (see src/recommendations.py)
+    outliers = bundle["outliers"]
     
     if not outliers.empty:
         st.warning(f"⚠️ Found {len(outliers)} jobs with unrealistic build durations (>24 hours)")
         
-        # Add analysis and recommendations
-        outliers = outliers.copy()
-        outliers["outlier_type"] = outliers.apply(analyze_outlier_reason, axis=1)
-        outliers["recommendation"] = outliers.apply(get_outlier_recommendation, axis=1)
-        
         # Display outliers table
         st.markdown("""
         <div class="section-header">
@@ -1335,7 +1659,7 @@ def render_outlier_analysis(df_clean, df_original):
         """, unsafe_allow_html=True)
         
         st.dataframe(
-            outliers[["name", "folder", "avg_build_duration_min", "last_build_status", "total_builds", "outlier_type", "recommendation", "url"]],
+            outliers,
             column_config={
                 "url": st.column_config.LinkColumn("🔗 Job URL"),
                 "avg_build_duration_min": st.column_config.NumberColumn("Avg Duration (min)", format="%.1f"),
@@ -1351,58 +1675,21 @@ def render_outlier_analysis(df_clean, df_original):
         </div>
         """, unsafe_allow_html=True)
         
-        outlier_types = outliers["outlier_type"].value_counts()
-        for outlier_type, count in outlier_types.items():
+        for outlier_type, count in bundle["outlier_type_counts"].items():
             st.info(f"**{outlier_type}**: {count} jobs")
             
     else:
         st.success("🎉 No outliers found! All jobs have realistic build durations.")
 
 
-def analyze_outlier_reason(row):
-    """Analyze why a job might be an outlier"""
-    duration_hrs = row["avg_build_duration_min"] / 60
-    
-    if duration_hrs > 168:  # More than 1 week
-        return "🚨 Extremely Long Build (>1 week)"
-    elif duration_hrs > 72:  # More than 3 days
-        return "⚠️ Very Long Build (3+ days)"
-    elif duration_hrs > 48:  # More than 2 days
-        return "🐌 Long Build (2+ days)"
-    elif duration_hrs > 24:  # More than 1 day
-        return "⏰ Extended Build (1+ day)"
-    else:
-        return "📊 Unusual Build Duration"
-
-
-def get_outlier_recommendation(row):
-    """Get recommendation for outlier job"""
-    duration_hrs = row["avg_build_duration_min"] / 60
-    
-    if duration_hrs > 168:
-        return "🔧 Investigate immediately - likely stuck or misconfigured"
-    elif duration_hrs > 72:
-        return "📋 Review build process - consider optimization or parallelization"
-    elif duration_hrs > 48:
-        return "👀 Monitor closely - may need process improvements"
-    elif duration_hrs > 24:
-        return "📊 Analyze build steps - look for optimization opportunities"
-    else:
-        return "🔍 Review build configuration"
-
-
-def render_performance_insights(df):
+def render_performance_insights(bundle):
     """Render performance insights with modern styling and enhanced visualizations"""
-    # Data cleaning: Remove unrealistic values (more than 24 hours = 1440 minutes)
-    df_clean = df[df["avg_build_duration_min"] <= 1440].copy()
-    if len(df_clean) < len(df):
-        df = df_clean
-    
-    # Calculate insights
-    total_jobs = len(df)
-    avg_duration = df["avg_build_duration_min"].mean()
-    median_duration = df["avg_build_duration_min"].median()
-    max_duration = df["avg_build_duration_min"].max()
+    # Statistics of the jobs with realistic durations (at most 24 hours)
+    duration_stats = bundle["summary"]
+    avg_duration = duration_stats["avg_duration"]
+    median_duration = duration_stats["median_duration"]
+    max_duration = duration_stats["max_duration"]
+    total_build_time = duration_stats["total_build_time_hours"]
     
     # KPI Cards with modern styling
     st.markdown("""
@@ -1444,7 +1731,6 @@ def render_performance_insights(df):
         st.metric("Longest Average Build", f"{max_duration:.1f} min")
     
     with col4:
-        total_build_time = df["total_build_duration"].sum() / 60000 / 60  # Convert to hours
         st.metric("Total Build Time", f"{total_build_time:.1f} hours")
     
     # Performance insights with modern styling
@@ -1489,19 +1775,17 @@ def render_performance_insights(df):
     </div>
     """, unsafe_allow_html=True)
     
-    folder_performance = df.groupby("folder").agg({
-        "avg_build_duration_min": "mean",
-        "success_rate": "mean",
-        "name": "count"
-    }).rename(columns={"name": "job_count"})
-    
-    # Only show folders with multiple jobs
-    folder_performance = folder_performance[folder_performance["job_count"] >= 3].sort_values("avg_build_duration_min", ascending=False)
+    # Folders with multiple jobs, slowest first
+    folder_performance = bundle["folder_performance"]
     
     if not folder_performance.empty:
+        # The details table below lists every folder; the chart keeps the slowest ones
+        chart_folders, hidden_folders = cap_bars(folder_performance)
+        if hidden_folders:
+            st.caption(f"Chart shows the {len(chart_folders)} slowest of {len(folder_performance)} folders.")
         fig = go.Figure(data=[go.Bar(
-            x=folder_performance.index,
-            y=folder_performance["avg_build_duration_min"],
+            x=chart_folders.index,
+            y=chart_folders["avg_build_duration_min"],
             marker_color='#8b5cf6',
             marker_line_color='#7c3aed',
             marker_line_width=1,
@@ -1535,9 +1819,89 @@ def render_performance_insights(df):
             },
             use_container_width=True
         )
+    
+    render_folder_hierarchy(bundle["folder_tree"])
 
 
-def render_ownership_analysis(df):
+def render_folder_hierarchy(nodes):
+    """Treemap drill-down of the folder tree; every node is rolled up at sync time (see src/folder_tree.py)"""
+    st.markdown("""
+    <div class="section-header">
+        <h2>🌳 Folder Hierarchy</h2>
+    </div>
+    """, unsafe_allow_html=True)
+    
+    if nodes.empty:
+        st.info("No folders found.")
+        return
+    
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        folder = st.selectbox(
+            "📁 Focus folder", nodes["id"], format_func=lambda node: ROOT_LABEL if node == ROOT else node,
+            key="folder_tree_focus", help="Drill into a folder; the treemap shows the levels below it"
+        )
+    with col2:
+        size_by = st.radio("Size by", list(FOLDER_TREE_SIZES), horizontal=True, key="folder_tree_size")
+    
+    focus = nodes[nodes["id"] == folder].iloc[0]
+    metric_col1, metric_col2, metric_col3, metric_col4 = st.columns(4)
+    with metric_col1:
+        st.metric("Jobs", f"{focus['job_count']:,}")
+    with metric_col2:
+        st.metric("Build Time", f"{focus['build_minutes'] / 60:,.1f} hours")
+    with metric_col3:
+        st.metric("Build Failure Rate", f"{focus['failure_rate']:.1f}%")
+    with metric_col4:
+        st.metric("Inactive Jobs", f"{focus['inactive_count']:,}")
+    
+    tree = subtree(nodes, folder, max_depth=FOLDER_TREEMAP_LEVELS)
+    fig = go.Figure(go.Treemap(
+        ids=tree["id"],
+        labels=tree["label"],
+        parents=tree["parent"],
+        values=tree[FOLDER_TREE_SIZES[size_by]],
+        # Node values are rollups including their subfolders
+        branchvalues="total",
+        marker=dict(
+            colors=tree["failure_rate"],
+            colorscale="RdYlGn_r",
+            cmin=0,
+            cmax=100,
+            colorbar=dict(title="Failure %")
+        ),
+        customdata=tree[["job_count", "build_minutes", "failure_rate", "inactive_count"]],
+        hovertemplate='<b>%{id}</b><br>' +
+                      'Jobs: %{customdata[0]:,}<br>' +
+                      'Build time: %{customdata[1]:,} min<br>' +
+                      'Failure rate: %{customdata[2]:.1f}%<br>' +
+                      'Inactive jobs: %{customdata[3]:,}' +
+                      '<extra></extra>'
+    ))
+    fig.update_layout(
+        height=500,
+        margin=dict(t=30, b=10, l=10, r=10)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    subfolders = children(nodes, folder)
+    if not subfolders.empty:
+        st.dataframe(
+            subfolders[["id", "job_count", "direct_jobs", "build_minutes", "failure_rate", "inactive_count"]],
+            column_config={
+                "id": st.column_config.TextColumn("Subfolder"),
+                "job_count": st.column_config.NumberColumn("Jobs", format="%d"),
+                "direct_jobs": st.column_config.NumberColumn("Direct Jobs", format="%d"),
+                "build_minutes": st.column_config.NumberColumn("Build Minutes", format="%d"),
+                "failure_rate": st.column_config.NumberColumn("Build Failure Rate (%)", format="%.1f"),
+                "inactive_count": st.column_config.NumberColumn("Inactive Jobs", format="%d"),
+            },
+            use_container_width=True,
+            hide_index=True
+        )
+
+
+def render_ownership_analysis(bundle):
     """Render ownership analysis with status overview and detailed breakdown"""
     
     # Metadata analysis overview
@@ -1547,11 +1911,12 @@ def render_ownership_analysis(df):
     </div>
     """, unsafe_allow_html=True)
     
-    # Calculate ownership statistics
-    total_pipelines = len(df)
-    complete_pipelines = len(df[df['ownership_status'] == 'complete'])
-    attention_required = len(df[df['ownership_status'] == 'attention_required'])
-    unassigned_pipelines = len(df[df['ownership_status'] == 'unassigned'])
+    summary = bundle["summary"]
+    ownership_counts = bundle["ownership_counts"]
+    total_pipelines = summary["total_jobs"]
+    complete_pipelines = int(ownership_counts.get('complete', 0))
+    attention_required = int(ownership_counts.get('attention_required', 0))
+    unassigned_pipelines = int(ownership_counts.get('unassigned', 0))
     
     # Calculate percentages
     complete_percentage = (complete_pipelines / total_pipelines * 100) if total_pipelines > 0 else 0
@@ -1613,32 +1978,8 @@ def render_ownership_analysis(df):
     </div>
     """, unsafe_allow_html=True)
     
-    # Create detailed table with ownership information
-    ownership_columns = [
-        "name", "folder", "owner_name", "owner_email", "description", "other_tag", 
-        "ownership_status", "last_build_status", "success_rate", "last_editor", "last_user", "url"
-    ]
-    
-    # Filter to only show columns that exist in the dataframe
-    available_columns = [col for col in ownership_columns if col in df.columns]
-    ownership_df = df[available_columns].copy()
-    
-    # Add missing columns with default values if they don't exist
-    for col in ownership_columns:
-        if col not in ownership_df.columns:
-            ownership_df[col] = None
-    
-    # Add status icons
-    def get_status_icon(status):
-        if status == 'complete':
-            return '✅'
-        elif status == 'attention_required':
-            return '⚠️'
-        else:
-            return '🔴'
-    
-    if 'ownership_status' in ownership_df.columns:
-        ownership_df['Status'] = ownership_df['ownership_status'].apply(get_status_icon)
+    # Ownership columns with a status icon per job
+    ownership_df = bundle["ownership_jobs"]
     
     # Display the table
     st.dataframe(
@@ -1672,7 +2013,7 @@ def render_ownership_analysis(df):
             ),
             "last_build_status": st.column_config.SelectboxColumn(
                 "Build Status",
-                options=sorted(df["last_build_status"].unique()),
+                options=sorted(ownership_df["last_build_status"].dropna().unique()),
                 help="Last build status"
             ),
             "success_rate": st.column_config.NumberColumn(
@@ -1727,15 +2068,12 @@ def render_ownership_analysis(df):
     </div>
     """, unsafe_allow_html=True)
     
-    # Analyze descriptions
-    jobs_with_description = df[df["description"].notna() & (df["description"] != "")].copy()
-    jobs_without_description = df[df["description"].isna() | (df["description"] == "")].copy()
-    
-    # Calculate description statistics
-    total_jobs = len(df)
-    jobs_with_desc = len(jobs_with_description)
-    jobs_without_desc = len(jobs_without_description)
-    description_coverage = (jobs_with_desc / total_jobs) * 100 if total_jobs > 0 else 0
+    # Description statistics
+    jobs_without_description = bundle["jobs_without_description"]
+    total_jobs = summary["total_jobs"]
+    jobs_with_desc = summary["jobs_with_description"]
+    jobs_without_desc = summary["jobs_without_description"]
+    description_coverage = summary["description_coverage"]
     
     # Description KPI Cards
     col1, col2, col3, col4 = st.columns(4)
@@ -1757,9 +2095,8 @@ def render_ownership_analysis(df):
         )
     
     with col3:
-        # Calculate average description length
-        if not jobs_with_description.empty:
-            avg_desc_length = jobs_with_description["description"].str.len().mean()
+        avg_desc_length = summary["avg_description_length"]
+        if avg_desc_length is not None:
             st.metric(
                 "📏 Average Description Length", 
                 f"{avg_desc_length:.0f} chars",
@@ -1775,11 +2112,11 @@ def render_ownership_analysis(df):
             )
     
     with col4:
-        # Find jobs with very short descriptions (less than 10 characters)
-        short_descriptions = jobs_with_description[jobs_with_description["description"].str.len() < 10]
+        # Jobs with very short descriptions (less than 10 characters)
+        short_descriptions = summary["short_descriptions"]
         st.metric(
             "⚠️ Short Descriptions", 
-            len(short_descriptions),
+            short_descriptions,
             "< 10 characters",
             delta_color="inverse"
         )
@@ -1800,9 +2137,9 @@ def render_ownership_analysis(df):
     else:
         insights.append("✅ **Good description coverage** - Most jobs are well-documented")
     
-    if len(short_descriptions) > total_jobs * 0.1:
+    if short_descriptions > total_jobs * 0.1:
         insights.append("⚠️ **Many short descriptions** - Consider improving documentation quality")
-    elif len(short_descriptions) > 0:
+    elif short_descriptions > 0:
         insights.append("📋 **Some short descriptions** - Review and enhance brief descriptions")
     
     if jobs_without_desc > total_jobs * 0.3:
@@ -1825,7 +2162,7 @@ def render_ownership_analysis(df):
         """, unsafe_allow_html=True)
         
         st.dataframe(
-            jobs_without_description[["name", "folder", "last_build_status", "days_since_last_build", "total_builds", "url"]],
+            jobs_without_description,
             column_config={
                 "url": st.column_config.LinkColumn("Job URL"),
                 "days_since_last_build": st.column_config.NumberColumn("Days Since Last Build", format="%d"),
@@ -1834,3 +2171,11 @@ def render_ownership_analysis(df):
             use_container_width=True,
             hide_index=True
         )
+
+
+# Render profiler (RENDER_PROFILER=true): time every render_* function and the data-layer calls made from this module
+instrument(globals(), names=[
+    "get_filter_engine", "get_analytics_bundle", "get_dashboard_aggregates", "get_filtered_overview",
+    "query_jobs_page", "get_sync_runs", "get_job_flakiness", "compute_analytics_bundle", "compute_overview_stats",
+    "FilterEngine.apply", "FilterEngine.page",
+])